@@ -8,5 +8,6 @@ from cmg.audio import *
 from cmg.theme import *
 from cmg.resource_manager import *
 from cmg.graphics.image import *
+from cmg.graphics.text_cache import *
 from cmg.graphics.graphics import *
 from cmg.gui.font import *
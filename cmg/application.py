@@ -1,3 +1,4 @@
+import heapq
 import pygame
 import queue
 import time
@@ -8,6 +9,7 @@ from cmg.input import MouseButtons
 from cmg.input import Keys
 from cmg.input import KeyMods
 from cmg.event import Event
+from cmg.profiler import FrameProfiler
 
 
 class Application:
@@ -35,9 +37,58 @@ class Application:
         self.__fps = 0
         self.__frame_counter = 0
 
+        # Render-on-change mode: when nothing is happening, block on events
+        # and only redraw the screen when something was damaged
+        self.render_on_change = False
+        self.idle_timeout = 0.5
+        self.__awake_until = 0.0
+        self.__damaged_rects = []
+        self.__full_damage = True
+        self.__scheduled_damage = []
+        self.__wake_event_type = pygame.event.custom_type()
+        Event.queued_callback = self.__on_event_queued
+
+        # Frame profiler, toggled with F3 and saved with F4
+        self.profiler = FrameProfiler()
+        self.profiler_trace_path = "frame_trace.json"
+        self.input.bind(pygame.K_F3, pressed=self.profiler.toggle)
+        self.input.bind(pygame.K_F4, pressed=self.save_profiler_trace)
+
     def get_frame_rate(self) -> float:
         return self.__fps
 
+    def save_profiler_trace(self):
+        """Saves the frames recorded by the profiler as a JSON trace."""
+        if self.profiler.is_enabled():
+            self.profiler.save_trace(self.profiler_trace_path)
+
+    def damage(self, rect=None):
+        """
+        Marks a screen rect as needing to be redrawn, or the whole screen
+        if rect is None.
+        """
+        if rect is None:
+            self.__full_damage = True
+        else:
+            self.__damaged_rects.append(pygame.Rect(rect))
+
+    def schedule_damage(self, delay: float, rect=None):
+        """Damages a screen rect after a delay in seconds."""
+        item = (time.time() + delay, id(rect), rect)
+        heapq.heappush(self.__scheduled_damage, item)
+
+    def wake(self):
+        """Runs and redraws at the full frame rate for idle_timeout seconds."""
+        self.__awake_until = time.time() + self.idle_timeout
+        self.__full_damage = True
+
+    def is_active(self) -> bool:
+        """
+        Returns True if frames must keep being drawn at the full frame rate
+        in render-on-change mode, such as while a key is held down.
+        """
+        return bool(self.input.down_keys) or self.profiler.is_enabled()
+
     def quit(self):
         self.running = False
         self.on_quit()
@@ -62,40 +113,68 @@ class Application:
 
         try:
             while self.running:
+                profiler = self.profiler
+                events = self.__wait_for_events()
+                profiler.begin_frame()
+
                 # Event processing
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        self.quit()
-                    elif event.type == pygame.KEYDOWN:
-                        self.input.on_key_down(Keys(event.key), KeyMods(event.mod), event.unicode)
-                    elif event.type == pygame.KEYUP:
-                        self.input.on_key_up(Keys(event.key), KeyMods(event.mod))
-                    elif event.type == pygame.MOUSEBUTTONDOWN:
-                        self.input.on_mouse_down(cmg.Vec2(event.pos), MouseButtons(event.button))
-                    elif event.type == pygame.MOUSEBUTTONUP:
-                        self.input.on_mouse_up(cmg.Vec2(event.pos), MouseButtons(event.button))
-                    elif event.type == pygame.VIDEORESIZE:
-                        self.screen = pygame.display.set_mode(
-                            (event.w, event.h), flags=pygame.RESIZABLE)
-                        self.on_window_resized(cmg.Vec2(event.size))
+                with profiler.phase("events"):
+                    events += pygame.event.get()
+                    if events:
+                        self.wake()
+                    for event in events:
+                        if event.type == pygame.QUIT:
+                            self.quit()
+                        elif event.type == pygame.KEYDOWN:
+                            self.input.on_key_down(Keys(event.key), KeyMods(event.mod), event.unicode)
+                        elif event.type == pygame.KEYUP:
+                            self.input.on_key_up(Keys(event.key), KeyMods(event.mod))
+                        elif event.type == pygame.MOUSEBUTTONDOWN:
+                            self.input.on_mouse_down(cmg.Vec2(event.pos), MouseButtons(event.button))
+                        elif event.type == pygame.MOUSEBUTTONUP:
+                            self.input.on_mouse_up(cmg.Vec2(event.pos), MouseButtons(event.button))
+                        elif event.type == pygame.VIDEORESIZE:
+                            self.screen = pygame.display.set_mode(
+                                (event.w, event.h), flags=pygame.RESIZABLE)
+                            self.on_window_resized(cmg.Vec2(event.size))
 
                 # Process queued events
-                try:
-                    while True:
-                        event, args, handlers = Event.event_queue.get_nowait()
-                        for handler in handlers:
-                            handler(*args)
-                except queue.Empty:
-                    pass
+                with profiler.phase("event_queue"):
+                    try:
+                        while True:
+                            event, args, handlers = Event.event_queue.get_nowait()
+                            self.wake()
+                            for handler in handlers:
+                                handler(*args)
+                    except queue.Empty:
+                        pass
 
                 # Update
-                self.input.update()
-                self.update(dt=1.0 / self.framerate)
+                with profiler.phase("update"):
+                    self.input.update()
+                    self.update(dt=1.0 / self.framerate)
+                if self.is_active():
+                    self.wake()
+                elif time.time() < self.__awake_until:
+                    self.__full_damage = True
+                self.__apply_scheduled_damage()
 
                 # Draw
-                self.screen.fill(tuple(cmg.Theme.color_background))
-                self.draw()
-                pygame.display.flip()
+                if (not self.render_on_change or self.__full_damage or
+                        self.__damaged_rects):
+                    with profiler.phase("draw"):
+                        self.screen.fill(tuple(cmg.Theme.color_background))
+                        self.draw()
+                        if profiler.is_enabled():
+                            profiler.draw_overlay(cmg.Graphics(self.screen))
+                    with profiler.phase("flip"):
+                        if self.__full_damage or not self.render_on_change:
+                            pygame.display.flip()
+                        else:
+                            pygame.display.update(self.__damaged_rects)
+                    self.__full_damage = False
+                    self.__damaged_rects = []
+                profiler.end_frame()
             
                 # Update FPS counter
                 now = time.time()
@@ -113,5 +192,37 @@ class Application:
             traceback.print_exc()
             self.on_quit()
             
+        Event.queued_callback = None
         pygame.mixer.quit()
         pygame.quit()
+
+    def __wait_for_events(self) -> list:
+        """
+        In render-on-change mode, blocks while idle until a pygame event,
+        an Event queued from another thread, or scheduled damage is due.
+        """
+        if not self.render_on_change or time.time() < self.__awake_until:
+            return []
+        if self.__full_damage or self.__damaged_rects:
+            return []
+        timeout = 0
+        if self.__scheduled_damage:
+            delay = self.__scheduled_damage[0][0] - time.time()
+            timeout = max(1, int(delay * 1000) + 1)
+        if not Event.event_queue.empty():
+            return []
+        event = pygame.event.wait(timeout)
+        if event.type == pygame.NOEVENT or event.type == self.__wake_event_type:
+            return []
+        return [event]
+
+    def __apply_scheduled_damage(self):
+        now = time.time()
+        while self.__scheduled_damage and self.__scheduled_damage[0][0] <= now:
+            _, _, rect = heapq.heappop(self.__scheduled_damage)
+            self.damage(rect)
+
+    def __on_event_queued(self):
+        """Wakes the main loop when an Event is queued by another thread."""
+        if self.render_on_change:
+            pygame.event.post(pygame.event.Event(self.__wake_event_type))
@@ -5,6 +5,10 @@ import queue
 class Event:
     event_queue = queue.Queue()
 
+    # Called after an event is queued by a background thread, so that an
+    # idle main loop can wake up to run it
+    queued_callback = None
+
     def __init__(self, *arg_types):
         self.__handlers = []
         self.__arg_types = tuple(arg_types)
@@ -25,6 +29,8 @@ class Event:
                 # Events emitted on a background thread must be queued to
                 # run on the main thread
                 self.event_queue.put((self, args, list(self.__handlers)))
+                if Event.queued_callback is not None:
+                    Event.queued_callback()
 
     def connect(self, handler) -> str:
         self.__handlers.append(handler)
@@ -4,7 +4,9 @@ from enum import IntFlag
 import cmg
 from cmg.color import Colors
 from cmg.graphics.image import Image
+from cmg.graphics.text_cache import TextSurfaceCache
 from study_tool.russian.word import AccentedText
+from study_tool.russian.word import get_unaccented_text
 
 
 class Align(IntFlag):
@@ -31,16 +33,25 @@ class Align(IntFlag):
 class Graphics:
     """
     Class used to draw graphics.
+
+    Rendered text is cached in a TextSurfaceCache which, unless one is
+    given, is shared by all Graphics objects, including the temporary ones
+    used to draw scroll areas.
     """
 
-    def __init__(self, screen: pygame.Surface):
+    default_text_cache = TextSurfaceCache()
+
+    def __init__(self, screen: pygame.Surface, text_cache=None):
         self.screen = screen
         self.font = pygame.font.Font(None, 38)
         self.accent_input_chars = "'´`"
         self.accent_render_char = "´"
         self.__translation = cmg.Vec2(0, 0)
-        self.__cached_text_bitmaps_prev = {}
-        self.__cached_text_bitmaps = {}
+        self.__text_cache = (text_cache if text_cache is not None
+                             else Graphics.default_text_cache)
+
+    def get_text_cache(self) -> TextSurfaceCache:
+        return self.__text_cache
 
     def get_viewport(self) -> pygame.Rect:
         return self.screen.get_rect()
@@ -115,11 +126,13 @@ class Graphics:
         """
         if font is None:
             font = self.font
-        if isinstance(font, cmg.Font):
-            font = font.get_pygame_font()
         if isinstance(text, AccentedText):
-            return cmg.Vec2(font.size(text.text))
-        return cmg.Vec2(font.size(text))
+            text = text.text
+        if isinstance(font, cmg.Font):
+            return font.measure(text)
+        # Fonts without a known face and size are keyed on the font itself,
+        # which the cache holds on to
+        return cmg.Vec2(cmg.text_metrics_cache.measure(text, font, font))
 
     def get_font_to_fit(self, text, width: float,
                         fonts: list) -> pygame.font.Font:
@@ -127,12 +140,11 @@ class Graphics:
         Returns the largest font from a list of fonts that will allow the given
         text to fit within the specified width.
         """
-        fonts = sorted(fonts, key=lambda font: font.get_height(), reverse=True)
-        for font in fonts:
-            w, _ = self.measure_text(text=text, font=font)
-            if w <= width:
-                return font
-        return font
+        fonts = sorted(fonts, key=lambda font: font.get_height())
+        index = cmg.find_size_to_fit(
+            lambda index: self.measure_text(text=text, font=fonts[index])[0],
+            min_size=0, max_size=len(fonts) - 1, width=width)
+        return fonts[index]
 
     def get_font_size_to_fit(self,
                              text,
@@ -143,13 +155,11 @@ class Graphics:
         Returns the largest font from a list of fonts that will allow the given
         text to fit within the specified width.
         """
-        assert max_font_size >= min_font_size
-        for font_size in range(max_font_size, min_font_size, -1):
-            font = cmg.Font(font_size)
-            w, _ = font.measure(AccentedText(text).text)
-            if w <= width:
-                return font_size
-        return min_font_size
+        return cmg.get_font_size_to_fit(
+            text=get_unaccented_text(text),
+            min_font_size=min_font_size,
+            max_font_size=max_font_size,
+            width=width)
 
     def draw_text(self, x, y, text, color=Colors.BLACK, font=None, align=Align.TopLeft, accented=True):
         """
@@ -185,16 +195,6 @@ class Graphics:
             font = self.font
 
         text = AccentedText(text)
-        w, h = font.size(text.text)
-        if Align.Center in align:
-            x -= w / 2
-        if Align.Middle in align:
-            y -= h / 2
-        if Align.Right in align:
-            x -= w
-        if Align.Bottom in align:
-            y -= h
-
         text_bitmap = self.get_cached_text(
             text=repr(text), font=font, color=tuple(color))
 
@@ -206,34 +206,37 @@ class Graphics:
             if text.accents:
                 accent_bitmap = self.get_accent_bitmap(font=font, color=color)
                 accent_half_width = int(accent_bitmap.get_width() / 2)
-                for accent_index in text.accents:
-                    w1, _ = font.size(text.text[:accent_index])
-                    w2, _ = font.size(text.text[:accent_index + 1])
-                    center_x = (w2 + w1) / 2
+                offsets = self.__text_cache.get_accent_offsets(
+                    text, font=font, font_key=self.get_font_key(font))
+                for center_x in offsets:
                     text_bitmap.blit(accent_bitmap, (center_x - accent_half_width, 0))
 
             self.cache_text(bitmap=text_bitmap, font=font,
                             text=repr(text), color=tuple(color))
 
+        # The rendered bitmap has the size of the measured text
+        w, h = text_bitmap.get_size()
+        if Align.Center in align:
+            x -= w / 2
+        if Align.Middle in align:
+            y -= h / 2
+        if Align.Right in align:
+            x -= w
+        if Align.Bottom in align:
+            y -= h
+
         self.blit(text_bitmap, cmg.Vec2(x, y))
 
     def blit(self, image, dest):
         self.screen.blit(image, (cmg.Vec2(dest) + self.__translation).totuple())
 
-    def recache(self):
-        self.__cached_text_bitmaps_prev = self.__cached_text_bitmaps
-        self.__cached_text_bitmaps = {}
-
     def cache_text(self, bitmap, text, font, color):
         key = (text, self.get_font_key(font), color)
-        self.__cached_text_bitmaps[key] = bitmap
+        self.__text_cache.put(key, bitmap)
 
     def get_cached_text(self, text, font, color):
         key = (text, self.get_font_key(font), color)
-        result = self.__cached_text_bitmaps_prev.get(key, None)
-        if result:
-            self.__cached_text_bitmaps[key] = result
-        return result
+        return self.__text_cache.get(key)
 
     def get_font_key(self, font):
         return (font.get_linesize(), font.get_bold(),
@@ -0,0 +1,117 @@
+import pygame
+from collections import OrderedDict
+
+
+class TextSurfaceCache:
+    """
+    Least-recently-used cache of rendered text surfaces, bounded by the
+    memory used by the surfaces.
+
+    Accent mark offsets are cached separately per (text, font), so text
+    re-rendered in another color or after being evicted is not measured
+    again. Hit and miss counts are kept for tuning the memory limit.
+    """
+
+    def __init__(self, max_bytes=32 * 1024 * 1024, max_metrics=8192):
+        self.__max_bytes = max_bytes
+        self.__max_metrics = max_metrics
+        self.__surfaces = OrderedDict()
+        self.__accent_offsets = OrderedDict()
+        self.__bytes = 0
+        self.__hit_count = 0
+        self.__miss_count = 0
+        self.__eviction_count = 0
+
+    def __len__(self):
+        return len(self.__surfaces)
+
+    def get_memory_usage(self) -> int:
+        """Returns the number of bytes used by the cached surfaces."""
+        return self.__bytes
+
+    def get_max_memory(self) -> int:
+        return self.__max_bytes
+
+    def get_hit_count(self) -> int:
+        return self.__hit_count
+
+    def get_miss_count(self) -> int:
+        return self.__miss_count
+
+    def get_eviction_count(self) -> int:
+        return self.__eviction_count
+
+    def get_hit_rate(self) -> float:
+        """Returns the fraction of lookups which found a cached surface."""
+        total = self.__hit_count + self.__miss_count
+        return self.__hit_count / total if total else 0.0
+
+    def set_max_memory(self, max_bytes: int):
+        """Sets the memory limit, evicting surfaces to stay within it."""
+        self.__max_bytes = max_bytes
+        self.__evict()
+
+    def reset_stats(self):
+        """Resets the hit, miss and eviction counters."""
+        self.__hit_count = 0
+        self.__miss_count = 0
+        self.__eviction_count = 0
+
+    def clear(self):
+        """Removes all cached surfaces and metrics."""
+        self.__surfaces.clear()
+        self.__accent_offsets.clear()
+        self.__bytes = 0
+
+    def get(self, key) -> pygame.Surface:
+        """Returns the surface cached for a key, or None."""
+        surface = self.__surfaces.get(key, None)
+        if surface is None:
+            self.__miss_count += 1
+            return None
+        self.__hit_count += 1
+        self.__surfaces.move_to_end(key)
+        return surface
+
+    def put(self, key, surface: pygame.Surface):
+        """Caches a surface, evicting the least recently used ones."""
+        old_surface = self.__surfaces.pop(key, None)
+        if old_surface is not None:
+            self.__bytes -= self.get_surface_size(old_surface)
+        self.__surfaces[key] = surface
+        self.__bytes += self.get_surface_size(surface)
+        self.__evict()
+
+    def get_accent_offsets(self, text, font: pygame.font.Font,
+                           font_key) -> tuple:
+        """
+        Returns the x offsets of the centers of the accented characters of
+        an AccentedText, measured with the given font.
+        """
+        key = (text.text, text.accents, font_key)
+        offsets = self.__accent_offsets.get(key, None)
+        if offsets is not None:
+            self.__accent_offsets.move_to_end(key)
+            return offsets
+        offsets = []
+        for accent_index in text.accents:
+            w1, _ = font.size(text.text[:accent_index])
+            w2, _ = font.size(text.text[:accent_index + 1])
+            offsets.append((w2 + w1) / 2)
+        offsets = tuple(offsets)
+        self.__accent_offsets[key] = offsets
+        if len(self.__accent_offsets) > self.__max_metrics:
+            self.__accent_offsets.popitem(last=False)
+        return offsets
+
+    @staticmethod
+    def get_surface_size(surface: pygame.Surface) -> int:
+        """Returns the number of bytes of pixel data in a surface."""
+        return surface.get_pitch() * surface.get_height()
+
+    def __evict(self):
+        # Always keep the most recent surface, even if it is over the limit
+        while self.__bytes > self.__max_bytes and len(self.__surfaces) > 1:
+            _, surface = self.__surfaces.popitem(last=False)
+            self.__bytes -= self.get_surface_size(surface)
+            self.__eviction_count += 1
@@ -1,10 +1,88 @@
+import functools
 import os
 import pygame
+from collections import OrderedDict
 import cmg
 from cmg import color
 from cmg.color import Color
 
 
+class TextMetricsCache:
+    """
+    Least-recently-used cache of measured text sizes, keyed on the text and
+    a font key identifying the font face and size.
+    """
+
+    def __init__(self, max_entries=16384):
+        self.__max_entries = max_entries
+        self.__sizes = OrderedDict()
+
+    def __len__(self):
+        return len(self.__sizes)
+
+    def clear(self):
+        self.__sizes.clear()
+
+    def measure(self, text: str, font: pygame.font.Font, font_key) -> tuple:
+        """Returns the (width, height) of text rendered with a font."""
+        key = (text, font_key)
+        size = self.__sizes.get(key, None)
+        if size is not None:
+            self.__sizes.move_to_end(key)
+            return size
+        size = font.size(text)
+        self.__sizes[key] = size
+        if len(self.__sizes) > self.__max_entries:
+            self.__sizes.popitem(last=False)
+        return size
+
+
+text_metrics_cache = TextMetricsCache()
+
+
+@functools.lru_cache(maxsize=None)
+def _match_font(font_family: str) -> str:
+    return pygame.font.match_font(font_family)
+
+
+@functools.lru_cache(maxsize=None)
+def _load_pygame_font(font_face, font_size: int) -> pygame.font.Font:
+    return pygame.font.Font(font_face, font_size)
+
+
+def find_size_to_fit(measure_width, min_size: int, max_size: int,
+                     width: float) -> int:
+    """
+    Binary searches for the largest size between min_size and max_size for
+    which measure_width(size) is at most width, assuming text widths grow
+    with the font size. Returns min_size if no size fits.
+    """
+    low = min_size + 1
+    high = max_size
+    result = min_size
+    while low <= high:
+        size = (low + high) // 2
+        if measure_width(size) <= width:
+            result = size
+            low = size + 1
+        else:
+            high = size - 1
+    return result
+
+
+def get_font_size_to_fit(text: str, min_font_size: int, max_font_size: int,
+                         width: float, font_face=None) -> int:
+    """
+    Returns the largest font size that will allow the given text to fit
+    within the specified width.
+    """
+    assert max_font_size >= min_font_size
+    return find_size_to_fit(
+        lambda size: text_metrics_cache.measure(
+            text, _load_pygame_font(font_face, size), (font_face, size))[0],
+        min_size=min_font_size, max_size=max_font_size, width=width)
+
+
 class Font:
     def __init__(self,
                  font_size=35,
@@ -14,9 +92,10 @@ class Font:
         self.__antialias = antialias
         self.__text_color = text_color
         self.__font_size = font_size
+        self.__font_face = None
         if not os.path.isfile(font_family):
-            font_family = pygame.font.match_font(font_family)
-        self.__font = pygame.font.Font(None, self.__font_size)
+            font_family = _match_font(font_family)
+        self.__font = _load_pygame_font(self.__font_face, self.__font_size)
 
     def get_pygame_font(self) -> pygame.font.Font:
         return self.__font
@@ -27,17 +106,22 @@ class Font:
     def get_size(self):
         return self.__font_size
 
+    def get_font_key(self) -> tuple:
+        """Returns the (font face, size) identifying this font's metrics."""
+        return (self.__font_face, self.__font_size)
+
     def set_size(self, size: int):
         if size != self.__font_size:
             self.__font_size = size
-            self.__font = pygame.font.Font(None, self.__font_size)
+            self.__font = _load_pygame_font(self.__font_face, self.__font_size)
 
     def measure(self, text: str) -> cmg.Vec2:
         if not isinstance(text, str):
             raise TypeError(text)
-        return cmg.Vec2(self.__font.size(text))
+        return cmg.Vec2(text_metrics_cache.measure(
+            text, self.__font, self.get_font_key()))
 
     def render(self, text: str, color=None):
         if not color:
             color = self.__text_color
-        return self.__font.render(text, self.__antialias, tuple(color))
\ No newline at end of file
+        return self.__font.render(text, self.__antialias, tuple(color))
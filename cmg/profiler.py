@@ -0,0 +1,203 @@
+import contextlib
+import json
+import time
+from collections import deque
+import pygame
+import cmg
+
+
+class FrameRecord:
+    """Timings and draw counts recorded for a single frame."""
+
+    def __init__(self, index: int, start: float):
+        self.index = index
+        self.start = start
+        self.duration = 0.0
+        self.phases = []  # (name, depth, start, duration) tuples
+        self.draw_counts = {}
+
+    def get_phase_time(self, name: str) -> float:
+        return sum(duration for phase_name, _, _, duration in self.phases
+                   if phase_name == name)
+
+
+class FrameProfiler:
+    """
+    Records per-phase timings and per-class draw counts of the frames in a
+    rolling window.
+
+    The application wraps each part of its main loop in phase(), and
+    widgets and entities report their draws with count_draw(). Recording
+    only happens while the profiler is enabled. The recorded frames can be
+    drawn as an overlay or saved as a JSON trace which can be opened in
+    chrome://tracing.
+    """
+
+    instance = None
+
+    def __init__(self, history=300, histogram_bucket_ms=4, histogram_buckets=16):
+        FrameProfiler.instance = self
+        self.__enabled = False
+        self.__frames = deque(maxlen=history)
+        self.__frame = None
+        self.__frame_count = 0
+        self.__depth = 0
+        self.__histogram_bucket_ms = histogram_bucket_ms
+        self.__histogram_buckets = histogram_buckets
+        self.__font = None
+
+    def is_enabled(self) -> bool:
+        return self.__enabled
+
+    def set_enabled(self, enabled: bool):
+        """Enables or disables recording, discarding recorded frames."""
+        if enabled != self.__enabled:
+            self.__enabled = enabled
+            self.__frames.clear()
+            self.__frame = None
+            self.__depth = 0
+
+    def toggle(self):
+        self.set_enabled(not self.__enabled)
+
+    def get_frames(self) -> list:
+        """Returns the recorded frames, oldest first."""
+        return list(self.__frames)
+
+    def begin_frame(self):
+        if self.__enabled:
+            self.__frame = FrameRecord(self.__frame_count, time.perf_counter())
+            self.__frame_count += 1
+            self.__depth = 0
+
+    def end_frame(self):
+        if self.__frame is not None:
+            self.__frame.duration = time.perf_counter() - self.__frame.start
+            self.__frames.append(self.__frame)
+            self.__frame = None
+
+    @contextlib.contextmanager
+    def phase(self, name: str):
+        """Context manager which records the time spent in a phase."""
+        frame = self.__frame
+        if frame is None:
+            yield
+            return
+        depth = self.__depth
+        self.__depth += 1
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.__depth = depth
+            frame.phases.append(
+                (name, depth, start, time.perf_counter() - start))
+
+    def count_draw(self, item):
+        """Counts a draw of a widget or entity, by its class name."""
+        frame = self.__frame
+        if frame is not None:
+            name = type(item).__name__
+            frame.draw_counts[name] = frame.draw_counts.get(name, 0) + 1
+
+    def get_phase_averages(self) -> dict:
+        """Returns the average seconds per frame spent in each phase."""
+        totals = {}
+        for frame in self.__frames:
+            for name, _, _, duration in frame.phases:
+                totals[name] = totals.get(name, 0.0) + duration
+        count = max(1, len(self.__frames))
+        return {name: total / count for name, total in totals.items()}
+
+    def get_draw_count_averages(self) -> dict:
+        """Returns the average draws per frame of each class."""
+        totals = {}
+        for frame in self.__frames:
+            for name, count in frame.draw_counts.items():
+                totals[name] = totals.get(name, 0) + count
+        count = max(1, len(self.__frames))
+        return {name: total / count for name, total in totals.items()}
+
+    def get_histogram(self) -> list:
+        """
+        Returns the number of recorded frames in each frame time bucket.
+        The last bucket also counts all longer frames.
+        """
+        histogram = [0] * self.__histogram_buckets
+        for frame in self.__frames:
+            bucket = int(frame.duration * 1000 / self.__histogram_bucket_ms)
+            histogram[min(bucket, self.__histogram_buckets - 1)] += 1
+        return histogram
+
+    def get_trace(self) -> dict:
+        """Returns the recorded frames in the Chrome trace event format."""
+        events = []
+        if not self.__frames:
+            return {"traceEvents": events, "displayTimeUnit": "ms"}
+        origin = self.__frames[0].start
+        to_us = lambda seconds: round(seconds * 1000000, 1)
+        for frame in self.__frames:
+            events.append({
+                "name": "frame", "cat": "frame", "ph": "X", "pid": 0, "tid": 0,
+                "ts": to_us(frame.start - origin), "dur": to_us(frame.duration),
+                "args": {"index": frame.index}})
+            for name, depth, start, duration in frame.phases:
+                events.append({
+                    "name": name, "cat": "phase", "ph": "X", "pid": 0,
+                    "tid": 0, "ts": to_us(start - origin),
+                    "dur": to_us(duration), "args": {"depth": depth}})
+            if frame.draw_counts:
+                events.append({
+                    "name": "draws", "ph": "C", "pid": 0, "tid": 0,
+                    "ts": to_us(frame.start - origin),
+                    "args": dict(frame.draw_counts)})
+        return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+    def save_trace(self, path: str):
+        """Saves the recorded frames as a JSON trace file."""
+        with open(path, "w", encoding="utf8") as file:
+            json.dump(self.get_trace(), file)
+
+    def draw_overlay(self, g):
+        """Draws the recorded frame statistics in the top right corner."""
+        if not self.__frames:
+            return
+        if self.__font is None:
+            self.__font = cmg.Font(20)
+        frames = self.__frames
+        lines = ["Frame: {:.1f} ms avg, {:.1f} ms max".format(
+            1000 * sum(frame.duration for frame in frames) / len(frames),
+            1000 * max(frame.duration for frame in frames))]
+        for name, seconds in sorted(self.get_phase_averages().items(),
+                                    key=lambda x: x[1], reverse=True):
+            lines.append("{}: {:.2f} ms".format(name, seconds * 1000))
+        draw_counts = sorted(self.get_draw_count_averages().items(),
+                             key=lambda x: x[1], reverse=True)
+        for name, count in draw_counts[:8]:
+            lines.append("{} draws: {:.0f}".format(name, count))
+
+        line_height = self.__font.measure("X").y
+        bar_width = 10
+        histogram = self.get_histogram()
+        histogram_height = 40
+        width = max(max(self.__font.measure(line).x for line in lines),
+                    bar_width * len(histogram)) + 8
+        height = line_height * len(lines) + histogram_height + 12
+        rect = pygame.Rect(g.get_viewport().right - width - 4, 4, width, height)
+        g.fill_rect(rect, color=cmg.Color(0, 0, 0, 180))
+
+        y = rect.top + 4
+        for line in lines:
+            g.draw_text(rect.left + 4, y, text=line, font=self.__font,
+                        color=cmg.Color(255, 255, 255))
+            y += line_height
+
+        # Draw the frame time histogram
+        y += 4 + histogram_height
+        max_count = max(histogram)
+        for index, count in enumerate(histogram):
+            bar_height = int(histogram_height * count / max_count)
+            if bar_height > 0:
+                g.fill_rect(rect.left + 4 + index * bar_width, y - bar_height,
+                            bar_width - 1, bar_height,
+                            color=cmg.Color(100, 200, 100))
@@ -1,3 +1,4 @@
 
 from .utils import *
 from .read_write_lock import *
+from .autocomplete_source import *
@@ -0,0 +1,71 @@
+import bisect
+
+
+class AutocompleteSource:
+    """
+    Sorted collection of autocomplete items for case-insensitive prefix
+    lookups.
+
+    Items are sorted by their lowercase text, so the items starting with a
+    prefix form a contiguous range which is found with a binary search
+    rather than by checking every item.
+    """
+
+    def __init__(self, items=()):
+        self.__keys = []
+        self.__items = []
+        self.set_items(items)
+
+    def __len__(self):
+        return len(self.__items)
+
+    def __iter__(self):
+        return iter(self.__items)
+
+    def set_items(self, items):
+        """Replaces the items with strings or objects convertible to strings."""
+        entries = sorted((str(item).lower(), index, str(item))
+                         for index, item in enumerate(items))
+        self.__keys = [key for key, _, _ in entries]
+        self.__items = [item for _, _, item in entries]
+
+    def add_item(self, item):
+        """Adds a single item."""
+        item = str(item)
+        key = item.lower()
+        index = bisect.bisect_right(self.__keys, key)
+        self.__keys.insert(index, key)
+        self.__items.insert(index, item)
+
+    def remove_item(self, item):
+        """Removes a single item, if it is present."""
+        item = str(item)
+        key = item.lower()
+        index = bisect.bisect_left(self.__keys, key)
+        while index < len(self.__keys) and self.__keys[index] == key:
+            if self.__items[index] == item:
+                del self.__keys[index]
+                del self.__items[index]
+                return
+            index += 1
+
+    def iter_matches(self, prefix: str):
+        """Iterates the items starting with a prefix, in sorted order."""
+        prefix = prefix.lower()
+        index = bisect.bisect_left(self.__keys, prefix)
+        while (index < len(self.__keys) and
+               self.__keys[index].startswith(prefix)):
+            yield self.__items[index]
+            index += 1
+
+    def complete(self, prefix: str) -> str:
+        """
+        Returns the item to complete a prefix with, or None if no items start
+        with it. An item equal to the prefix is preferred, followed by the
+        first item in sorted order.
+        """
+        if not prefix:
+            return None
+        for item in self.iter_matches(prefix):
+            return item
+        return None
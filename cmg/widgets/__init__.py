@@ -6,6 +6,7 @@ from .layout import *
 from .box_layout import *
 from .grid_layout import *
 from .abstract_scroll_area import *
+from .virtual_list_layout import *
 
 from .label import *
 from .text_edit import *
@@ -23,11 +23,23 @@ class SubRegionLayout(widgets.Layout):
     def set_offset(self, offset: cmg.Vec2):
         self.__offset = cmg.Vec2(offset)
 
+    def get_viewport_rect(self) -> pygame.Rect:
+        """
+        Returns the part of the widget which is currently visible, in the
+        widget's own coordinates.
+        """
+        return self.get_rect().move(int(self.__offset[0]),
+                                    int(self.__offset[1]))
+
+    def map_rect_to_parent(self, rect: pygame.Rect) -> pygame.Rect:
+        return super().map_rect_to_parent(rect).clip(self.get_rect())
+
     def set_widget(self, widget: widgets.Widget):
         assert isinstance(widget, widgets.Widget)
         self.__widget = widget
         if widget:
             widget.set_parent(self)
+        self.invalidate_layout()
 
     def get_children(self):
         return (self.__widget,)
@@ -166,6 +178,16 @@ class AbstractScrollArea(widgets.Widget):
         self.__layout.set_widget(widget)
         self.__widget = widget
 
+    def ensure_visible(self, rect: pygame.Rect):
+        """Scrolls so that a rect in the widget's coordinates is visible."""
+        viewport = self.__layout.get_viewport_rect()
+        top = self.__layout.get_rect().top
+        if rect.top < viewport.top:
+            self.__scrollbar_v.set_value(rect.top - top)
+        elif rect.bottom > viewport.bottom:
+            self.__scrollbar_v.set_value(
+                rect.bottom - top - viewport.height)
+
     def on_update(self):
         viewport_height = self.__layout.get_height()
         area_height = self.__widget.get_height() + int(viewport_height * 0.8)
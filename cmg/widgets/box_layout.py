@@ -16,6 +16,7 @@ class BoxLayout(Layout):
         item.set_parent(None)
         self.children.remove(item)
         del self.__stretch_factors[item]
+        self.invalidate_layout()
 
     def clear(self):
         while self.children:
@@ -35,6 +36,7 @@ class BoxLayout(Layout):
         self.__stretch_factors[item] = stretch
         self.children.append(item)
         item.set_parent(self)
+        self.invalidate_layout()
 
     def get_children(self):
         return self.children
@@ -108,11 +110,14 @@ class BoxLayout(Layout):
         # Set final positions
         child_pos = cmg.Vec2(self.get_rect().topleft)
         for index, child in enumerate(visible_children):
-            rect = child.get_rect()
+            rect = Rect(child.get_rect())
             rect.topleft = child_pos.totuple()
+            child.set_rect(rect)
             child_pos[axis] += child.get_size()[axis]
 
     def calc_maximum_size(self) -> cmg.Vec2:
+        if not self.is_layout_dirty():
+            return self.get_maximum_size()
         max_size = cmg.Vec2(self.DEFAULT_MAX_SIZE, self.DEFAULT_MAX_SIZE)
         max_size[self.axis] = 0
         for child in self.get_visible_children():
@@ -124,6 +129,8 @@ class BoxLayout(Layout):
         return max_size
 
     def calc_minimum_size(self) -> cmg.Vec2:
+        if not self.is_layout_dirty():
+            return self.get_minimum_size()
         if not self.children:
             return super().calc_minimum_size()
         min_size = cmg.Vec2(0, 0)
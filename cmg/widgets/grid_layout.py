@@ -93,9 +93,11 @@ class GridLayout(Layout):
 
     def set_column_stretch(self, col: int, stretch: float):
         self.__column_stretch_factors[col] = stretch
+        self.invalidate_layout()
 
     def set_row_stretch(self, row: int, stretch: float):
         self.__row_stretch_factors[row] = stretch
+        self.invalidate_layout()
 
     def add(self, item, row: int, col: int):
         """Adds a child to the grid."""
@@ -104,11 +106,13 @@ class GridLayout(Layout):
             self.__children.get(row, col).set_parent(None)
         self.__children.set(row, col, item)
         item.set_parent(self)
+        self.invalidate_layout()
 
     def remove(self, child):
         """Removes a child."""
         child.set_parent(None)
         self.__children.remove(child)
+        self.invalidate_layout()
 
     def remove_row(self, row: int, shift_up=False):
         """Removes an entire row."""
@@ -122,6 +126,7 @@ class GridLayout(Layout):
                 for col, child in row_items:
                     self.__children.remove_at(row, col)
                     self.__children.set(row - 1, col, child)
+        self.invalidate_layout()
 
     def remove_column(self, col: int, shift_left=False):
         """Removes an entire column."""
@@ -135,6 +140,7 @@ class GridLayout(Layout):
                 for row, child in col_items:
                     self.__children.remove_at(row, col)
                     self.__children.set(row, col - 1, child)
+        self.invalidate_layout()
 
     def clear(self):
         """Clears all children."""
@@ -150,6 +156,8 @@ class GridLayout(Layout):
         
     def calc_maximum_size(self) -> cmg.Vec2:
         """Calculate and return widget maximum sizes."""
+        if not self.is_layout_dirty():
+            return self.get_maximum_size()
         if not self.get_children():
             return super().calc_maximum_size()
 
@@ -175,6 +183,8 @@ class GridLayout(Layout):
 
     def calc_minimum_size(self) -> cmg.Vec2:
         """Calculate and return widget minimum sizes."""
+        if not self.is_layout_dirty():
+            return self.get_minimum_size()
         if not self.get_children():
             return super().calc_minimum_size()
 
@@ -270,7 +280,7 @@ class GridLayout(Layout):
         for i in range(count):
             positions[i] = position
             for _, child in cross_items(i):
-                rect = child.get_rect()
+                rect = Rect(child.get_rect())
                 pos = cmg.Vec2(rect.topleft)
                 size = cmg.Vec2(rect.size)
                 pos[axis] = position
@@ -28,6 +28,8 @@ class GroupBox(widgets.Widget):
             self.__update_size()
             
     def calc_maximum_size(self) -> cmg.Vec2:
+        if not self.is_layout_dirty():
+            return self.get_maximum_size()
         bx = 2 * (self.__border_outside_margin + self.__border_inside_margin)
         max_size = cmg.Vec2(bx, bx)
         if self.layout:
@@ -38,6 +40,8 @@ class GroupBox(widgets.Widget):
         return self.get_maximum_size()
 
     def calc_minimum_size(self) -> cmg.Vec2:
+        if not self.is_layout_dirty():
+            return self.get_minimum_size()
         bx = 2 * (self.__border_outside_margin + self.__border_inside_margin)
         min_size = cmg.Vec2(bx, bx)
         if self.layout:
@@ -52,6 +56,7 @@ class GroupBox(widgets.Widget):
             rect.inflate_ip(-bx * 2, -bx * 2)
             self.layout.set_rect(rect)
             self.layout.update()
+        self._clear_layout_dirty()
 
     def on_draw(self, g: cmg.Graphics):
         # Render the text
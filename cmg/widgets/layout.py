@@ -22,6 +22,10 @@ class Layout(LayoutItem):
     def get_children(self):
         pass
 
+    def map_rect_to_parent(self, rect: Rect) -> Rect:
+        offset = self.get_offset()
+        return rect.move(-int(offset.x), -int(offset.y))
+
     def get_visible_children(self) -> list:
         return [child for child in self.get_children() if child.is_visible()]
 
@@ -42,7 +46,9 @@ class Layout(LayoutItem):
         pass
 
     def update(self):
-        self.on_update()
+        if self.is_layout_dirty():
+            self.on_update()
+            self._clear_layout_dirty()
         self.update_children()
 
     def update_children(self):
@@ -59,25 +65,29 @@ class Layout(LayoutItem):
             child.draw(g)
 
     def calc_maximum_size(self) -> cmg.Vec2:
+        if not self.is_layout_dirty():
+            return self.get_maximum_size()
         children = self._get_layout_item_children()
-        if not children:
-            return cmg.Vec2(self.DEFAULT_MAX_SIZE, self.DEFAULT_MAX_SIZE)
-        max_size = cmg.Vec2(0, 0)
+        max_size = cmg.Vec2(self.DEFAULT_MAX_SIZE, self.DEFAULT_MAX_SIZE)
+        if children:
+            max_size = cmg.Vec2(0, 0)
         for child in children:
             child_max_size = child.calc_maximum_size()
             max_size.x = max(max_size.x, child_max_size.x)
             max_size.y = max(max_size.y, child_max_size.y)
+        self.set_maximum_size(max_size)
         return max_size
 
     def calc_minimum_size(self) -> cmg.Vec2:
+        if not self.is_layout_dirty():
+            return self.get_minimum_size()
         children = self._get_layout_item_children()
-        if not children:
-            return cmg.Vec2(0, 0)
         min_size = cmg.Vec2(0, 0)
         for child in children:
             child_min_size = child.calc_minimum_size()
             min_size.x = min(min_size.x, child_min_size.x)
             min_size.y = min(min_size.y, child_min_size.y)
+        self.set_minimum_size(min_size)
         return min_size
 
     def _get_layout_item_children(self):
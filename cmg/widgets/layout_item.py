@@ -4,8 +4,24 @@ import cmg
 
 
 class LayoutItem:
+    """
+    Base class for items which are arranged by layouts.
+
+    Size hints and child geometry are cached. Anything which changes them
+    calls invalidate_layout(), which flags the item and its ancestors as
+    dirty. Each pass still visits every visible item, but only the dirty
+    items recalculate their size hints and child geometry.
+
+    Each invalidation is numbered. An item invalidated after the size hints
+    of the current pass were calculated, such as by a widget's update,
+    stays dirty when it is laid out, so it is recalculated next pass.
+    """
+
     DEFAULT_MAX_SIZE = 16777215
 
+    __invalidation_count = 0
+    __update_invalidation_count = 0
+
     def __init__(self):
         super().__init__()
         self.parent = None
@@ -13,6 +29,8 @@ class LayoutItem:
         self.__maximum_size = cmg.Vec2(
             self.DEFAULT_MAX_SIZE, self.DEFAULT_MAX_SIZE)
         self.__minimum_size = cmg.Vec2(10, 10)
+        self.__layout_dirty = True
+        self.__layout_invalidation = 0
 
     @abc.abstractclassmethod
     def _get_layout_item_children(self):
@@ -31,6 +49,42 @@ class LayoutItem:
         """Returns True if this item is visible."""
         return self.__visible
 
+    def is_layout_dirty(self) -> bool:
+        """Returns True if this item's size hints or layout are out of date."""
+        return self.__layout_dirty
+
+    def invalidate_layout(self):
+        """
+        Marks the size hints and layout of this item and all of its
+        ancestors as needing to be recalculated.
+        """
+        LayoutItem.__invalidation_count += 1
+        item = self
+        while item is not None:
+            item.__layout_dirty = True
+            item.__layout_invalidation = LayoutItem.__invalidation_count
+            item = item.parent
+
+    @staticmethod
+    def begin_layout_update():
+        """
+        Called once the size hints of a layout pass are calculated. Items
+        invalidated after this are not cleared by the pass's update.
+        """
+        LayoutItem.__update_invalidation_count = LayoutItem.__invalidation_count
+
+    def _mark_layout_dirty(self):
+        """Marks only this item's layout as needing to be recalculated."""
+        self.__layout_dirty = True
+
+    def _clear_layout_dirty(self):
+        """
+        Called after this item's layout has been recalculated. The item
+        stays dirty if it was invalidated during the current update.
+        """
+        if self.__layout_invalidation <= LayoutItem.__update_invalidation_count:
+            self.__layout_dirty = False
+
     def get_maximum_size(self) -> cmg.Vec2:
         return self.__maximum_size
 
@@ -61,6 +115,13 @@ class LayoutItem:
     def get_size(self) -> cmg.Vec2:
         return cmg.Vec2(self.rect.size)
 
+    def map_rect_to_parent(self, rect: Rect) -> Rect:
+        """
+        Maps a rect in the coordinates of this item's children to the
+        coordinates of this item's parent.
+        """
+        return rect
+
     def get_root_parent(self):
         if self.parent:
             return self.parent.get_root_parent()
@@ -70,28 +131,48 @@ class LayoutItem:
         raise NotImplementedError()
 
     def set_rect(self, rect: Rect):
-        self.rect = Rect(rect)
+        rect = Rect(rect)
+        if rect != self.rect:
+            self.rect = rect
+            self._mark_layout_dirty()
 
     def set_size(self, size):
-        self.rect.size = cmg.Vec2(size).totuple()
+        size = cmg.Vec2(size).totuple()
+        if size != self.rect.size:
+            self.rect.size = size
+            self._mark_layout_dirty()
 
     def set_maximum_size(self, size):
-        self.__maximum_size = cmg.Vec2(size)
+        size = cmg.Vec2(size)
+        if size.x != self.__maximum_size.x or size.y != self.__maximum_size.y:
+            self.__maximum_size = size
+            self.invalidate_layout()
 
     def set_maximum_width(self, width):
-        self.__maximum_size.x = width
+        if width != self.__maximum_size.x:
+            self.__maximum_size.x = width
+            self.invalidate_layout()
 
     def set_maximum_height(self, height):
-        self.__maximum_size.y = height
+        if height != self.__maximum_size.y:
+            self.__maximum_size.y = height
+            self.invalidate_layout()
 
     def set_minimum_size(self, size):
-        self.__minimum_size = cmg.Vec2(size)
+        size = cmg.Vec2(size)
+        if size.x != self.__minimum_size.x or size.y != self.__minimum_size.y:
+            self.__minimum_size = size
+            self.invalidate_layout()
 
     def set_minimum_width(self, width):
-        self.__minimum_size.x = width
+        if width != self.__minimum_size.x:
+            self.__minimum_size.x = width
+            self.invalidate_layout()
 
     def set_minimum_height(self, height):
-        self.__minimum_size.y = height
+        if height != self.__minimum_size.y:
+            self.__minimum_size.y = height
+            self.invalidate_layout()
 
     def get_parent(self):
         return self.parent
@@ -99,3 +180,4 @@ class LayoutItem:
     def set_parent(self, parent):
         if parent != self.parent:
             self.parent = parent
+            self.invalidate_layout()
@@ -10,6 +10,7 @@ from cmg.input import Keys
 from cmg.color import Color
 from cmg.input import KeyMods
 from cmg.event import Event
+from cmg.utilities import AutocompleteSource
 from cmg.widgets.widget import Widget
 
 class TextEdit(Widget):
@@ -29,6 +30,7 @@ class TextEdit(Widget):
         
         self.__edited = False
         self.__autocomplete_source = None
+        self.__autocomplete_query = None
         self.__background_text = None
         self.__autocomplete_text = None
         self.__background_color = cmg.Theme.color_text_box_background
@@ -66,13 +68,26 @@ class TextEdit(Widget):
         self.__background_text = text
 
     def set_autocomplete_source(self, autocomplete_source):
-        """Sets the list of autocomplete items."""
+        """
+        Sets the autocomplete items, either as an AutocompleteSource or as a
+        list of items to create one from.
+        """
+        if (autocomplete_source is not None and
+                not isinstance(autocomplete_source, AutocompleteSource)):
+            autocomplete_source = AutocompleteSource(autocomplete_source)
         self.__autocomplete_source = autocomplete_source
+        self.__autocomplete_query = None
+        if not autocomplete_source:
+            self.__autocomplete_text = None
     
     def set_background_color(self, color: Color):
         """Sets the background color of the text box."""
         self.__background_color = Color(color)
 
+    def on_gain_focus(self):
+        """Called when the widget gains focus."""
+        self.__schedule_cursor_blink()
+
     def on_lose_focus(self):
         """Called when the widget loses focus."""
         self.deselect()
@@ -91,6 +106,9 @@ class TextEdit(Widget):
 
     def update(self):
         """Updates the text box."""
+        # Measure the time since the last update, which can be long when
+        # the application idles until the next cursor blink
+        self.clock.tick()
         if self.is_focused():
 
             # Update key counters:
@@ -119,22 +137,21 @@ class TextEdit(Widget):
             if self.cursor_ms_counter >= self.cursor_switch_ms:
                 self.cursor_ms_counter %= self.cursor_switch_ms
                 self.cursor_visible = not self.cursor_visible
+                self.__schedule_cursor_blink()
         else:
             self.keyrepeat_counters = {}
             self.cursor_visible = False
 
-        # Update auto-complete
-        if self.__autocomplete_source:
+        # Update auto-complete when the text changes
+        if (self.__autocomplete_source and
+                self.__text != self.__autocomplete_query):
+            self.__autocomplete_query = self.__text
             self.__background_text = None
-            self.__autocomplete_text = None
-            if self.__text:
-                for item in self.__autocomplete_source:
-                    item = str(item)
-                    if item.lower().startswith(self.__text.lower()):
-                        self.__background_text = self.__text + item[len(self.__text):]
-                        self.__autocomplete_text = item
-                        if item.lower() == self.__text.lower():
-                            break
+            self.__autocomplete_text = self.__autocomplete_source.complete(
+                self.__text)
+            if self.__autocomplete_text is not None:
+                self.__background_text = (
+                    self.__text + self.__autocomplete_text[len(self.__text):])
 
         # Re-render text surface
         state = (self.__text,
@@ -145,6 +162,7 @@ class TextEdit(Widget):
         if state[:2] != self.__prev_state[:2]:
             self.cursor_ms_counter = 0
             self.cursor_visible = self.is_focused()
+            self.__schedule_cursor_blink()
         if state != self.__prev_state:
             self.__prev_state = state
             self.__surface_text = self.__font.render(
@@ -154,7 +172,6 @@ class TextEdit(Widget):
                     self.__background_text,
                     color=self.__background_text_color)
 
-        self.clock.tick()
         self.__edited = False
 
     def on_key_pressed(self, key, mod, text):
@@ -373,6 +390,13 @@ class TextEdit(Widget):
             pos += step
         return pos
 
+    def __schedule_cursor_blink(self):
+        """Redraws the text box when the cursor next blinks."""
+        app = Application.instance
+        if app is not None and self.is_focused():
+            delay_ms = self.cursor_switch_ms - self.cursor_ms_counter
+            app.schedule_damage(delay_ms / 1000.0, self.get_screen_rect())
+
     def __apply_autocomplete(self):
         """Loads the current autocomplete suggestion text into the text box."""
         if self.__autocomplete_source and self.__background_text:
@@ -0,0 +1,194 @@
+from pygame.rect import Rect
+import cmg
+from cmg.widgets.layout import Layout
+from cmg.widgets.abstract_scroll_area import AbstractScrollArea
+from cmg.widgets.abstract_scroll_area import SubRegionLayout
+
+
+class VirtualListLayout(Layout):
+    """
+    Vertical list of equal-height rows which only has widgets for the rows
+    inside the viewport of the enclosing AbstractScrollArea.
+
+    Row widgets are created with create_row() and are bound to a row index
+    with bind_row(widget, index). When rows scroll out of view, their
+    widgets are pooled and bound to the rows scrolling into view, so the
+    number of widgets depends on the viewport height rather than on the row
+    count. A row containing the focused widget keeps its widget.
+
+    Every row must have the same height, which is measured from the widget
+    of the first row. It is measured again whenever the layout is
+    invalidated while the first row is in view, such as when that row's
+    text or font changes its size.
+    """
+
+    def __init__(self, create_row=None, bind_row=None):
+        super().__init__()
+        self.__create_row = create_row
+        self.__bind_row = bind_row
+        self.__row_count = 0
+        self.__row_height = None
+        self.__row_widgets = {}
+        self.__pool = []
+        self.__viewport = None
+        self.__focused_rows = set()  # Rows kept out of view for their focus
+
+    def get_children(self):
+        return [self.__row_widgets[index]
+                for index in sorted(self.__row_widgets)]
+
+    def get_row_count(self) -> int:
+        return self.__row_count
+
+    def get_row_height(self) -> int:
+        """Returns the height of each row, measured from the first row."""
+        if self.__row_height is None:
+            if not self.__row_count:
+                return 0
+            widget = self.__row_widgets.get(0, None)
+            if widget is not None:
+                self.__row_height = max(1, widget.calc_minimum_size().y)
+            else:
+                widget = self.__acquire_widget(0)
+                self.__row_height = max(1, widget.calc_minimum_size().y)
+                self.__release_widget(0)
+        return self.__row_height
+
+    def get_row_rect(self, index: int) -> Rect:
+        """Returns the rect of a row in the coordinates of the layout."""
+        height = self.get_row_height()
+        rect = self.get_rect()
+        return Rect(rect.left, rect.top + index * height, rect.width, height)
+
+    def get_row_widget(self, index: int):
+        """
+        Returns the widget bound to a row, binding one if the row is not
+        currently in view.
+        """
+        assert 0 <= index < self.__row_count
+        widget = self.__row_widgets.get(index, None)
+        if widget is None:
+            widget = self.__acquire_widget(index)
+            widget.set_rect(self.get_row_rect(index))
+        return widget
+
+    def set_row_count(self, row_count: int):
+        """Sets the number of rows, releasing the widgets of removed rows."""
+        for index in list(self.__row_widgets):
+            if index >= row_count:
+                self.__release_widget(index)
+        self.__row_count = row_count
+        if not row_count:
+            self.__row_height = None
+        self.invalidate_layout()
+
+    def refresh_row(self, index: int):
+        """Re-binds a row's widget after the row's data changed."""
+        widget = self.__row_widgets.get(index, None)
+        if widget is not None:
+            self.__bind_row(widget, index)
+
+    def refresh_rows(self):
+        """Re-binds the widgets of all rows in view."""
+        for index, widget in self.__row_widgets.items():
+            self.__bind_row(widget, index)
+
+    def ensure_row_visible(self, index: int):
+        """Scrolls the enclosing scroll area to show a row."""
+        parent = self.get_parent()
+        while parent is not None and not isinstance(
+                parent, AbstractScrollArea):
+            parent = parent.get_parent()
+        if parent is not None:
+            parent.ensure_visible(self.get_row_rect(index))
+
+    def update(self):
+        viewport = self.__get_viewport()
+        if (self.is_layout_dirty() or viewport != self.__viewport or
+                self.__has_lost_focus()):
+            self.__viewport = viewport
+            # Binding rows may change their size hints, which re-invalidates
+            # the layout for the next update
+            self._clear_layout_dirty()
+            self.on_update()
+        self.update_children()
+
+    def on_update(self):
+        if not self.__row_count:
+            return
+        height = self.get_row_height()
+        top = self.get_rect().top
+        first = max(0, (self.__viewport.top - top) // height)
+        last = min(self.__row_count,
+                   (self.__viewport.bottom - top + height - 1) // height)
+
+        # Pool the widgets of rows which left the viewport
+        self.__focused_rows = set()
+        for index in list(self.__row_widgets):
+            if index < first or index >= last:
+                if self.__has_focus(self.__row_widgets[index]):
+                    self.__focused_rows.add(index)
+                else:
+                    self.__release_widget(index)
+
+        # Bind widgets to rows which entered the viewport
+        for index in range(first, last):
+            if index not in self.__row_widgets:
+                self.__acquire_widget(index)
+
+        for index, widget in self.__row_widgets.items():
+            widget.set_rect(self.get_row_rect(index))
+
+    def calc_maximum_size(self) -> cmg.Vec2:
+        if not self.is_layout_dirty():
+            return self.get_maximum_size()
+        for widget in self.__row_widgets.values():
+            widget.calc_maximum_size()
+        max_size = cmg.Vec2(self.DEFAULT_MAX_SIZE, self.DEFAULT_MAX_SIZE)
+        self.set_maximum_size(max_size)
+        return max_size
+
+    def calc_minimum_size(self) -> cmg.Vec2:
+        if not self.is_layout_dirty():
+            return self.get_minimum_size()
+        if 0 in self.__row_widgets:
+            self.__row_height = max(
+                1, self.__row_widgets[0].calc_minimum_size().y)
+        min_size = cmg.Vec2(0, self.__row_count * self.get_row_height())
+        for widget in self.__row_widgets.values():
+            min_size.x = max(min_size.x, widget.calc_minimum_size().x)
+        self.set_minimum_size(min_size)
+        return min_size
+
+    def __get_viewport(self) -> Rect:
+        """Returns the visible part of the layout."""
+        parent = self.get_parent()
+        while parent is not None:
+            if isinstance(parent, SubRegionLayout):
+                return parent.get_viewport_rect()
+            parent = parent.get_parent()
+        return Rect(self.get_rect())
+
+    def __has_focus(self, widget) -> bool:
+        return any(child.is_focused() for child in widget.iter_child_widgets())
+
+    def __has_lost_focus(self) -> bool:
+        """Returns True if a row kept out of view for its focus lost it."""
+        return any(index not in self.__row_widgets or
+                   not self.__has_focus(self.__row_widgets[index])
+                   for index in self.__focused_rows)
+
+    def __acquire_widget(self, index: int):
+        if self.__pool:
+            widget = self.__pool.pop()
+        else:
+            widget = self.__create_row()
+        self.__row_widgets[index] = widget
+        widget.set_parent(self)
+        self.__bind_row(widget, index)
+        return widget
+
+    def __release_widget(self, index: int):
+        widget = self.__row_widgets.pop(index)
+        widget.set_parent(None)
+        self.__pool.append(widget)
@@ -1,10 +1,12 @@
 import traceback
 from pygame.rect import Rect
 import cmg
+import cmg.application
 from cmg.color import Color
 from cmg.widgets.layout_item import LayoutItem
 from cmg.event import Event
 from cmg.input import KeyShortcut
+from cmg.profiler import FrameProfiler
 
 
 class Widget(LayoutItem):
@@ -61,7 +63,9 @@ class Widget(LayoutItem):
     def set_visible(self, visible: bool):
         if not visible:
             self.closed.emit()
-        self.__visible = visible
+        if visible != self.__visible:
+            self.__visible = visible
+            self.invalidate_layout()
 
     def add_key_shortcut(self, shortcut: str, callback=None):
         shortcut = KeyShortcut(shortcut, callback=callback)
@@ -75,6 +79,7 @@ class Widget(LayoutItem):
             if self.focused:
                 self.get_root_parent().change_focus(None)
             self.parent = parent
+            self.invalidate_layout()
     
     def show(self):
         self.set_visible(True)
@@ -124,12 +129,12 @@ class Widget(LayoutItem):
         return self.focused_widget
 
     def calc_maximum_size(self) -> cmg.Vec2:
-        if self.layout:
+        if self.layout and self.is_layout_dirty():
             self.set_maximum_size(self.layout.calc_maximum_size())
         return self.get_maximum_size()
 
     def calc_minimum_size(self) -> cmg.Vec2:
-        if self.layout:
+        if self.layout and self.is_layout_dirty():
             self.set_minimum_size(self.layout.calc_minimum_size())
         return self.get_minimum_size()
 
@@ -167,6 +172,7 @@ class Widget(LayoutItem):
     def set_layout(self, layout):
         self.layout = layout
         self.layout.set_parent(self)
+        self.invalidate_layout()
 
     def focus(self) -> bool:
         self.get_root_parent().change_focus(self)
@@ -181,9 +187,19 @@ class Widget(LayoutItem):
                 yield widget
 
     def main_update(self):
-        self.calc_maximum_size()
-        self.calc_minimum_size()
-        self.update()
+        profiler = FrameProfiler.instance
+        if profiler is None:
+            self.calc_maximum_size()
+            self.calc_minimum_size()
+            self.begin_layout_update()
+            self.update()
+            return
+        with profiler.phase("layout"):
+            self.calc_maximum_size()
+            self.calc_minimum_size()
+            self.begin_layout_update()
+        with profiler.phase("widget_update"):
+            self.update()
 
         # try:
         #     log = ""
@@ -200,15 +216,22 @@ class Widget(LayoutItem):
         self.update_layout()
 
     def update_layout(self):
+        """
+        Lays out this widget's children. Only layouts whose size hints or
+        rect changed since the last update are recalculated.
+        """
         if self.layout:
             self.layout.set_rect(Rect(self.get_rect()))
             self.layout.update()
+        self._clear_layout_dirty()
 
     def draw(self, g):
         if not g.is_rect_in_viewport(self.get_rect()):
             return
         if self.rect.width <= 0 or self.rect.height <= 0:
             return
+        if FrameProfiler.instance is not None:
+            FrameProfiler.instance.count_draw(self)
         
         back_color = cmg.Theme.color_background
         if self.is_focused():
@@ -224,6 +247,26 @@ class Widget(LayoutItem):
             back_color.a = 128;
             g.fill_rect(self.rect, color=back_color)
 
+    def get_screen_rect(self) -> Rect:
+        """Returns the part of this widget's rect visible on the screen."""
+        rect = Rect(self.get_rect())
+        parent = self.get_parent()
+        while parent is not None:
+            rect = parent.map_rect_to_parent(rect)
+            parent = parent.get_parent()
+        return rect
+
+    def damage(self):
+        """
+        Marks this widget as needing to be redrawn when the application
+        only renders on change.
+        """
+        app = cmg.application.Application.instance
+        if app is not None:
+            rect = self.get_screen_rect()
+            if rect.width > 0 and rect.height > 0:
+                app.damage(rect)
+
     def _get_layout_item_children(self):
         if self.layout:
             return [self.layout]
@@ -1,5 +1,6 @@
 from enum import Enum, IntEnum
 import os
+import sys
 import time
 from study_tool.config import Config
 from study_tool.russian.word import *
@@ -49,14 +50,24 @@ def get_card_word_name(russian: AccentedText):
     return word_name
 
 
+def intern_accented_text(text) -> AccentedText:
+    """
+    Returns a copy of accented text whose text string is interned, so that
+    cards with the same text share a single string.
+    """
+    text = AccentedText(text)
+    text.text = sys.intern(text.text)
+    return text
+
+
 def get_card_key(word_type: WordType, russian: AccentedText,
                  english: AccentedText) -> tuple:
     """
     Get the key that identifies a card.
     """
     return (word_type,
-            AccentedText(russian).text.lower(),
-            AccentedText(english).text.lower())
+            get_lowercase_text(russian),
+            get_lowercase_text(english))
 
 def get_card_english_key(word_type: WordType,
                          english: AccentedText, card_attributes=()) -> tuple:
@@ -67,7 +78,7 @@ def get_card_english_key(word_type: WordType,
     english_attributes = [
         x.value for x in card_attributes
         if x in ENGLISH_SIDE_CARD_ATTRIBUTES]
-    return (word_type, AccentedText(english).text.lower(),
+    return (word_type, get_lowercase_text(english),
             ",".join(sorted(english_attributes)))
 
 def get_card_russian_key(word_type: WordType, russian: AccentedText) -> tuple:
@@ -75,14 +86,22 @@ def get_card_russian_key(word_type: WordType, russian: AccentedText) -> tuple:
     Returns the key that identifies the English translation
     from Russian text.
     """
-    return (word_type, AccentedText(russian).text.lower())
+    return (word_type, get_lowercase_text(russian))
     
 
 class Card:
     """
     A card with English and Russian sides that can be studied.
+
+    Cards use slots instead of an instance dictionary, as there can be
+    many thousands of them.
     """
 
+    __slots__ = ("__word_type", "__russian", "__english", "__card_attributes",
+                 "__examples", "__related_cards", "__creation_timestamp",
+                 "source", "__fixed_card_set", "__word_patterns", "word_name",
+                 "word", "__study_data")
+
     __STRING_TO_WORD_TYPE_DICT = {"none": WordType.Other,
                                   None: WordType.Other}
     for word_type in WordType:
@@ -109,9 +128,9 @@ class Card:
         if word_type is not None:
             self.__word_type = word_type
         if russian is not None:
-            self.__russian = AccentedText(russian)
+            self.__russian = intern_accented_text(russian)
         if english is not None:
-            self.__english = AccentedText(english)
+            self.__english = intern_accented_text(english)
         if attributes is not None:
             self.__card_attributes = list(attributes)
         if examples is not None:
@@ -125,15 +144,15 @@ class Card:
         self.source = None
         self.__fixed_card_set = None
         self.__word_patterns = []
-        self.word_name = AccentedText(self.__russian)
+        self.word_name = self.__russian
         self.word = None
         self.__study_data = None
 
     def set(self, other):
         """Sets the card data based on a copy."""
         self.__word_type = other.get_word_type()
-        self.__russian = AccentedText(other.get_russian())
-        self.__english = AccentedText(other.get_english())
+        self.__russian = intern_accented_text(other.get_russian())
+        self.__english = intern_accented_text(other.get_english())
         self.__card_attributes = list(other.get_attributes())
         self.__examples = list(other.get_examples())
         self.__related_cards = list(other.get_related_cards())
@@ -206,7 +225,7 @@ class Card:
 
     def generate_word_name(self):
         """Generate the lits of word names from the card text."""
-        self.word_name = AccentedText(self.__russian)
+        self.word_name = self.__russian
         word_tokens = list(split_words(self.__russian.text))
         if len(word_tokens) > 0:
             self.word_name = AccentedText(word_tokens[0][0])
@@ -289,11 +308,11 @@ class Card:
 
     def set_english(self, english: AccentedText):
         """Set the english text."""
-        self.__english = AccentedText(english)
+        self.__english = intern_accented_text(english)
         
     def set_russian(self, russian: AccentedText):
         """Set the russian text."""
-        self.__russian = AccentedText(russian)
+        self.__russian = intern_accented_text(russian)
         
     def set_word_type(self, word_type: WordType):
         """Set the card type."""
@@ -330,8 +349,8 @@ class Card:
 
     def deserialize_card_data(self, state):
         """Deserialize the card data."""
-        self.__russian = AccentedText(state["ru"])
-        self.__english = AccentedText(state["en"])
+        self.__russian = intern_accented_text(state["ru"])
+        self.__english = intern_accented_text(state["en"])
         self.__word_type = self.__STRING_TO_WORD_TYPE_DICT[state["type"].lower()]
         self.__examples = []
         if "ex" in state:
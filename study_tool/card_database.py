@@ -15,6 +15,15 @@ from study_tool.card_set import CardSetType
 from study_tool.card_set import CardSetPackage
 from study_tool.card_set import CardGroupMetrics
 from study_tool.card_set import StudySet
+from study_tool.card_set_loader import CardSetLoader
+from study_tool.card_search_index import CardSearchIndex
+from study_tool.card_snapshot import CardSnapshotReader
+from study_tool.card_snapshot import CardSnapshotWriter
+from study_tool.card_snapshot import get_card_data_source
+from study_tool.card_snapshot import get_card_snapshot_path
+from study_tool.card_snapshot import get_card_snapshot_recovery_path
+from study_tool.card_snapshot import is_card_snapshot_current
+from study_tool.card_snapshot import read_card_snapshot_info
 from study_tool.card_attributes import CardAttributes
 from study_tool.external import googledocs
 from study_tool.russian.types import *
@@ -23,6 +32,14 @@ from study_tool.config import Config
 from study_tool.word_database import WordDatabase
 
 
+class CardDataConflictError(Exception):
+    """
+    Raised when loading card data whose file was changed after its snapshot
+    was saved with changes which were not exported to the file.
+    """
+    pass
+
+
 class CardDatabase:
     """
     Database class to store Cards, CardSets, and CardSetPackages
@@ -42,6 +59,7 @@ class CardDatabase:
         self.__word_database = word_database
         self.__lock_modify = ReadWriteLock()
         self.__card_data_path = None
+        self.__card_data_source = None
         self.__is_saving = False
 
         # Card data
@@ -49,10 +67,14 @@ class CardDatabase:
         self.__word_to_cards_dict = {}
         self.__russian_key_to_card_dict = {}
         self.__english_key_to_card_dict = {}
+        self.__card_to_keys_dict = {}
+        self.__search_index = CardSearchIndex()
 
         # Card set data
+        self.__card_set_loader = CardSetLoader()
         self.__root_package = None
         self.__path_to_card_sets_dict = {}
+        self.__card_to_card_sets_dict = {}
 
         # Dirty state
         self.__lock_save = threading.Lock()
@@ -74,6 +96,11 @@ class CardDatabase:
     def is_saving(self) -> bool:
         """Returns True if currently saving the database."""
         return self.__is_saving
+
+    def is_card_data_modified(self) -> bool:
+        """Returns True if any card changed since card data was saved."""
+        with self.__lock_dirty:
+            return bool(self.__dirty_cards)
         
     def iter_card_sets(self) -> bool:
         """Iterates all card sets."""
@@ -85,20 +112,23 @@ class CardDatabase:
 
     def has_card(self, card: Card) -> bool:
         with self.__lock_modify.acquire_read():
-            return card in self.cards.values()
+            return card in self.__card_to_keys_dict
 
     def get_orphan_cards(self) -> list:
-        card_sets = list(self.__root_package.all_card_sets())
-        orphan_cards = []
-        for _, card in self.cards.items():
-            orphan = True
-            for card_set in card_sets:
-                if card_set.has_card(card):
-                    orphan = False
-                    break
-            if orphan:
-                orphan_cards.append(card)
-        return orphan_cards
+        """Returns the list of cards which are not in any card set."""
+        with self.__lock_modify.acquire_read():
+            return [card for card in self.cards.values()
+                    if not self.__card_to_card_sets_dict.get(card)]
+
+    def get_card_sets_for_card(self, card: Card) -> list:
+        """Returns the list of card sets which contain a card."""
+        with self.__lock_modify.acquire_read():
+            return list(self.__card_to_card_sets_dict.get(card, ()))
+
+    def is_card_in_set(self, card: Card, card_set: CardSet) -> bool:
+        """Returns True if a card set contains a card."""
+        with self.__lock_modify.acquire_read():
+            return card_set in self.__card_to_card_sets_dict.get(card, ())
 
     def get_card_sets_from_path(self, path: str) -> list:
         with self.__lock_modify.acquire_read():
@@ -126,14 +156,14 @@ class CardDatabase:
         with self.__lock_modify.acquire_read():
             if english is not None and russian is not None:
                 key = (word_type,
-                       AccentedText(russian).text.lower(),
-                       AccentedText(english).text.lower())
+                       get_lowercase_text(russian),
+                       get_lowercase_text(english))
                 return self.cards.get(key, None)
             if english is not None:
-                key = (word_type, AccentedText(english).text.lower())
+                key = (word_type, get_lowercase_text(english))
                 return self.__english_key_to_card_dict.get(key, None)
             if russian is not None:
-                key = (word_type, AccentedText(russian).text.lower())
+                key = (word_type, get_lowercase_text(russian))
                 return self.__russian_key_to_card_dict.get(key, None)
             raise Exception("Missing english or russian argument")
 
@@ -143,18 +173,31 @@ class CardDatabase:
         """
         with self.__lock_modify.acquire_read():
             if english is not None:
-                english = AccentedText(english).text.lower()
+                english = get_lowercase_text(english)
             if russian is not None:
-                russian = AccentedText(russian).text.lower()
+                russian = get_lowercase_text(russian)
             for _, card in self.cards.items():
                 if word_type is not None and card.get_word_type() != word_type:
                     continue
-                if english is not None and card.get_english().text.lower() != english:
+                if english is not None and get_lowercase_text(card.get_english()) != english:
                     continue
-                if russian is not None and card.get_russian().text.lower() != russian:
+                if russian is not None and get_lowercase_text(card.get_russian()) != russian:
                     continue
                 yield card
 
+    def search_cards(self, text: str, count=None, filter_func=None) -> tuple:
+        """
+        Searches for cards whose Russian or English text contains the given
+        text, using the search index.
+
+        :param count: Maximum number of cards to return, or None for all.
+        :param filter_func: Optional function to exclude cards from results.
+        :returns: tuple of (list of best matching cards, total match count)
+        """
+        with self.__lock_modify.acquire_read():
+            return self.__search_index.search(
+                text, count=count, filter_func=filter_func)
+
     def find_card(self, word_type=None, english=None, russian=None) -> Card:
         """Returns the first card with the given properties, or None."""
         for card in self.iter_cards(word_type=word_type, english=english, russian=russian):
@@ -177,7 +220,10 @@ class CardDatabase:
             self.__word_to_cards_dict = {}
             self.__russian_key_to_card_dict = {}
             self.__english_key_to_card_dict = {}
+            self.__card_to_keys_dict = {}
+            self.__search_index.clear()
             self.__path_to_card_sets_dict = {}
+            self.__card_to_card_sets_dict = {}
 
     def create_card_set(self, name, file_name: str, package: CardSetPackage,
                         card_set_type=CardSetType.Other) -> CardSet:
@@ -199,6 +245,7 @@ class CardDatabase:
         Config.logger.info("Adding card '{}' to set '{}'".format(card, card_set.get_name()))
         with self.__lock_modify.acquire_write():
             card_set.add_card(card)
+            self.__add_card_set_membership(card, card_set)
             with self.__lock_dirty:
                 self.__dirty_card_sets.add(card_set)
             self.card_added_to_set.emit(card, card_set)
@@ -208,6 +255,7 @@ class CardDatabase:
         Config.logger.info("Removing card '{}' from set '{}'".format(card, card_set.get_name()))
         with self.__lock_modify.acquire_write():
             card_set.remove_card(card)
+            self.__remove_card_set_membership(card, card_set)
             with self.__lock_dirty:
                 self.__dirty_card_sets.add(card_set)
             self.card_removed_from_set.emit(card, card_set)
@@ -248,6 +296,8 @@ class CardDatabase:
             self.__russian_key_to_card_dict[ru_key] = card
             self.__english_key_to_card_dict[en_key] = card
             self.cards[key] = card
+            self.__card_to_keys_dict[card] = (key, ru_key, en_key)
+            self.__search_index.add_card(card)
 
             # Get the Word info associated with this card
             word = None
@@ -280,37 +330,17 @@ class CardDatabase:
             for related_card in related_cards:
                 self.unlink_related_cards(card, related_card)
 
-            # Remove from russian key dict
-            found_ru_key = False
-            for key, old_card in self.__russian_key_to_card_dict.items():
-                if old_card == card:
-                    found_ru_key = True
-                    del self.__russian_key_to_card_dict[key]
-                    break
-            assert found_ru_key
-
-            # Remove from english key dict
-            found_en_key = False
-            for key, old_card in self.__english_key_to_card_dict.items():
-                if old_card == card:
-                    found_en_key = True
-                    del self.__english_key_to_card_dict[key]
-                    break
-            assert found_en_key
-
-            # Remove from key dict
-            found_key = False
-            for key, old_card in self.cards.items():
-                if old_card == card:
-                    found_key = True
-                    del self.cards[key]
-                    break
-            assert found_key
+            # Remove from the key dicts
+            key, ru_key, en_key = self.__card_to_keys_dict.pop(card)
+            assert self.__russian_key_to_card_dict.pop(ru_key) is card
+            assert self.__english_key_to_card_dict.pop(en_key) is card
+            assert self.cards.pop(key) is card
+            self.__search_index.remove_card(card)
 
             # Remove this card from any card sets
-            for card_set in self.iter_card_sets():
-                if card_set.has_card(card):
-                    self.remove_card_from_set(card, card_set)
+            for card_set in list(self.__card_to_card_sets_dict.get(card, ())):
+                self.remove_card_from_set(card, card_set)
+            self.__card_to_card_sets_dict.pop(card, None)
         
             with self.__lock_dirty:
                 self.__dirty_cards.add(card)
@@ -377,6 +407,9 @@ class CardDatabase:
                     self.link_related_cards(original, related_card)
                     is_changed = True
 
+            if is_key_changed:
+                self.__search_index.update_card(original)
+
             if is_changed:
                 Config.logger.info("Applied updates to card: " + repr(original))
                 with self.__lock_dirty:
@@ -440,9 +473,25 @@ class CardDatabase:
         if old_key != new_key:
             del self.cards[old_key]
             self.cards[new_key] = original
-        
+        if changed:
+            self.__card_to_keys_dict[original] = (new_key, new_ru_key, new_en_key)
+
         return (changed, key_changed)
 
+    def __add_card_set_membership(self, card: Card, card_set: CardSet):
+        """Records that a card set contains a card."""
+        card_sets = self.__card_to_card_sets_dict.get(card, None)
+        if card_sets is None:
+            self.__card_to_card_sets_dict[card] = {card_set: None}
+        else:
+            card_sets[card_set] = None
+
+    def __remove_card_set_membership(self, card: Card, card_set: CardSet):
+        """Records that a card set no longer contains a card."""
+        card_sets = self.__card_to_card_sets_dict.get(card, None)
+        if card_sets is not None:
+            card_sets.pop(card_set, None)
+
     def link_related_cards(self, a: Card, b: Card):
         """Links two cards as related."""
         Config.logger.info("Linking related cards '{a}' and '{b}'"
@@ -499,11 +548,17 @@ class CardDatabase:
             # Update card list
             if cards is not None:
                 old_cards = card_set.get_cards()
-                removed_cards = [x for x in old_cards if x not in cards]
-                added_cards = [x for x in cards if x not in old_cards]
-                if removed_cards or removed_cards or old_cards != cards:
+                old_card_set = set(old_cards)
+                new_card_set = set(cards)
+                removed_cards = [x for x in old_cards if x not in new_card_set]
+                added_cards = [x for x in cards if x not in old_card_set]
+                if removed_cards or added_cards or old_cards != list(cards):
                     is_changed = True
                 card_set.set_cards(cards)
+                for card in removed_cards:
+                    self.__remove_card_set_membership(card, card_set)
+                for card in added_cards:
+                    self.__add_card_set_membership(card, card_set)
 
             if is_changed:
                 with self.__lock_dirty:
@@ -533,10 +588,9 @@ class CardDatabase:
 
                 # Any card sets which contain any cards whose key changed must
                 # also be saved
-                for card_set in self.__root_package.all_card_sets():
-                    for card in self.__dirty_key_change_cards:
-                        if card_set.has_card(card):
-                            self.__dirty_card_sets.add(card_set)
+                for card in self.__dirty_key_change_cards:
+                    self.__dirty_card_sets.update(
+                        self.__card_to_card_sets_dict.get(card, ()))
 
                 # Save card sets
                 dirty_sets = list(self.__dirty_card_sets)
@@ -546,7 +600,8 @@ class CardDatabase:
         
     def save_card_data(self, path=None):
         """
-        Saves card data to a YAML file.
+        Saves card data to a JSON file. Saving to the card data file also
+        writes its binary snapshot, which is only a cache to load it faster.
         """
         if path is None:
             path = self.__card_data_path
@@ -575,36 +630,104 @@ class CardDatabase:
                 #                  allow_unicode=True, default_flow_style=True,
                 #                  Dumper=yaml.CDumper)
 
-                os.remove(path)
-                os.rename(temp_path, path)
+                os.replace(temp_path, path)
+                if path == self.__card_data_path:
+                    self.__card_data_source = get_card_data_source(path)
+                    self.__write_card_snapshot(path)
                 with self.__lock_dirty:
                     self.__dirty_cards.clear()
-
                 self.__is_saving = False
 
     def load_card_data(self, path: str):
         """
-        Loads card data from a YAML file.
+        Loads card data from its binary snapshot, or imports it from the
+        JSON/YAML file if there is no snapshot of its current contents.
+
+        Snapshots saved by older versions can have card changes which were
+        never exported to the card data file. These are exported now if the
+        file is unchanged. Otherwise, the snapshot's cards are written to a
+        recovery file to merge by hand, and CardDataConflictError is raised.
         """
-        Config.logger.info("Loading card data from: " + path)
+        snapshot_path = get_card_snapshot_path(path)
         with self.__lock_modify.acquire_write():
             self.__card_data_path = path
-            with open(path, "r", encoding="utf8") as f:
-                state = yaml.load(f, Loader=yaml.CLoader)
-                self.__deserialize_card_data(state)
-            # with open(path + ".json", "w", encoding="utf8") as f:
-            #     json.dump(state, f, indent=2)
+            info = read_card_snapshot_info(snapshot_path)
+            if is_card_snapshot_current(path):
+                Config.logger.info("Loading card data snapshot from: " +
+                                   snapshot_path)
+                state = CardSnapshotReader().read(snapshot_path)
+                self.__card_data_source = (info.source if info.version >= 2
+                                           else get_card_data_source(path))
+                exported = not info.has_unexported_changes
+            elif info is not None and info.has_unexported_changes:
+                recovery_path = get_card_snapshot_recovery_path(path)
+                state = CardSnapshotReader().read(snapshot_path)
+                with open(recovery_path, "w", encoding="utf8") as f:
+                    json.dump(state, f, indent='\t', ensure_ascii=False)
+                raise CardDataConflictError(
+                    "Card data file {} was changed after the snapshot {} "
+                    "was saved with changes which were not exported to it. "
+                    "The snapshot's cards were written to {}. Merge them "
+                    "into the card data file, then delete the snapshot."
+                    .format(path, snapshot_path, recovery_path))
+            else:
+                Config.logger.info("Importing card data from: " + path)
+                with open(path, "r", encoding="utf8") as f:
+                    state = yaml.load(f, Loader=yaml.CLoader)
+                self.__card_data_source = get_card_data_source(path)
+                exported = False
+            self.__deserialize_card_data(state)
             with self.__lock_dirty:
                 self.__dirty_cards.clear()
+
+        if info is not None and info.has_unexported_changes:
+            # Export the changes saved only to an older snapshot
+            self.save_card_data()
+        elif not exported:
+            # Write a snapshot so the next load can skip the import
+            with self.__lock_modify.acquire_read():
+                self.__write_card_snapshot(path)
+
+    def __write_card_snapshot(self, path: str):
+        """
+        Writes the snapshot of the card data. Must be called while holding
+        the lock.
+        """
+        snapshot_path = get_card_snapshot_path(path)
+        Config.logger.info("Saving card data snapshot to: " + snapshot_path)
+        writer = CardSnapshotWriter()
+        for card_state in self.__serialize_card_data():
+            writer.add_card(card_state)
+
+        # Save to temp file first
+        temp_path = snapshot_path + ".temp"
+        writer.write(temp_path, source=self.__card_data_source)
+        os.replace(temp_path, snapshot_path)
                     
-    def load_card_sets(self, path: str) -> CardSetPackage:
+    def load_card_sets(self, path: str, cache_path=None) -> CardSetPackage:
         """
-        Loads the root card package.
+        Loads the root card package. Card set files are parsed in parallel,
+        and their parsed states are cached in the file at cache_path, if
+        given, so unchanged files are not parsed again.
         """
         Config.logger.info("Loading card sets from directory: " + path)
+        cache = self.__card_set_loader.get_cache()
+        if cache_path is not None and cache.get_entry_count() == 0:
+            cache.load(cache_path)
+        file_paths = self.__card_set_loader.find_files(path)
+        parsed_files = self.__card_set_loader.load_files(
+            file_paths, preprocess_lines=self.__preprocess_lines)
+        cache.remove_missing(file_paths)
+        if cache_path is not None and cache.is_modified():
+            cache.save(cache_path)
+
         with self.__lock_modify.acquire_write():
             self.__root_package = self.__load_card_package_directory(
-                path=path, name="words")
+                path=path, name="words", parsed_files=parsed_files)
+            self.__card_to_card_sets_dict = {}
+            for card_set in self.__root_package.all_card_sets():
+                for card in card_set.get_cards():
+                    self.__add_card_set_membership(card, card_set)
             with self.__lock_dirty:
                 self.__dirty_card_sets.clear()
             return self.__root_package
@@ -700,35 +823,41 @@ class CardDatabase:
                     card.add_related_card(related_card)
                     related_card.add_related_card(card)
 
-    def __load_card_package_directory(self, path: str, name: str) -> CardSetPackage:
+    def __load_card_package_directory(self, path: str, name: str,
+                                      parsed_files: dict) -> CardSetPackage:
+        """
+        Creates the package for a directory from its parsed card set files.
+        Files are visited in sorted order so loading is deterministic.
+        """
         package = CardSetPackage(name=name, path=path)
 
-        for filename in os.listdir(path):
+        for filename in sorted(os.listdir(path)):
             file_path = os.path.join(path, filename)
 
             if os.path.isdir(file_path):
                 # Load a new sub-package
                 sub_package = self.__load_card_package_directory(
-                    path=file_path, name=str(filename))
+                    path=file_path, name=str(filename),
+                    parsed_files=parsed_files)
                 if sub_package is not None:
                     sub_package.parent = package
                     package.packages.append(sub_package)
 
-            elif os.path.isfile(file_path):
+            elif file_path in parsed_files:
 
                 if file_path.endswith(".txt"):
                     # Load legacy card set file
-                    package.card_sets += self.__load_card_set_file(file_path)
+                    package.card_sets += self.__load_card_set_file(
+                        file_path, parsed_files[file_path])
 
                 elif file_path.endswith(".yaml"):
                     # Load new card set file
-                    with open(file_path, "r", encoding="utf8") as f:
-                        state = yaml.load(f, Loader=yaml.CLoader)
-                        if "card_set" in state:
-                            card_set = self.__deserialize_card_set(state)
-                            if card_set:
-                                package.add_card_set(card_set)
-                                self.__add_card_set_path(card_set, path=file_path)
+                    state = parsed_files[file_path]
+                    if "card_set" in state:
+                        card_set = self.__deserialize_card_set(state)
+                        if card_set:
+                            package.add_card_set(card_set)
+                            self.__add_card_set_path(card_set, path=file_path)
 
         if len(package.packages) == 0 and len(package.card_sets) == 0:
             return None
@@ -765,7 +894,8 @@ class CardDatabase:
                 if not cards:
                     raise Exception("Cannot find card {} in database"
                                     .format(card_state))
-                card_set.cards += cards
+                for card in cards:
+                    card_set.add_card(card)
             elif len(card_state) == 1:
                 text = card_state[1]
                 cards = list(self.iter_cards(russian=text))
@@ -774,82 +904,86 @@ class CardDatabase:
                 if not cards:
                     raise Exception("Cannot find card {} in database"
                                     .format(card_state))
-                card_set.cards += cards
+                for card in cards:
+                    card_set.add_card(card)
             else:
                 raise Exception(card_state)
         return card_set
     
-    def __load_card_set_file(self, path):
+    def __load_card_set_file(self, path, lines: list):
+        """
+        Creates the card sets and cards of a legacy text card set file from
+        its preprocessed lines.
+        """
         card_set = None
         card_sets = []
 
-        with open(path, "r", encoding="utf8") as f:
-            filename = path
-            line_number = -1
-            line = ""
-            card_set = None
-            word_type = None
-            card = None
-            try:
-                for filename, line_number, line in self.__preprocess_lines(path, f):
-                    line = line.strip()
-                    if line.startswith("@"):
-                        command = line.split()[0][1:]
-                        command_text = (line.split(None, 1)[
-                                        1:] or [""])[0].strip()
-                        value = line[len(command) + 1:].strip()
-                        if command == "name":
-                            card_set = CardSet(fixed_card_set=True)
-                            card_set.source = SourceLocation(filename=filename,
-                                                             line_number=line_number,
-                                                             line_text=line)
-                            self.__add_card_set_path(card_set, path=filename)
-                            card_set.name = AccentedText(value)
-                            card_set.key = card_set.name.text.lower().replace(" ", "_")
-                            card_sets.append(card_set)
-                        elif command == "type":
-                            word_type = self.__WORD_TYPE_DICT[value.lower()]
-                        elif command == "ex" or command == "example":
-                            assert card is not None
-                            card.add_example(command_text)
-                        else:
-                            raise Exception(
-                                "uknown @ command: '{}'".format(command))
-                    elif line.startswith("#"):
-                        pass  # ignore comments
-                    elif len(line) == 0:
-                        pass  # ignore whitespace
-                    else:
-                        tokens = []
-                        for delimeter in self.__TOKEN_DELIMETERS:
-                            if delimeter in line:
-                                tokens = [t.strip()
-                                          for t in line.split(delimeter)]
-                                break
-                        if len(tokens) == 2:
-                            assert word_type is not None
-                            russian, attributes_left = self.__parse_card_text(tokens[0])
-                            english, attributes_right = self.__parse_card_text(tokens[1])
-                            card = Card(russian=russian,
-                                        english=english,
-                                        word_type=word_type)
-                            card.set_fixed_card_set(card_set)
-                            card.source = SourceLocation(filename=filename,
+        filename = path
+        line_number = -1
+        line = ""
+        card_set = None
+        word_type = None
+        card = None
+        try:
+            for filename, line_number, line in lines:
+                line = line.strip()
+                if line.startswith("@"):
+                    command = line.split()[0][1:]
+                    command_text = (line.split(None, 1)[
+                                    1:] or [""])[0].strip()
+                    value = line[len(command) + 1:].strip()
+                    if command == "name":
+                        card_set = CardSet(fixed_card_set=True)
+                        card_set.source = SourceLocation(filename=filename,
                                                          line_number=line_number,
                                                          line_text=line)
-                            card.add_attributes(attributes_left)
-                            card.add_attributes(attributes_right)
-                            card_set.add_card(card)
-                            card.generate_word_name()
-                            self.add_card(card, verbose=False)
-                        else:
-                            raise Exception("unable to tokenize line")
-            except Exception as e:
-                Config.logger.error(
-                    "Exception: {}-{}: {}".format(filename, line_number, line))
-                Config.logger.error("{}: {}".format(type(e).__name__, str(e)))
-                raise
-                exit(1)
+                        self.__add_card_set_path(card_set, path=filename)
+                        card_set.name = AccentedText(value)
+                        card_set.key = card_set.name.text.lower().replace(" ", "_")
+                        card_sets.append(card_set)
+                    elif command == "type":
+                        word_type = self.__WORD_TYPE_DICT[value.lower()]
+                    elif command == "ex" or command == "example":
+                        assert card is not None
+                        card.add_example(command_text)
+                    else:
+                        raise Exception(
+                            "uknown @ command: '{}'".format(command))
+                elif line.startswith("#"):
+                    pass  # ignore comments
+                elif len(line) == 0:
+                    pass  # ignore whitespace
+                else:
+                    tokens = []
+                    for delimeter in self.__TOKEN_DELIMETERS:
+                        if delimeter in line:
+                            tokens = [t.strip()
+                                      for t in line.split(delimeter)]
+                            break
+                    if len(tokens) == 2:
+                        assert word_type is not None
+                        russian, attributes_left = self.__parse_card_text(tokens[0])
+                        english, attributes_right = self.__parse_card_text(tokens[1])
+                        card = Card(russian=russian,
+                                    english=english,
+                                    word_type=word_type)
+                        card.set_fixed_card_set(card_set)
+                        card.source = SourceLocation(filename=filename,
+                                                     line_number=line_number,
+                                                     line_text=line)
+                        card.add_attributes(attributes_left)
+                        card.add_attributes(attributes_right)
+                        card_set.add_card(card)
+                        card.generate_word_name()
+                        self.add_card(card, verbose=False)
+                    else:
+                        raise Exception("unable to tokenize line")
+        except Exception as e:
+            Config.logger.error(
+                "Exception: {}-{}: {}".format(filename, line_number, line))
+            Config.logger.error("{}: {}".format(type(e).__name__, str(e)))
+            raise
+            exit(1)
         return sorted(card_sets, key=lambda x: x.name)
     
     def __parse_card_text(self, text):
@@ -0,0 +1,135 @@
+import heapq
+from study_tool.card import Card
+from study_tool.russian.word import get_folded_text
+from study_tool.russian.word import get_lowercase_text
+
+
+def normalize_search_text(text: str) -> str:
+    """Normalizes text for case-insensitive, ё-insensitive searching."""
+    return text.lower().replace("ё", "е")
+
+
+def get_ngrams(text: str, max_length=3):
+    """
+    Returns the set of substrings of the text that are up to max_length
+    characters long.
+    """
+    grams = set()
+    for length in range(1, max_length + 1):
+        for index in range(len(text) - length + 1):
+            grams.add(text[index:index + length])
+    return grams
+
+
+class CardSearchIndex:
+    """
+    Inverted n-gram index for substring searching of card text.
+
+    Every 1, 2, and 3 character substring of each card's Russian and English
+    text maps to the set of cards containing it. A query only has to verify
+    the cards found in the intersection of its trigram posting sets, rather
+    than scanning every card.
+    """
+
+    GRAM_LENGTH = 3
+
+    def __init__(self):
+        self.__russian_grams = {}
+        self.__english_grams = {}
+        self.__card_text = {}
+        self.__card_order = {}
+        self.__next_order = 0
+
+    def __len__(self):
+        return len(self.__card_text)
+
+    def clear(self):
+        """Removes all cards from the index."""
+        self.__russian_grams = {}
+        self.__english_grams = {}
+        self.__card_text = {}
+        self.__card_order = {}
+
+    def add_card(self, card: Card):
+        """Adds a card to the index."""
+        russian = get_folded_text(card.get_russian())
+        english = get_lowercase_text(card.get_english())
+        self.__card_text[card] = (russian, english)
+        if card not in self.__card_order:
+            self.__card_order[card] = self.__next_order
+            self.__next_order += 1
+        for gram in get_ngrams(russian, self.GRAM_LENGTH):
+            self.__russian_grams.setdefault(gram, set()).add(card)
+        for gram in get_ngrams(english, self.GRAM_LENGTH):
+            self.__english_grams.setdefault(gram, set()).add(card)
+
+    def remove_card(self, card: Card, keep_order=False):
+        """Removes a card from the index."""
+        russian, english = self.__card_text.pop(card)
+        if not keep_order:
+            del self.__card_order[card]
+        self.__remove_grams(self.__russian_grams, russian, card)
+        self.__remove_grams(self.__english_grams, english, card)
+
+    def update_card(self, card: Card):
+        """Re-indexes a card after its text has changed."""
+        if card in self.__card_text:
+            self.remove_card(card, keep_order=True)
+        self.add_card(card)
+
+    def search(self, text: str, count=None, filter_func=None) -> tuple:
+        """
+        Searches for cards whose Russian or English text contains the given
+        text. Cards whose text is closest in length to the search text are
+        ranked first.
+
+        :param count: Maximum number of cards to return, or None for all.
+        :param filter_func: Optional function to exclude cards from results.
+        :returns: tuple of (list of best matching cards, total match count)
+        """
+        text = normalize_search_text(text)
+        if not text.strip():
+            return [], 0
+
+        matches = []
+        for card in (self.__find_candidates(self.__russian_grams, text) |
+                     self.__find_candidates(self.__english_grams, text)):
+            russian, english = self.__card_text[card]
+            if text in russian:
+                score = -(len(russian) - len(text))
+            elif text in english:
+                score = -(len(english) - len(text))
+            else:
+                continue
+            if filter_func and not filter_func(card):
+                continue
+            matches.append((score, -self.__card_order[card], card))
+
+        if count is None or count >= len(matches):
+            results = sorted(matches, key=lambda x: x[:2], reverse=True)
+        else:
+            results = heapq.nlargest(count, matches, key=lambda x: x[:2])
+        return [card for _, _, card in results], len(matches)
+
+    def __find_candidates(self, grams: dict, text: str) -> set:
+        """
+        Returns the set of cards containing every n-gram of the given text.
+        """
+        length = self.GRAM_LENGTH
+        if len(text) <= length:
+            return set(grams.get(text, ()))
+        postings = []
+        for index in range(len(text) - length + 1):
+            cards = grams.get(text[index:index + length], None)
+            if not cards:
+                return set()
+            postings.append(cards)
+        postings.sort(key=len)
+        return set.intersection(*postings)
+
+    def __remove_grams(self, grams: dict, text: str, card: Card):
+        for gram in get_ngrams(text, self.GRAM_LENGTH):
+            cards = grams[gram]
+            cards.discard(card)
+            if not cards:
+                del grams[gram]
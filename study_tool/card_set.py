@@ -54,7 +54,24 @@ class CardGroupMetrics:
 class StudySet:
     def __init__(self, name="", cards=()):
         self.name = AccentedText(name)
-        self.cards = list(cards)
+        self.__cards = {}
+        self.__card_list = None
+        self.set_cards(cards)
+
+    @property
+    def cards(self) -> list:
+        """
+        The list of cards, in order. Cards are stored as keys of an
+        insertion-ordered dict, so membership and removal are constant-time.
+        The returned list must not be modified.
+        """
+        if self.__card_list is None:
+            self.__card_list = list(self.__cards)
+        return self.__card_list
+
+    @cards.setter
+    def cards(self, cards: list):
+        self.set_cards(cards)
 
     def get_name(self) -> AccentedText:
         return self.name
@@ -63,25 +80,29 @@ class StudySet:
         return self.cards
 
     def get_card_count(self) -> int:
-        return len(self.cards)
+        return len(self.__cards)
 
     def has_card(self, card: Card) -> bool:
-        return card in self.cards
+        return card in self.__cards
 
     def set_name(self, name: AccentedText):
         self.name = AccentedText(name)
 
     def add_card(self, card: Card):
-        self.cards.append(card)
+        if card not in self.__cards:
+            self.__cards[card] = None
+            self.__card_list = None
 
     def remove_card(self, card: Card):
-        self.cards.remove(card)
+        del self.__cards[card]
+        self.__card_list = None
 
     def set_cards(self, cards: list):
-        self.cards = list(cards)
+        self.__cards = dict.fromkeys(cards)
+        self.__card_list = None
 
     def clear(self):
-        self.cards = []
+        self.set_cards(())
 
     def get_study_metrics(self):
         metrics = CardGroupMetrics()
@@ -111,7 +132,7 @@ class StudySet:
                                or c.get_history_score() < 0.9])
 
     def __repr__(self):
-        return "StudySet<{} cards>".format(len(self.cards))
+        return "StudySet<{} cards>".format(self.get_card_count())
 
 
 class CardSet(StudySet):
@@ -223,12 +244,18 @@ class CardSetPackage(StudySet):
 
     @property
     def cards(self) -> list:
-        unique_cards = set()
+        unique_cards = {}
         for card_set in self.all_card_sets():
-            for card in card_set.cards:
-                unique_cards.add(card)
+            unique_cards.update(dict.fromkeys(card_set.cards))
         return list(unique_cards)
 
+    def get_card_count(self) -> int:
+        return len(self.cards)
+
+    def has_card(self, card: Card) -> bool:
+        return any(card_set.has_card(card)
+                   for card_set in self.all_card_sets())
+
     def add_card_set(self, card_set: CardSet):
         """Adds a new card set to the package."""
         card_set.set_package(self)
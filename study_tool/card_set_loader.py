@@ -0,0 +1,178 @@
+import concurrent.futures
+import json
+import os
+import threading
+import yaml
+
+
+def is_json_state(state) -> bool:
+    """
+    Returns True if a state would be loaded back unchanged after saving it
+    as JSON. YAML can also load values such as dates, and mappings with
+    keys that are not strings.
+    """
+    if state is None or isinstance(state, (str, bool, int, float)):
+        return True
+    if isinstance(state, list):
+        return all(is_json_state(item) for item in state)
+    if isinstance(state, dict):
+        return all(isinstance(key, str) and is_json_state(value)
+                   for key, value in state.items())
+    return False
+
+
+class CardSetFileCache:
+    """
+    Cache of parsed card set file states, keyed by file path and valid for
+    as long as the file's modification time and size are unchanged. The
+    cache can be saved to and loaded from a JSON file so unchanged card
+    sets are not parsed again on the next run. States which JSON can't
+    represent are not cached.
+    """
+
+    VERSION = 1
+
+    def __init__(self):
+        self.__lock = threading.Lock()
+        self.__entries = {}
+        self.__modified = False
+
+    def is_modified(self) -> bool:
+        return self.__modified
+
+    def get_entry_count(self) -> int:
+        return len(self.__entries)
+
+    def get(self, path: str, mtime: float, size: int):
+        """Returns the cached state of a file, or None if not cached."""
+        with self.__lock:
+            entry = self.__entries.get(path, None)
+        if entry is None or entry[0] != mtime or entry[1] != size:
+            return None
+        return entry[2]
+
+    def put(self, path: str, mtime: float, size: int, state):
+        """
+        Caches the state of a file. Returns False if the state was not
+        cached because JSON can't represent it.
+        """
+        if not is_json_state(state):
+            with self.__lock:
+                if self.__entries.pop(path, None) is not None:
+                    self.__modified = True
+            return False
+        with self.__lock:
+            self.__entries[path] = (mtime, size, state)
+            self.__modified = True
+        return True
+
+    def remove_missing(self, paths):
+        """Removes the entries for any files not in a collection of paths."""
+        with self.__lock:
+            for path in set(self.__entries).difference(paths):
+                del self.__entries[path]
+                self.__modified = True
+
+    def load(self, path: str):
+        """Loads the cache from a file, if it exists and is readable."""
+        try:
+            with open(path, "r", encoding="utf8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version", None) != self.VERSION:
+            return
+        with self.__lock:
+            self.__entries = {entry_path: (mtime, size, state)
+                              for entry_path, mtime, size, state
+                              in data["entries"]}
+            self.__modified = False
+
+    def save(self, path: str):
+        """Saves the cache to a file, replacing it atomically."""
+        with self.__lock:
+            data = {"version": self.VERSION,
+                    "entries": [[entry_path, mtime, size, state]
+                                for entry_path, (mtime, size, state)
+                                in sorted(self.__entries.items())]}
+            self.__modified = False
+        temp_path = path + ".temp"
+        with open(temp_path, "w", encoding="utf8") as f:
+            json.dump(data, f, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temp_path, path)
+
+
+class CardSetLoader:
+    """
+    Finds and parses the card set files in a directory tree on a pool of
+    threads. YAML card set files are parsed into their serialized states,
+    which are cached until the file changes. Legacy text card set files
+    are read into lists of (filename, line_number, line) tuples, which
+    are not cached because they can include remote documents.
+
+    Parsed files are returned by path, for the card database to turn into
+    card sets in a deterministic order.
+    """
+
+    CARD_SET_FILE_EXTENSIONS = (".yaml", ".txt")
+
+    def __init__(self, cache=None, max_workers=8):
+        self.__cache = cache if cache is not None else CardSetFileCache()
+        self.__max_workers = max_workers
+
+    def get_cache(self) -> CardSetFileCache:
+        return self.__cache
+
+    def find_files(self, path: str) -> list:
+        """Returns the sorted paths of the card set files in a directory tree."""
+        paths = []
+        for directory, directory_names, filenames in os.walk(path):
+            directory_names.sort()
+            for filename in sorted(filenames):
+                if filename.endswith(self.CARD_SET_FILE_EXTENSIONS):
+                    paths.append(os.path.join(directory, filename))
+        return paths
+
+    def load_files(self, paths: list, preprocess_lines=None) -> dict:
+        """
+        Parses card set files, returning a dictionary from path to parsed
+        state. Text files are read with preprocess_lines(path, file), which
+        must be given if there are any. The first exception raised while
+        parsing a file, in path order, is raised once all files are done.
+        """
+        with concurrent.futures.ThreadPoolExecutor(
+                max_workers=self.__max_workers,
+                thread_name_prefix="card_sets") as executor:
+            futures = [executor.submit(self.load_file, path, preprocess_lines)
+                       for path in paths]
+            results = {path: future.result()
+                       for path, future in zip(paths, futures)}
+        return results
+
+    def load_file(self, path: str, preprocess_lines=None):
+        """Parses a single card set file."""
+        if path.endswith(".txt"):
+            with open(path, "r", encoding="utf8") as f:
+                return list(preprocess_lines(path, f))
+
+        stat = os.stat(path)
+        state = self.__cache.get(path, stat.st_mtime, stat.st_size)
+        if state is None:
+            with open(path, "r", encoding="utf8") as f:
+                text = f.read()
+            state = parse_card_set_text(text)
+            self.__cache.put(path, stat.st_mtime, stat.st_size, state)
+        return state
+
+
+def parse_card_set_text(text: str):
+    """
+    Parses the text of a YAML card set file. Card sets are saved as JSON,
+    which is parsed with the much faster JSON parser when possible.
+    """
+    if text.lstrip().startswith("{"):
+        try:
+            return json.loads(text)
+        except ValueError:
+            pass
+    return yaml.load(text, Loader=yaml.CLoader)
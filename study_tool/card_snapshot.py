@@ -0,0 +1,279 @@
+import os
+import struct
+
+SNAPSHOT_MAGIC = b"RSTC"
+SNAPSHOT_VERSION = 2
+SNAPSHOT_FILE_EXTENSION = ".snapshot"
+
+# Flags of the whole snapshot, stored after the header
+_SNAPSHOT_FLAG_HAS_UNEXPORTED_CHANGES = 0x1
+
+# Flags of each card record
+_CARD_FLAG_HAS_CREATION_TIMESTAMP = 0x1
+
+_HEADER = struct.Struct("<4sHI")
+_SOURCE = struct.Struct("<qQB")  # Added in version 2
+_UINT8 = struct.Struct("<B")
+_UINT16 = struct.Struct("<H")
+_UINT32 = struct.Struct("<I")
+_FLOAT64 = struct.Struct("<d")
+_CARD_FIELDS = struct.Struct("<IIIB")
+
+
+def get_card_snapshot_path(card_data_path: str) -> str:
+    """
+    Returns the path of the binary snapshot stored next to a card data
+    (JSON) file.
+    """
+    return os.path.splitext(card_data_path)[0] + SNAPSHOT_FILE_EXTENSION
+
+
+def get_card_snapshot_recovery_path(card_data_path: str) -> str:
+    """
+    Returns the path of the JSON file that the cards of a snapshot with
+    unexported changes are written to when they conflict with the card
+    data file.
+    """
+    return os.path.splitext(card_data_path)[0] + ".unexported.json"
+
+
+def get_card_data_source(card_data_path: str) -> tuple:
+    """
+    Returns the (modification time in nanoseconds, size) of a card data
+    file, which identifies the version of the file a snapshot was made
+    from, or None if the file does not exist.
+    """
+    try:
+        stat = os.stat(card_data_path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime_ns, stat.st_size)
+
+
+class CardSnapshotInfo:
+    """
+    The header of a snapshot file: its version, the card data file source
+    it was made from, and whether it has changes which were not exported
+    to that card data file. Snapshots are now only a cache of the card data
+    file, but older versions saved card changes only to the snapshot.
+    """
+
+    def __init__(self, version: int, source=None,
+                 has_unexported_changes=False):
+        self.version = version
+        self.source = source
+        self.has_unexported_changes = has_unexported_changes
+
+
+def read_card_snapshot_info(snapshot_path: str) -> CardSnapshotInfo:
+    """
+    Reads the header of a snapshot file, or returns None if it does not
+    exist. Version 1 snapshots do not record their source, and are assumed
+    to have unexported changes.
+    """
+    try:
+        with open(snapshot_path, "rb") as f:
+            data = f.read(_HEADER.size + _SOURCE.size)
+    except FileNotFoundError:
+        return None
+    return _unpack_info(data, snapshot_path)
+
+
+def is_card_snapshot_current(card_data_path: str) -> bool:
+    """
+    Returns True if a snapshot exists for the given card data file and was
+    made from its current contents, meaning the card data file does not
+    need to be re-imported.
+    """
+    snapshot_path = get_card_snapshot_path(card_data_path)
+    info = read_card_snapshot_info(snapshot_path)
+    if info is None:
+        return False
+    source = get_card_data_source(card_data_path)
+    if source is None:
+        return True
+    if info.version == 1:
+        return (os.path.getmtime(snapshot_path) >=
+                os.path.getmtime(card_data_path))
+    return info.source == source
+
+
+def _unpack_info(data: bytes, path: str) -> CardSnapshotInfo:
+    magic, version, _ = _HEADER.unpack_from(data, 0)
+    if magic != SNAPSHOT_MAGIC:
+        raise ValueError("Not a card snapshot file: " + path)
+    if version == 1:
+        return CardSnapshotInfo(version=1, has_unexported_changes=True)
+    if version != SNAPSHOT_VERSION:
+        raise ValueError("Unsupported card snapshot version {}: {}"
+                         .format(version, path))
+    mtime, size, flags = _SOURCE.unpack_from(data, _HEADER.size)
+    return CardSnapshotInfo(
+        version=version,
+        source=(mtime, size) if mtime >= 0 else None,
+        has_unexported_changes=bool(flags & _SNAPSHOT_FLAG_HAS_UNEXPORTED_CHANGES))
+
+
+class CardSnapshotWriter:
+    """
+    Writes serialized card states into the compact binary snapshot format.
+
+    The file consists of a header, the card data file source the snapshot
+    was made from, a table of interned strings, and one length-prefixed
+    record per card which refers to strings by index.
+    Card states are the dictionaries produced by Card.serialize_card_data().
+    """
+
+    def __init__(self):
+        self.__strings = []
+        self.__string_indices = {}
+        self.__records = []
+
+    def intern(self, text: str) -> int:
+        """Returns the string table index for a string, adding it if new."""
+        index = self.__string_indices.get(text, None)
+        if index is None:
+            index = len(self.__strings)
+            self.__strings.append(text)
+            self.__string_indices[text] = index
+        return index
+
+    def add_card(self, state: dict):
+        """Adds a serialized card state to the snapshot."""
+        intern = self.intern
+        timestamp = state.get("crtd", None)
+        flags = 0
+        if timestamp is not None:
+            flags |= _CARD_FLAG_HAS_CREATION_TIMESTAMP
+        parts = [_CARD_FIELDS.pack(intern(state["type"]),
+                                   intern(state["ru"]),
+                                   intern(state["en"]),
+                                   flags)]
+        if timestamp is not None:
+            parts.append(_FLOAT64.pack(timestamp))
+
+        attributes = state.get("attrs", ())
+        parts.append(_UINT16.pack(len(attributes)))
+        parts.extend(_UINT32.pack(intern(x)) for x in attributes)
+
+        examples = state.get("ex", ())
+        parts.append(_UINT16.pack(len(examples)))
+        parts.extend(_UINT32.pack(intern(x[0])) for x in examples)
+
+        related_keys = state.get("rel", ())
+        parts.append(_UINT16.pack(len(related_keys)))
+        for related_key in related_keys:
+            parts.append(_UINT8.pack(len(related_key)))
+            parts.extend(_UINT32.pack(intern(x)) for x in related_key)
+
+        self.__records.append(b"".join(parts))
+
+    def write(self, path: str, source=None, has_unexported_changes=False):
+        """
+        Writes the snapshot to a file. The source is the card data file
+        source the cards were last imported from or exported to, as
+        returned by get_card_data_source().
+        """
+        mtime, size = source if source is not None else (-1, 0)
+        flags = 0
+        if has_unexported_changes:
+            flags |= _SNAPSHOT_FLAG_HAS_UNEXPORTED_CHANGES
+        with open(path, "wb") as f:
+            f.write(_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION,
+                                 len(self.__strings)))
+            f.write(_SOURCE.pack(mtime, size, flags))
+            for text in self.__strings:
+                data = text.encode("utf8")
+                f.write(_UINT32.pack(len(data)))
+                f.write(data)
+            f.write(_UINT32.pack(len(self.__records)))
+            for record in self.__records:
+                f.write(_UINT32.pack(len(record)))
+                f.write(record)
+
+
+class CardSnapshotReader:
+    """
+    Reads card states from the compact binary snapshot format. The returned
+    states have the same layout as those produced by
+    Card.serialize_card_data(), so they can be deserialized the same way as
+    states loaded from JSON.
+    """
+
+    def __init__(self):
+        self.__strings = []
+        self.info = None
+
+    def read(self, path: str) -> dict:
+        """
+        Reads a snapshot file and returns a state dictionary in the same form
+        as the card data JSON file: {"cards": [card_state, ...]}
+        """
+        with open(path, "rb") as f:
+            data = f.read()
+
+        self.info = _unpack_info(data, path)
+        _, _, string_count = _HEADER.unpack_from(data, 0)
+        offset = _HEADER.size
+        if self.info.version >= 2:
+            offset += _SOURCE.size
+
+        # Read the string table
+        strings = []
+        for _ in range(string_count):
+            length, = _UINT32.unpack_from(data, offset)
+            offset += 4
+            strings.append(data[offset:offset + length].decode("utf8"))
+            offset += length
+        self.__strings = strings
+
+        # Read the card records
+        card_count, = _UINT32.unpack_from(data, offset)
+        offset += 4
+        cards = []
+        for _ in range(card_count):
+            length, = _UINT32.unpack_from(data, offset)
+            offset += 4
+            cards.append(self.__read_card(data, offset))
+            offset += length
+        return {"cards": cards}
+
+    def __read_card(self, data: bytes, offset: int) -> dict:
+        """Reads a single card record."""
+        strings = self.__strings
+        word_type, russian, english, flags = _CARD_FIELDS.unpack_from(
+            data, offset)
+        offset += _CARD_FIELDS.size
+        state = {"type": strings[word_type],
+                 "ru": strings[russian],
+                 "en": strings[english]}
+        if flags & _CARD_FLAG_HAS_CREATION_TIMESTAMP:
+            state["crtd"], = _FLOAT64.unpack_from(data, offset)
+            offset += 8
+
+        count, = _UINT16.unpack_from(data, offset)
+        offset += 2
+        if count:
+            indices = struct.unpack_from("<{}I".format(count), data, offset)
+            offset += 4 * count
+            state["attrs"] = [strings[i] for i in indices]
+
+        count, = _UINT16.unpack_from(data, offset)
+        offset += 2
+        if count:
+            indices = struct.unpack_from("<{}I".format(count), data, offset)
+            offset += 4 * count
+            state["ex"] = [[strings[i], ""] for i in indices]
+
+        count, = _UINT16.unpack_from(data, offset)
+        offset += 2
+        if count:
+            state["rel"] = []
+            for _ in range(count):
+                key_length, = _UINT8.unpack_from(data, offset)
+                offset += 1
+                indices = struct.unpack_from(
+                    "<{}I".format(key_length), data, offset)
+                offset += 4 * key_length
+                state["rel"].append([strings[i] for i in indices])
+        return state
@@ -57,7 +57,12 @@ class Config:
 
     menu_cursor_speed = 10.0  # menu items per second
 
+    # Block and only redraw when something changes while idle, rather than
+    # drawing every frame
+    render_on_change = True
+
     max_card_history_size = 100
+    study_journal_max_records = 200  # markings before the journal is compacted
 
     min_repeat_interval = 4
     proficiency_levels = 4  # 0 = new, 1 = hardest, 4 = easiest
@@ -66,6 +71,12 @@ class Config:
                                    2: 8,
                                    3: 12,
                                    4: 16}
+
+    # Spaced repetition review intervals, in seconds
+    review_relearn_interval = 10 * 60  # after a card was not known
+    review_initial_intervals = [24 * 60 * 60, 6 * 24 * 60 * 60]
+    review_min_ease = 1.3  # interval multiplier for the least proficient cards
+    review_max_ease = 2.5  # interval multiplier for the most proficient cards
     proficiency_level_score_multiplier = {0: 0.0,
                                           1: 0.0,
                                           2: 0.25,
@@ -106,12 +106,25 @@ class Entity:
             self.__size = cmg.Vec2(width, height)
 
     def set_visible(self, visible: bool):
-        self.__visible = visible
+        if visible != self.__visible:
+            self.__visible = visible
+            self.damage()
 
     def destroy(self):
         self.__destroyed = True
+        self.damage()
         self.on_destroy()
 
+    def damage(self):
+        """
+        Marks this entity as needing to be redrawn when the application
+        only renders on change.
+        """
+        if self.__context is not None:
+            rect = self.get_rect()
+            if rect.width > 0 and rect.height > 0:
+                self.__context.damage(rect)
+
     def on_create(self):
         pass
 
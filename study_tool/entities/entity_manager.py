@@ -1,5 +1,6 @@
 import cmg
 from cmg.color import Colors
+from cmg.profiler import FrameProfiler
 from study_tool.entities.entity import Entity
 
 
@@ -60,6 +61,8 @@ class EntityManager:
         Draws a single entity and all its children.
         """
         if not entity.is_destroyed() and entity.is_visible():
+            if FrameProfiler.instance is not None:
+                FrameProfiler.instance.count_draw(entity)
             entity.draw(g)
             if self.__show_entity_outlines:
                 rect = entity.get_rect()
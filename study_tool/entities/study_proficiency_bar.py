@@ -1,6 +1,7 @@
 import pygame
 import cmg
 from cmg.color import Colors
+from study_tool.card_set import StudySet
 from study_tool.config import Config
 from study_tool.entities.entity import Entity
 
@@ -25,20 +26,16 @@ class StudyProficiencyBar(Entity):
         self.recalculate()
 
     def recalculate(self):
-        cards = []
-        if isinstance(self.study_set, list):
-            cards = self.study_set
-        else:
-            cards = list(self.study_set.cards)
-        self.__total_cards = len(cards)
+        study_set = self.study_set
+        if isinstance(study_set, list):
+            study_set = StudySet(cards=study_set)
+        metrics = self.context.study_database.get_group_study_metrics(study_set)
+        self.__total_cards = metrics.get_total_count()
 
         self.__proficiency_counts = {}
         self.__score = 0
         for level in range(Config.proficiency_levels, -1, -1):
-            self.__proficiency_counts[level] = 0
-        for card in cards:
-            study_data = self.context.study_database.get_card_study_data(card)
-            self.__proficiency_counts[study_data.get_proficiency_level()] += 1
+            self.__proficiency_counts[level] = metrics.proficiency_counts[level]
         for level in range(Config.proficiency_levels, -1, -1):
             count = self.__proficiency_counts[level]
             self.__score += count * max(0, level - 1)
@@ -50,7 +47,8 @@ class StudyProficiencyBar(Entity):
         #    if count > 0:
         #        self.__score += count * max(0, level - 1)
 
-        self.__score /= max(1.0, float((Config.proficiency_levels - 1) * len(cards)))
+        self.__score /= max(1.0, float((Config.proficiency_levels - 1) *
+                                       self.__total_cards))
         self.__score = int(round(self.__score * 100))
 
     def update(self, dt):
@@ -58,12 +56,7 @@ class StudyProficiencyBar(Entity):
             
     def draw(self, g):
         """Draw the entity."""
-        cards = []
-        if isinstance(self.study_set, list):
-            cards = self.study_set
-        else:
-            cards = list(self.study_set.cards)
-        total_cards = len(cards)
+        total_cards = self.__total_cards
 
         font = self.__font_bar_text
         left_margin = g.measure_text("100%", font=font)[0] + 4
@@ -1,5 +1,7 @@
 import json
+import os
 import shutil
+import threading
 import random
 import re
 from study_tool.russian.types import *
@@ -11,7 +13,9 @@ from study_tool.russian.verb import Verb
 from study_tool.card import *
 from study_tool.card_attributes import *
 from study_tool.config import Config
+from study_tool.example_index import ExampleIndex
 from study_tool.external import ponyfiction
+from study_tool.russian.corpus import TokenizedCorpus
 from study_tool.russian.story import Story, Chapter
 
 SPLIT_WORD_REGEX = re.compile(
@@ -63,6 +67,8 @@ class ExampleDatabase:
         self.__word_database = word_database
         self.stories = []
         self.__story_dict = {}
+        self.__index = None
+        self.__index_lock = threading.Lock()
 
     def get_example_sentences(self, text, count=None):
         examples = list(self.iter_example_sentences(text))
@@ -75,12 +81,39 @@ class ExampleDatabase:
         return self.__story_dict.get(title.lower(), None)
 
     def iter_sentences(self):
-        for story in self.stories:
-            for chapter in story.chapters:
-                for paragraph in chapter.paragraphs:
-                    paragraph = paragraph.text
-                    for sentence in split_sentences(paragraph):
-                        yield sentence
+        return self.get_index().iter_sentences()
+
+    def get_index(self) -> ExampleIndex:
+        """
+        Returns the tokenized sentence index of the stories, building it if
+        stories were added since it was last built.
+        """
+        return self.build_index()
+
+    def build_index(self, cache_path=None) -> ExampleIndex:
+        """
+        Builds the tokenized corpus and word index of all stories, if not
+        already built. If a cache path is given, the corpus spans are loaded
+        from it when they match the current stories, and saved to it
+        otherwise.
+        """
+        with self.__index_lock:
+            if self.__index is not None:
+                return self.__index
+            corpus = None
+            if cache_path is not None and os.path.isfile(cache_path):
+                corpus = TokenizedCorpus.load(cache_path, self.stories)
+            if corpus is None:
+                corpus = TokenizedCorpus()
+                for story in self.stories:
+                    corpus.add_story(story)
+                if cache_path is not None:
+                    Config.logger.info("Saving example corpus to: " + cache_path)
+                    corpus.save(cache_path, self.stories)
+            for story_index, story in enumerate(self.stories):
+                story.set_corpus(corpus, story_index)
+            self.__index = ExampleIndex(corpus)
+            return self.__index
 
     def get_word_patterns(self, text: str) -> list:
         """
@@ -103,11 +136,8 @@ class ExampleDatabase:
         Finds examples matching one or more WordPattern.
         """
         if patterns:
-            for sentence in self.iter_sentences():
-                for pattern in patterns:
-                    instances = list(pattern.finditer(sentence))
-                    if instances:
-                        yield sentence, instances
+            for sentence, instances in self.get_index().iter_matches(patterns):
+                yield sentence, instances
 
     def iter_example_sentences(self, text):
         if not isinstance(text, list):
@@ -128,26 +158,24 @@ class ExampleDatabase:
         if len(text_list) == 1 and " " in text_list[0]:
             whole_word = False
 
-        for story in self.stories:
-            for chapter in story.chapters:
-                for paragraph in chapter.paragraphs:
-                    paragraph = paragraph.text
-                    for sentence in split_sentences(paragraph):
-                        instances = []
-                        found = False
-                        if whole_word:
-                            for word, start in split_words(sentence):
-                                if word.lower() in text_list:
-                                    found = True
-                                    instances.append((start, word))
-                                    break
-                        else:
-                            for text in text_list:
-                                if text in sentence.lower():
-                                    found = True
-                                    break
-                        if found:
-                            yield sentence, instances
+        corpus = self.get_index().get_corpus()
+        for sentence_index in range(corpus.get_sentence_count()):
+            instances = []
+            found = False
+            if whole_word:
+                for word, start in corpus.iter_sentence_tokens(sentence_index):
+                    if word.lower() in text_list:
+                        found = True
+                        instances.append((start, word))
+                        break
+            else:
+                sentence = corpus.get_sentence(sentence_index).lower()
+                for text in text_list:
+                    if text in sentence:
+                        found = True
+                        break
+            if found:
+                yield corpus.get_sentence(sentence_index), instances
 
     def download_ponyfiction_story(self, story_id: int):
         Config.logger.info("Downloading ponyfiction story {}".format(story_id))
@@ -155,9 +183,19 @@ class ExampleDatabase:
         if story is not None:
             Config.logger.info("Downloaded ponyfiction story '{}' with {} chapters!"
                                .format(story.title, len(story.chapters)))
-            self.stories.append(story)
+            self.add_story(story)
         return story
 
+    def add_story(self, story: Story):
+        """Adds a story to the database and indexes its sentences."""
+        with self.__index_lock:
+            self.stories.append(story)
+            self.__story_dict[story.title.text.lower()] = story
+            if self.__index is not None:
+                self.__index.add_story(story)
+                story.set_corpus(self.__index.get_corpus(),
+                                 len(self.stories) - 1)
+
     def save(self, path: str):
         data = self.serialize()
         with open(path, "w", encoding="utf8") as f:
@@ -174,10 +212,13 @@ class ExampleDatabase:
 
     def deserialize(self, state):
         self.stories = []
+        self.__story_dict = {}
+        with self.__index_lock:
+            self.__index = None
         for story_state in state["stories"]:
             story = Story()
             story.deserialize(story_state)
-            self.stories.append(story)
+            self.add_story(story)
 
     def load_story_text_file(self, path: str):
         story = Story()
@@ -217,6 +258,5 @@ class ExampleDatabase:
 
         if len(story.chapters) == 0:
             raise Exception("No chapters")
-        self.stories.append(story)
-        self.__story_dict[story.title.text.lower()] = story
+        self.add_story(story)
         return story
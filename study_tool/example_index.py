@@ -0,0 +1,119 @@
+from array import array
+from study_tool.russian.corpus import TokenizedCorpus
+from study_tool.russian.word import WordPattern
+
+
+def normalize_token(word: str) -> str:
+    """Normalizes a word token into its lowercase, ё-folded index key."""
+    return word.lower().replace("ё", "е")
+
+
+class ExampleIndex:
+    """
+    Inverted index from normalized word tokens to their locations in a
+    TokenizedCorpus of the example stories.
+
+    Each posting is a corpus token index, so multi-word WordPatterns can be
+    matched by intersecting the posting lists of their tokens instead of
+    re-tokenizing the whole corpus.
+    """
+
+    def __init__(self, corpus: TokenizedCorpus = None):
+        self.__corpus = None
+        self.__postings = {}
+        self.set_corpus(corpus if corpus is not None else TokenizedCorpus())
+
+    def get_corpus(self) -> TokenizedCorpus:
+        return self.__corpus
+
+    def set_corpus(self, corpus: TokenizedCorpus):
+        """Rebuilds the index for the given corpus."""
+        self.__corpus = corpus
+        self.__postings = {}
+        for token_index in range(corpus.get_token_count()):
+            self.__add_token(token_index)
+
+    def clear(self):
+        """Removes all sentences from the index."""
+        self.set_corpus(TokenizedCorpus())
+
+    def get_sentence_count(self) -> int:
+        """Returns the number of indexed sentences."""
+        return self.__corpus.get_sentence_count()
+
+    def iter_sentences(self):
+        """Iterates all indexed sentences in story order."""
+        return self.__corpus.iter_sentences()
+
+    def add_story(self, story):
+        """Adds a story to the corpus and indexes its word tokens."""
+        first_token = self.__corpus.get_token_count()
+        self.__corpus.add_story(story)
+        for token_index in range(first_token, self.__corpus.get_token_count()):
+            self.__add_token(token_index)
+
+    def iter_matches(self, patterns: list):
+        """
+        Finds sentences matching one or more WordPatterns.
+
+        Yields tuples of (sentence, instances) in story order, where instances
+        is the list of (start, word) tuples for the matched words, just like
+        WordPattern.finditer(). A sentence is yielded once for each pattern
+        it matches.
+        """
+        corpus = self.__corpus
+        matches = {}
+        for pattern_index, pattern in enumerate(patterns):
+            for token_index in self.find_pattern(pattern):
+                sentence_index = corpus.get_token_sentence(token_index)
+                matches.setdefault((sentence_index, pattern_index), []).append(
+                    token_index)
+
+        token_counts = [len(list(pattern)) for pattern in patterns]
+        for sentence_index, pattern_index in sorted(matches):
+            instances = []
+            for token_index in sorted(matches[(sentence_index, pattern_index)]):
+                for offset in range(token_counts[pattern_index]):
+                    word, start = corpus.get_token(token_index + offset)
+                    instances.append((start, word))
+            yield corpus.get_sentence(sentence_index), instances
+
+    def find_pattern(self, pattern: WordPattern) -> set:
+        """
+        Returns the set of corpus token indices where a pattern's first token
+        begins a full match within a single sentence.
+        """
+        corpus = self.__corpus
+        locations = None
+        for offset, token in enumerate(pattern):
+            token_locations = set()
+            for key in self.__get_token_keys(token):
+                for token_index in self.__postings[key]:
+                    first = token_index - offset
+                    if (first >= 0 and corpus.get_token_sentence(first) ==
+                            corpus.get_token_sentence(token_index)):
+                        token_locations.add(first)
+            if locations is None:
+                locations = token_locations
+            else:
+                locations &= token_locations
+            if not locations:
+                return set()
+        return locations if locations is not None else set()
+
+    def __add_token(self, token_index: int):
+        key = normalize_token(self.__corpus.get_token_text(token_index))
+        postings = self.__postings.get(key, None)
+        if postings is None:
+            self.__postings[key] = array("I", [token_index])
+        else:
+            postings.append(token_index)
+
+    def __get_token_keys(self, token) -> list:
+        """Returns the index keys which a pattern token matches."""
+        forms = token.get_forms()
+        if forms is not None:
+            return [key for key in set(forms) if key in self.__postings]
+        # Non-literal regex tokens are matched against the vocabulary,
+        # which is still much smaller than the corpus
+        return [key for key in self.__postings if token.match(key)]
@@ -14,17 +14,29 @@ from study_tool.russian.types import Tense
 from study_tool.russian.types import Participle
 from study_tool.russian.types import WordType
 from study_tool.russian.word import AccentedText
+from study_tool.russian.word import get_lowercase_text
 from study_tool.russian.word import Word
 from study_tool.russian.word import WordSourceEnum
 from study_tool.russian.noun import Noun
 from study_tool.russian.verb import Verb
 from study_tool.russian.adjective import Adjective
 from study_tool.config import Config
+from study_tool.external.http_cache import HttpCache
+from study_tool.external.http_cache import http_cache
+from study_tool.external.html_index import HtmlIndex
 
 class Cooljugator404Exception(Exception):
     pass
 
 
+class CooljugatorOfflineError(requests.ConnectionError):
+    """
+    Raised when not downloading because the connection to Cooljugator
+    failed, so the words can be retried once back online.
+    """
+    pass
+
+
 class Cooljugator:
 
     # Characters in examples that are wrong
@@ -34,6 +46,13 @@ class Cooljugator:
     URL_BASE_NOUN = "https://cooljugator.com/run/"
     URL_BASE_ADJECTIVE = "https://cooljugator.com/rua/"
 
+    # Download settings
+    max_connections = 8
+    max_retries = 3
+    retry_delay = 1.0  # seconds before the first retry, doubled per retry
+    request_timeout = 30.0
+    offline_delay = 60.0  # seconds to stop downloading after connections fail
+
     # WordType to class
     __WORD_TYPE_TYPES = {
         WordType.Verb: Verb,
@@ -41,23 +60,31 @@ class Cooljugator:
         WordType.Adjective: Adjective,
     }
 
-    def __init__(self):
+    def __init__(self, http_cache: HttpCache = http_cache):
+        self.__http_cache = http_cache
+        self.__offline_until = 0.0
         self.__404_words = set()
         self.__error_words = set()
+        self.__modified = False
         self.__lock = threading.Lock()
-        self.BeautifulSoup = None
 
-    def setup_imports(self):
-        """Import the required python modules."""
-        with self.__lock:
-            from bs4 import BeautifulSoup
-            self.BeautifulSoup = BeautifulSoup
+        # Keep-alive session shared by all download threads
+        self.__session = requests.Session()
+        adapter = requests.adapters.HTTPAdapter(
+            pool_connections=1, pool_maxsize=self.max_connections)
+        self.__session.mount("https://", adapter)
+        self.__session.mount("http://", adapter)
+
+    @staticmethod
+    def get_word_key(word_type: WordType, name) -> tuple:
+        """Returns the (word_type, name) key used to identify a download."""
+        return (word_type, get_lowercase_text(name))
 
     def download_word_info(self, word_type: WordType, name) -> Word:
         """
         Downloads info for a Word. Returns None on error.
         """
-        key = (word_type, AccentedText(name).text.lower())
+        key = self.get_word_key(word_type, name)
         with self.__lock:
             if key in self.__404_words:
                 return None
@@ -78,11 +105,15 @@ class Cooljugator:
                     raise Exception(word_type)
             except Cooljugator404Exception:
                 pass
+            except CooljugatorOfflineError:
+                Config.logger.warning("Offline, not downloading {} data for: {}"
+                                      .format(key[0].name, key[1]))
             except Exception:
                 Config.logger.error("Error downloading {} data for: {}"
                                 .format(key[0].name, key[1]))
                 with self.__lock:
                     self.__error_words.add(key)
+                    self.__modified = True
                     traceback.print_exc()
         if result:
             result.set_complete(True)
@@ -90,6 +121,7 @@ class Cooljugator:
             with self.__lock:
                 if key in self.__error_words:
                     self.__error_words.remove(key)
+                    self.__modified = True
         return result
 
     def download_noun_info(self, dictionary_form) -> Noun:
@@ -99,8 +131,7 @@ class Cooljugator:
         dictionary_form = AccentedText(dictionary_form)
         key = (WordType.Noun, dictionary_form.text.lower())
         url = self.URL_BASE_NOUN + key[1]
-        soup = self.__request_html(url, key=key)
-        root = soup.body
+        root = self.__request_html(url, key=key)
 
         noun = Noun()
         noun.name = dictionary_form
@@ -150,8 +181,7 @@ class Cooljugator:
         dictionary_form = AccentedText(dictionary_form)
         key = (WordType.Adjective, dictionary_form.text.lower())
         url = self.URL_BASE_ADJECTIVE+ key[1]
-        soup = self.__request_html(url, key=key)
-        root = soup.body
+        root = self.__request_html(url, key=key)
 
         adj = Adjective()
         adj.name = dictionary_form
@@ -178,17 +208,17 @@ class Cooljugator:
         infinitive = AccentedText(infinitive)
         key = (WordType.Verb, infinitive.text.lower())
         url = self.URL_BASE_VERB + key[1]
-        soup = self.__request_html(url, key=key)
-
-        root = soup.body.find("div", attrs={"id": "conjugation-data"})
-        top = root.find_all("div")[2]
+        root = self.__request_html(url, key=key)
+        if root.get_element_by_id("conjugation-data") is None:
+            raise Exception("Cannot find conjugation data: " + url)
 
         verb = Verb()
         verb.infinitive = infinitive
         verb.name = infinitive
 
         # Get the verb aspect
-        non_past_tense = root.find("div", attrs={"class": "conjugation-cell conjugation-cell-four tense-title"}).text.lower()
+        non_past_tense = self.__find_in_conjugation_data(
+            root.get_elements_by_class("conjugation-cell conjugation-cell-four tense-title")).text.lower()
         if "future" in non_past_tense:
             verb.aspect = Aspect.Perfective
             tense = "future"
@@ -199,13 +229,14 @@ class Cooljugator:
             raise Execption(non_past_tense)
 
         # Parse the translation from the title
-        title = root.find_all("h1")[0].text
+        title = self.__find_in_conjugation_data(
+            root.get_elements_by_tag("h1")).text
         regex = re.compile(r".*?\[.*?\]\s+\((?P<translation>.*?)\).*")
         match = regex.search(title)
         verb.translation = AccentedText(match.group("translation"))
 
         # Parse the other meanings and aspect counterparts
-        info = top.find("div", attrs={"id": "usage-info"}).text
+        info = root.get_element_by_id("usage-info").text
         regex = re.compile(r"\s*(?P<info>.*?)\s*This verb.s .* counterparts?:\s*(?P<counterparts>.*)\.?\s*")
         match = regex.search(info)
         other_meanings = match.group("info")
@@ -249,6 +280,16 @@ class Cooljugator:
 
         return verb
             
+    def is_modified(self) -> bool:
+        """
+        Returns True if the lists of words with download errors changed
+        since the data was last deserialized or marked as saved.
+        """
+        return self.__modified
+
+    def set_modified(self, modified: bool):
+        self.__modified = modified
+
     def serialize(self) -> dict:
         """Serialize cooljugator data."""
         # Serialize list of words with download errors
@@ -286,8 +327,16 @@ class Cooljugator:
                     for name in word_list:
                         key = (word_type, name)
                         self.__error_words.add(key)
+            self.__modified = False
                
-    def __get_conjugation(self, root, name, required=False):
+    def __find_in_conjugation_data(self, elements: list):
+        """Returns the first element inside the conjugation data."""
+        for element in elements:
+            if element.is_inside("conjugation-data"):
+                return element
+        raise Exception("Cannot find element in conjugation data")
+
+    def __get_conjugation(self, root: HtmlIndex, name, required=False):
         """
         Returns the conjugation text with the given element ID in
         the html document.
@@ -296,7 +345,7 @@ class Cooljugator:
             name = [name]
             name.append(name[0] + "_no_accent")
         for n in name:
-            element = root.find("div", attrs={"id": n})
+            element = root.get_element_by_id(n, tag="div")
             if element is not None:
                 break
         if element is None:
@@ -309,58 +358,139 @@ class Cooljugator:
             raise Exception(element.attrs)
         return AccentedText("")
 
-    def __request_html(self, url: str, key: tuple):
+    def fetch_html(self, url: str) -> str:
         """
-        Downloads an html page.
+        Downloads the text of a page using the shared session, or loads it
+        from the HTTP cache. Connection errors, timeouts and server errors
+        are retried with exponential backoff. If connecting still fails,
+        only cached pages are returned for the next offline_delay seconds,
+        and CooljugatorOfflineError is raised for the others.
         """
-        self.setup_imports()
-        response = requests.get(url)
-        soup = self.BeautifulSoup(response.text, features="lxml")
+        if time.time() < self.__offline_until:
+            entry = self.__http_cache.get_entry(url)
+            if entry is not None:
+                return entry.text
+            raise CooljugatorOfflineError("Offline, not downloading: " + url)
+        delay = self.retry_delay
+        for attempt in range(self.max_retries + 1):
+            try:
+                entry = self.__http_cache.fetch(
+                    url, session=self.__session, timeout=self.request_timeout)
+                if entry.status_code < 500 and entry.status_code != 429:
+                    return entry.text
+                error = requests.HTTPError(
+                    "{} error for url: {}".format(entry.status_code, url))
+            except (requests.ConnectionError, requests.Timeout) as e:
+                error = e
+            if attempt < self.max_retries:
+                Config.logger.warning("Retrying download in {:.1f}s: {}"
+                                      .format(delay, error))
+                time.sleep(delay)
+                delay *= 2
+        if isinstance(error, requests.ConnectionError):
+            self.__offline_until = time.time() + self.offline_delay
+            raise CooljugatorOfflineError(str(error)) from error
+        raise error
+
+    def __request_html(self, url: str, key: tuple) -> HtmlIndex:
+        """
+        Downloads an html page, and indexes its elements by id.
+        """
+        root = HtmlIndex(self.fetch_html(url))
         # Check if this is a 404 error
-        for h1 in soup.body.find_all("h1"):
+        for h1 in root.get_elements_by_tag("h1"):
             if "page not found" in h1.text.lower():
                 with self.__lock:
                     self.__404_words.add(key)
+                    self.__modified = True
                 Config.logger.warning("404 Page not found: " + url)
                 raise Cooljugator404Exception("404 Page not found: " + url)
-        return soup
+        return root
 
 
 class CooljugatorThread:
-    def __init__(self, cooljugator: Cooljugator):
+    """
+    Downloads word info from Cooljugator on a bounded pool of worker
+    threads. Requests for a word that is already queued or downloading
+    share the one download, and each callback is run on the main thread.
+    """
+
+    def __init__(self, cooljugator: Cooljugator, workers=4):
         self.__cooljugator = cooljugator
         self.__queue = queue.Queue()
-        self.__thread = threading.Thread(target=self.__run)
+        self.__lock = threading.Lock()
+        self.__pending = {}  # word key -> list of callbacks
+        self.__active = {}  # worker thread -> (word_type, name)
+        self.__threads = [threading.Thread(target=self.__run, daemon=True)
+                          for _ in range(workers)]
         self.__running = True
-        self.__status = None
 
     def start(self):
-        self.__thread.start()
+        self.__running = True
+        for thread in self.__threads:
+            thread.start()
 
     def stop(self):
+        """
+        Stops the workers after their current downloads. The callbacks of
+        words still queued are run with None, as if their download failed.
+        """
         self.__running = False
-        self.__thread.join()
+        for _ in self.__threads:
+            self.__queue.put(None)
+        for thread in self.__threads:
+            if thread.is_alive():
+                thread.join()
+        with self.__lock:
+            pending = self.__pending
+            self.__pending = {}
+        for callbacks in pending.values():
+            for callback in callbacks:
+                callback(None)
 
     def get_status(self) -> tuple:
-        return self.__status
+        """Returns the (word_type, name) of a word being downloaded."""
+        with self.__lock:
+            for status in self.__active.values():
+                return status
+        return None
+
+    def get_pending_count(self) -> int:
+        """Returns the number of words queued or being downloaded."""
+        with self.__lock:
+            return len(self.__pending)
 
     def download_word_info(self, word_type: WordType, name, callback) -> Word:
-        self.__queue.put((word_type, name, callback))
+        key = Cooljugator.get_word_key(word_type, name)
+        with self.__lock:
+            if key in self.__pending:
+                if callback:
+                    self.__pending[key].append(callback)
+                return
+            self.__pending[key] = [callback] if callback else []
+        self.__queue.put((key, word_type, name))
 
     def __run(self):
-        self.__running = True
-        while self.__running:
+        thread = threading.current_thread()
+        while True:
+            item = self.__queue.get()
+            if item is None or not self.__running:
+                break
+            key, word_type, name = item
+            with self.__lock:
+                self.__active[thread] = (word_type, name)
+            result = None
             try:
-                while self.__running:
-                    word_type, name, callback = self.__queue.get_nowait()
-                    self.__status = (word_type, name)
-                    result = self.__cooljugator.download_word_info(
-                        word_type=word_type, name=name)
-                    self.__status = None
-                    if callback:
-                        event = Event(object)
-                        event.connect(callback)
-                        event.emit(result)
-            except queue.Empty:
-                pass
-            time.sleep(0.1)
+                result = self.__cooljugator.download_word_info(
+                    word_type=word_type, name=name)
+            except Exception:
+                traceback.print_exc()
+            finally:
+                with self.__lock:
+                    del self.__active[thread]
+                    callbacks = self.__pending.pop(key)
+            if callbacks:
+                event = Event(object)
+                for callback in callbacks:
+                    event.connect(callback)
+                event.emit(result)
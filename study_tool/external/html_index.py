@@ -0,0 +1,133 @@
+from html.parser import HTMLParser
+
+
+class HtmlElement:
+    """An element found by HtmlIndex, with its attributes and text."""
+
+    def __init__(self, tag: str, attrs: dict, ancestor_ids: tuple):
+        self.tag = tag
+        self.attrs = attrs
+        self.ancestor_ids = ancestor_ids
+        self.__text = []
+
+    @property
+    def text(self) -> str:
+        return "".join(self.__text)
+
+    def get(self, name: str, default=None) -> str:
+        return self.attrs.get(name, default)
+
+    def is_inside(self, element_id: str) -> bool:
+        """Returns True if this element is inside the element with an id."""
+        return element_id in self.ancestor_ids
+
+    def _add_text(self, text: str):
+        self.__text.append(text)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.attrs
+
+    def __getitem__(self, name: str) -> str:
+        return self.attrs[name]
+
+    def __repr__(self):
+        return "<{} {!r}>".format(self.tag, self.attrs)
+
+
+class HtmlIndex(HTMLParser):
+    """
+    Parses an html document in a single pass, indexing its elements by
+    id, by class and by tag name so they can be looked up in constant
+    time without building or searching a document tree.
+
+    Only elements with an id or a class and elements with a tag in
+    text_tags are indexed, and only indexed elements collect their text.
+    """
+
+    VOID_TAGS = frozenset([
+        "area", "base", "br", "col", "embed", "hr", "img", "input", "link",
+        "meta", "param", "source", "track", "wbr"])
+
+    def __init__(self, html: str, text_tags=("h1",)):
+        super().__init__(convert_charrefs=True)
+        self.__text_tags = frozenset(text_tags)
+        self.__by_id = {}
+        self.__by_class = {}
+        self.__by_tag = {}
+        self.__stack = []  # (tag, element) for each open element
+        self.__open_elements = []  # open elements which collect text
+        self.__open_ids = []
+        self.feed(html)
+        self.close()
+
+    def get_element_by_id(self, element_id: str, tag=None) -> HtmlElement:
+        """
+        Returns the first element with an id, optionally only considering
+        elements with a tag name, or None if there is none. Ids are not
+        always unique, so every element with an id is indexed.
+        """
+        for element in self.__by_id.get(element_id, ()):
+            if tag is None or element.tag == tag:
+                return element
+        return None
+
+    def get_elements_by_class(self, class_name: str) -> list:
+        """
+        Returns the elements with a class, in document order. The name can
+        also be the element's full class attribute.
+        """
+        return self.__by_class.get(class_name, [])
+
+    def get_elements_by_tag(self, tag: str) -> list:
+        """Returns the indexed elements with a tag name, in document order."""
+        return self.__by_tag.get(tag, [])
+
+    def handle_starttag(self, tag, attrs):
+        element = self.__add_element(tag, attrs)
+        if tag not in self.VOID_TAGS:
+            self.__stack.append((tag, element))
+            if element is not None:
+                self.__open_elements.append(element)
+                if "id" in element.attrs:
+                    self.__open_ids.append(element.attrs["id"])
+
+    def handle_startendtag(self, tag, attrs):
+        self.__add_element(tag, attrs)
+
+    def handle_endtag(self, tag):
+        # Close any elements left unclosed inside this one
+        for index in range(len(self.__stack) - 1, -1, -1):
+            if self.__stack[index][0] == tag:
+                break
+        else:
+            return
+        while len(self.__stack) > index:
+            _, element = self.__stack.pop()
+            if element is not None:
+                self.__open_elements.pop()
+                if "id" in element.attrs:
+                    self.__open_ids.pop()
+
+    def handle_data(self, data):
+        for element in self.__open_elements:
+            element._add_text(data)
+
+    def __add_element(self, tag, attrs) -> HtmlElement:
+        attrs = {name: value if value is not None else ""
+                 for name, value in attrs}
+        element_id = attrs.get("id", None)
+        class_attr = attrs.get("class", None)
+        if (element_id is None and class_attr is None and
+                tag not in self.__text_tags):
+            return None
+        element = HtmlElement(tag, attrs, tuple(self.__open_ids))
+        if element_id is not None:
+            self.__by_id.setdefault(element_id, []).append(element)
+        if class_attr is not None:
+            class_names = class_attr.split()
+            if len(class_names) > 1:
+                self.__by_class.setdefault(class_attr, []).append(element)
+            for class_name in class_names:
+                self.__by_class.setdefault(class_name, []).append(element)
+        self.__by_tag.setdefault(tag, []).append(element)
+        return element
@@ -0,0 +1,153 @@
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+import requests
+from pathlib import Path
+
+
+class HttpCacheEntry:
+    """A downloaded page and the headers needed to revalidate it."""
+
+    def __init__(self, url: str, text: str, status_code=200, etag=None,
+                 last_modified=None, fetch_time=None, from_cache=False):
+        self.url = url
+        self.text = text
+        self.status_code = status_code
+        self.etag = etag
+        self.last_modified = last_modified
+        self.fetch_time = time.time() if fetch_time is None else fetch_time
+        self.from_cache = from_cache
+
+    def get_age(self) -> float:
+        """Returns the number of seconds since the page was fetched."""
+        return time.time() - self.fetch_time
+
+    def get_validation_headers(self) -> dict:
+        """Returns the headers for a conditional request for the page."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+    def serialize(self) -> dict:
+        return {"url": self.url,
+                "status_code": self.status_code,
+                "etag": self.etag,
+                "last_modified": self.last_modified,
+                "fetch_time": self.fetch_time,
+                "text": self.text}
+
+    @classmethod
+    def deserialize(cls, data: dict):
+        return cls(url=data["url"],
+                   text=data["text"],
+                   status_code=data["status_code"],
+                   etag=data["etag"],
+                   last_modified=data["last_modified"],
+                   fetch_time=data["fetch_time"],
+                   from_cache=True)
+
+
+class HttpCache:
+    """
+    On-disk cache of downloaded web pages, so pages can be parsed again
+    without any network round trips.
+
+    Each page is stored as gzip-compressed JSON in a file named after the
+    SHA-1 hash of its URL. Cached pages are used until they are older than
+    max_age seconds (never, if None), after which they are revalidated
+    with their ETag and Last-Modified headers. A cached page is also used
+    when the network is unavailable.
+    """
+
+    def __init__(self, path="data/http_cache", max_age=None):
+        self.__path = Path(path)
+        self.__max_age = max_age
+
+    def get_path(self) -> Path:
+        return self.__path
+
+    def get_entry_path(self, url: str) -> Path:
+        digest = hashlib.sha1(url.encode("utf8")).hexdigest()
+        return self.__path / digest[:2] / (digest + ".json.gz")
+
+    def get_entry(self, url: str) -> HttpCacheEntry:
+        """Returns the cached page for a URL, or None if not cached."""
+        path = self.get_entry_path(url)
+        try:
+            with gzip.open(path, "rt", encoding="utf8") as file:
+                data = json.load(file)
+        except (OSError, ValueError):
+            return None
+        if data.get("url") != url:
+            return None
+        return HttpCacheEntry.deserialize(data)
+
+    def put(self, entry: HttpCacheEntry):
+        """
+        Writes a page to the cache. The file is replaced atomically, so
+        other threads never read a partially written page.
+        """
+        path = self.get_entry_path(entry.url)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temp_path = path.with_name("{}.{}.tmp".format(
+            path.name, threading.get_ident()))
+        with gzip.open(temp_path, "wt", encoding="utf8") as file:
+            json.dump(entry.serialize(), file, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+    def remove(self, url: str):
+        """Removes the cached page for a URL."""
+        path = self.get_entry_path(url)
+        if path.is_file():
+            path.unlink()
+
+    def fetch(self, url: str, session=None, refresh=False,
+              **kwargs) -> HttpCacheEntry:
+        """
+        Returns the page for a URL, downloading it if it is not cached, or
+        if it is stale or refresh is True. Responses with server errors
+        are returned but not cached. Extra keyword arguments are passed to
+        the get request.
+        """
+        entry = self.get_entry(url)
+        if entry is not None and not refresh and (
+                self.__max_age is None or entry.get_age() < self.__max_age):
+            return entry
+
+        headers = dict(kwargs.pop("headers", {}))
+        if entry is not None:
+            headers.update(entry.get_validation_headers())
+        try:
+            response = (session or requests).get(
+                url, headers=headers, **kwargs)
+        except requests.RequestException:
+            if entry is not None:
+                return entry
+            raise
+
+        # The cached page is still valid
+        if response.status_code == 304 and entry is not None:
+            entry.fetch_time = time.time()
+            self.put(entry)
+            return entry
+
+        new_entry = HttpCacheEntry(
+            url=url,
+            text=response.text,
+            status_code=response.status_code,
+            etag=response.headers.get("ETag", None),
+            last_modified=response.headers.get("Last-Modified", None))
+        if response.status_code < 500 and response.status_code != 429:
+            self.put(new_entry)
+        elif entry is not None:
+            return entry
+        return new_entry
+
+
+http_cache = HttpCache()
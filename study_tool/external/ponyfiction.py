@@ -1,14 +1,14 @@
-import requests
 import traceback
 import re
 from bs4 import BeautifulSoup
 from study_tool.config import Config
+from study_tool.external.http_cache import http_cache
 from study_tool.russian.story import Story, Chapter
 
 
 def request_html(url):
-  response = requests.get(url)
-  soup = BeautifulSoup(response.text, features="lxml")
+  entry = http_cache.fetch(url)
+  soup = BeautifulSoup(entry.text, features="lxml")
   return soup
 
 
@@ -6,7 +6,7 @@ import time
 from cmg.utilities import ReadWriteLock
 from pathlib import Path
 from study_tool.config import Config
-from study_tool.russian.word import AccentedText
+from study_tool.russian.word import get_lowercase_text
 from study_tool.external.wiktionary_term import WiktionaryTerm
 from study_tool.external.wiktionary_parser import WiktionaryParser
 
@@ -190,7 +190,7 @@ class Wiktionary:
     def __get_term_key(self, text: str):
         if isinstance(text, WiktionaryTerm):
             return text.text.text.lower().strip()
-        return AccentedText(text).text.lower().strip()
+        return get_lowercase_text(text).strip()
 
 
 if __name__ == "__main__":
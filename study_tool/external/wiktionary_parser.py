@@ -1,9 +1,10 @@
-import requests
 import threading
 import traceback
 import re
 import yaml
 from study_tool.config import Config
+from study_tool.external.http_cache import HttpCache
+from study_tool.external.http_cache import http_cache
 from study_tool.russian.word import AccentedText, has_russian_letters
 from study_tool.russian.verb import VerbConjugation
 from study_tool.russian.noun import NounDeclension
@@ -87,7 +88,8 @@ class WiktionaryParser:
     BeautifulSoup = None
     NavigableString = None
 
-    def __init__(self):
+    def __init__(self, http_cache: HttpCache = http_cache):
+        self.__http_cache = http_cache
         self.__lock = threading.Lock()
 
     def setup_imports(self):
@@ -475,8 +477,8 @@ class WiktionaryParser:
         return verb
     
     def __download_page(self, url: str):
-        """Downloads an html page."""
+        """Downloads an html page, or loads it from the HTTP cache."""
         self.setup_imports()
-        response = requests.get(url)
-        soup = self.BeautifulSoup(response.text, features="lxml")
+        entry = self.__http_cache.fetch(url)
+        soup = self.BeautifulSoup(entry.text, features="lxml")
         return soup
@@ -4,6 +4,7 @@ import pygame
 import random
 import re
 import time
+import weakref
 from cmg import widgets
 from cmg import color
 from cmg import math
@@ -11,6 +12,7 @@ from cmg.input import Keys
 from cmg.input import *
 from cmg.graphics import *
 from cmg.application import *
+from cmg.utilities import AutocompleteSource
 from study_tool import card
 from study_tool import card_attributes
 from study_tool.config import Config
@@ -23,6 +25,58 @@ from study_tool.gui.card_search_widget import CardSearchWidget
 from study_tool.card_database import CardDatabase
 
 
+class CardRussianAutocompleteSource(AutocompleteSource):
+    """
+    Autocomplete source of the Russian text of every card in a card
+    database, kept in sync through the database's card events.
+    """
+
+    def __init__(self, card_database: CardDatabase):
+        super().__init__()
+        self.__card_to_text_dict = {}
+        for card in card_database.iter_cards():
+            self.__card_to_text_dict[card] = card.get_russian().text
+        self.set_items(self.__card_to_text_dict.values())
+        card_database.card_created.connect(self.__on_card_changed)
+        card_database.card_key_changed.connect(self.__on_card_changed)
+        card_database.card_data_changed.connect(self.__on_card_changed)
+        card_database.card_deleted.connect(self.__on_card_deleted)
+
+    def __on_card_changed(self, card: Card):
+        text = card.get_russian().text
+        old_text = self.__card_to_text_dict.get(card)
+        if text != old_text:
+            if old_text is not None:
+                self.remove_item(old_text)
+            self.__card_to_text_dict[card] = text
+            self.add_item(text)
+
+    def __on_card_deleted(self, card: Card):
+        old_text = self.__card_to_text_dict.pop(card, None)
+        if old_text is not None:
+            self.remove_item(old_text)
+
+
+# Autocomplete sources shared by all card editors
+WORD_TYPE_AUTOCOMPLETE_SOURCE = AutocompleteSource(x.name for x in WordType)
+CARD_ATTRIBUTE_AUTOCOMPLETE_SOURCE = AutocompleteSource(
+    x.value for x in CardAttributes)
+_card_russian_autocomplete_sources = weakref.WeakKeyDictionary()
+
+
+def get_card_russian_autocomplete_source(
+        card_database: CardDatabase) -> CardRussianAutocompleteSource:
+    """
+    Returns the autocomplete source of card Russian text for a card
+    database, creating it the first time.
+    """
+    source = _card_russian_autocomplete_sources.get(card_database)
+    if source is None:
+        source = CardRussianAutocompleteSource(card_database)
+        _card_russian_autocomplete_sources[card_database] = source
+    return source
+
+
 class WordInfoWidget(widgets.GroupBox):
     def __init__(self):
         super().__init__("Word Info")
@@ -121,10 +175,12 @@ class CardEditWidget(widgets.Widget):
         self.__card_search_widget = CardSearchWidget(
             visible_func=lambda card: card is not self.__card)
 
-        self.__box_card_type.set_autocomplete_source([x.name for x in WordType])
-        self.__box_add_attribute.set_autocomplete_source([x.value for x in CardAttributes])
+        self.__box_card_type.set_autocomplete_source(
+            WORD_TYPE_AUTOCOMPLETE_SOURCE)
+        self.__box_add_attribute.set_autocomplete_source(
+            CARD_ATTRIBUTE_AUTOCOMPLETE_SOURCE)
         self.__box_add_related_word.set_autocomplete_source(
-            [x.get_russian().text for x in self.__card_database.iter_cards()])
+            get_card_russian_autocomplete_source(self.__card_database))
 
         # Create layouts
         layout_identification = widgets.GridLayout()
@@ -233,10 +289,7 @@ class CardEditWidget(widgets.Widget):
         for related_card in self.__card.get_related_cards():
             self.add_related_card(related_card)
 
-        card_sets = []
-        for card_set in self.__application.iter_card_sets():
-            if card_set.has_card(self.__card):
-                card_sets.append(card_set)
+        card_sets = self.__card_database.get_card_sets_for_card(self.__card)
         self.__layout_card_sets.clear()
         for card_set in card_sets:
             self.__layout_card_sets.add(widgets.Label(card_set.get_name().text))
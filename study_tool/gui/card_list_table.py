@@ -8,23 +8,31 @@ from study_tool.config import Config
 
 class CardRow(widgets.Widget):
 
-    def __init__(self, card: Card, select_text="Select", enabled=True):
+    def __init__(self, card: Card = None, select_text="Select", enabled=True):
         super().__init__()
-        self.card = card
+        self.card = None
 
-        self.edit_russian = widgets.TextEdit(repr(card.get_russian()))
-        self.edit_english = widgets.TextEdit(repr(card.get_english()))
+        self.edit_russian = widgets.TextEdit()
+        self.edit_english = widgets.TextEdit()
         self.button_select = widgets.Button(select_text)
         self.button_clicked = self.button_select.clicked
 
-        self.button_select.set_enabled(enabled)
-        
         layout = widgets.HBoxLayout()
         layout.add_widget(self.edit_russian, stretch=1)
         layout.add_widget(self.edit_english, stretch=1)
         layout.add_widget(self.button_select, stretch=0)
         self.set_layout(layout)
 
+        if card is not None:
+            self.set_card(card, enabled=enabled)
+
+    def set_card(self, card: Card, enabled=True):
+        """Sets the card to display."""
+        self.card = card
+        self.edit_russian.set_text(repr(card.get_russian()))
+        self.edit_english.set_text(repr(card.get_english()))
+        self.button_select.set_enabled(enabled)
+
     def set_color(self, color: Color):
         self.edit_russian.set_background_color(color)
         self.edit_english.set_background_color(color)
@@ -33,36 +41,57 @@ class CardRow(widgets.Widget):
 class CardListTable(widgets.Widget):
     """
     List of cards, each with a button.
+
+    Only the cards scrolled into view have a CardRow, which is re-used for
+    other cards as the list scrolls.
     """
     def __init__(self, select_text: str):
         super().__init__()
         self.__select_text = select_text
-        self.__card_to_row_dict = {}
-        self.__layout_card_list = widgets.VBoxLayout()
+        self.__cards = []
+        self.__card_enabled_dict = {}
+        self.__layout_card_list = widgets.VirtualListLayout(
+            create_row=self.__create_row, bind_row=self.__bind_row)
         self.set_layout(self.__layout_card_list)
         self.card_button_clicked = Event(Card)
 
     def get_row(self, card: Card) -> CardRow:
-        return self.__card_to_row_dict.get(card, None)
+        """Returns the row displaying a card, or None if it is not in view."""
+        for row in self.__layout_card_list.get_children():
+            if row.card is card:
+                return row
+        return None
 
     def get_cards(self) -> list:
-        return list(self.__card_to_row_dict.keys())
+        return list(self.__cards)
 
     def clear(self):
-        self.__layout_card_list.clear()
-        self.__card_to_row_dict = {}
-
-    def add(self, card: Card, enabled=True) -> CardRow:
-        if card in self.__card_to_row_dict:
-            return self.__card_to_row_dict[card]
-        row = CardRow(card, select_text=self.__select_text, enabled=enabled)
-        row.button_clicked.connect(lambda: self.card_button_clicked.emit(card))
-        self.__layout_card_list.add(row)
-        self.__card_to_row_dict[card] = row
-        return row
+        self.__cards = []
+        self.__card_enabled_dict = {}
+        self.__layout_card_list.set_row_count(0)
+
+    def add(self, card: Card, enabled=True):
+        """
+        Adds a card to the list. Its row is only created once it is scrolled
+        into view, so use get_row() to find it.
+        """
+        if card not in self.__card_enabled_dict:
+            self.__cards.append(card)
+            self.__card_enabled_dict[card] = enabled
+            self.__layout_card_list.set_row_count(len(self.__cards))
 
     def remove(self, card: Card):
-        row = self.__card_to_row_dict[card]
-        self.__layout_card_list.remove(row)
-        del self.__card_to_row_dict[card]
+        del self.__card_enabled_dict[card]
+        self.__cards.remove(card)
+        self.__layout_card_list.set_row_count(len(self.__cards))
+        self.__layout_card_list.refresh_rows()
+
+    def __create_row(self) -> CardRow:
+        row = CardRow(select_text=self.__select_text)
+        row.button_clicked.connect(
+            lambda: self.card_button_clicked.emit(row.card))
+        return row
 
+    def __bind_row(self, row: CardRow, index: int):
+        card = self.__cards[index]
+        row.set_card(card, enabled=self.__card_enabled_dict[card])
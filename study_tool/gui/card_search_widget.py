@@ -99,15 +99,9 @@ class CardSearchWidget(widgets.Widget):
         result_count = 0
         
         if text.strip():
-            matching_cards = []
-            for index, card in enumerate(Config.app.card_database.iter_cards()):
-                match_score = self.__matches(card, text)
-                if match_score is not None:
-                    matching_cards.append((card, match_score))
-
-            matching_cards.sort(key=lambda x: x[1], reverse=True)
-            result_count = len(matching_cards)
-            for index, (card, _) in enumerate(matching_cards[:20]):
+            matching_cards, result_count = Config.app.card_database.search_cards(
+                text, count=20, filter_func=self.__visible_func)
+            for index, card in enumerate(matching_cards):
                 enabled = not card.is_in_fixed_card_set()
                 if self.__enabled_func and enabled and not self.__enabled_func(card):
                     enabled = False
@@ -118,17 +112,3 @@ class CardSearchWidget(widgets.Widget):
                     card, enabled=enabled, color=color)
 
         self.__label_result_count.set_text("{} results".format(result_count))
-
-    def __matches(self, card: Card, text: str):
-        """Check if a card matches the given text."""
-        if self.__visible_func and not self.__visible_func(card):
-            return None
-        text = text.lower().replace("ё", "е")
-        russian = card.get_russian().text.lower().replace("ё", "е")
-        english = card.get_english().text.lower()
-        if text in russian:
-            return -(len(russian) - len(text))
-        if text in english:
-            return -(len(english) - len(text))
-        return None
-    
\ No newline at end of file
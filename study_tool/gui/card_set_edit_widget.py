@@ -12,6 +12,7 @@ from cmg.input import *
 from cmg.graphics import *
 from cmg.application import *
 from cmg.event import Event
+from cmg.utilities import AutocompleteSource
 from study_tool import card_attributes
 from study_tool.russian.types import WordType, get_word_type_short_name, parse_short_word_type
 from study_tool.russian.types import Aspect
@@ -40,6 +41,11 @@ from study_tool import card
 from study_tool.config import Config
 
 
+# Word type names to complete, shared by all card rows
+WORD_TYPE_AUTOCOMPLETE_SOURCE = AutocompleteSource(
+    get_word_type_short_name(word_type) for word_type in WordType)
+
+
 class CardRussianTextEdit(widgets.TextEdit):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -100,80 +106,38 @@ class CardRussianTextEdit(widgets.TextEdit):
             x -= spacing
 
 
-class CardRow(widgets.Widget):
+class CardRowState:
+    """
+    Edited state of one card in a CardSetEditWidget.
+
+    The state is kept apart from the CardRow widgets so that only the rows
+    scrolled into view need widgets. Display state such as colors and card
+    attributes is computed when a widget needs it.
+    """
 
     def __init__(self, card, card_set, card_database):
-        super().__init__()
         self.card = card
         self.card_database = card_database
-        self.modified = Event()
-        self.russian_modified = Event(AccentedText)
-        self.english_modified = Event(AccentedText)
         self.__card_set = card_set
         self.__is_new_card = True
-        self.__card_match = None
-        self.__word = None
-        
-        # Create widgets
-        self.button_edit = widgets.Button("E")
-        self.button_delete = widgets.Button("X")
-        self.box_type = widgets.TextEdit("")
-        self.box_type.set_minimum_width(90)
-        self.box_russian = CardRussianTextEdit("")
-        self.box_english = widgets.TextEdit("")
-
-
-        word_types = [get_word_type_short_name(word_type)
-                      for word_type in WordType]
-        self.box_type.set_autocomplete_source(word_types)
-
-        # Create layout
-        layout = widgets.HBoxLayout()
-        layout.add(self.box_type, stretch=0)
-        layout.add(self.box_russian, stretch=1)
-        layout.add(self.box_english, stretch=1)
-        layout.add(self.button_edit, stretch=0)
-        layout.add(self.button_delete, stretch=0)
-        self.set_layout(layout)
-
-        # Connect signals
-        self.box_russian.text_edited.connect(self.__on_russian_changed)
-        self.box_english.text_edited.connect(self.__on_english_changed)
-        self.box_type.text_edited.connect(self.__on_type_changed)
-        self.box_russian.return_pressed.connect(self.__auto_complete)
-        self.box_russian.focus_lost.connect(self.download_word_info)
-
+        self.__word_type_text = ""
+        self.__russian_text = ""
+        self.__english_text = ""
+        self.__display = None
         self.set_card(card)
 
-    def get_column(self, column: int):
-        if column == 0:
-            return self.box_type
-        if column == 1:
-            return self.box_russian
-        if column == 2:
-            return self.box_english
-        raise KeyError(column)
-
     def set_card(self, card: Card):
         """Sets the card to edit."""
-        self.russian_modified.block(True)
-        self.english_modified.block(True)
         self.card = card
         self.__is_new_card = not self.card_database.has_card(card)
-        fixed = self.card.get_fixed_card_set() is not None
-
         word_type = card.get_word_type()
         if word_type is not None:
-            self.box_type.set_text(get_word_type_short_name(card.get_word_type()))
+            self.__word_type_text = get_word_type_short_name(word_type)
         else:
-            self.box_type.set_text("")
-        self.box_russian.set_text(repr(self.card.get_russian()))
-        self.box_english.set_text(repr(self.card.get_english()))
-        self.button_edit.set_enabled(not fixed)
-        self.button_delete.set_enabled(not fixed)
-        self.__on_modified()
-        self.russian_modified.block(False)
-        self.english_modified.block(False)
+            self.__word_type_text = ""
+        self.__russian_text = repr(self.card.get_russian())
+        self.__english_text = repr(self.card.get_english())
+        self.__display = None
 
     def apply(self):
         """Applies changes to the card."""
@@ -195,14 +159,54 @@ class CardRow(widgets.Widget):
                 original=self.card, modified=new_card)
         self.set_card(self.card)
 
+    def get_word_type_text(self) -> str:
+        return self.__word_type_text
+
+    def get_russian_text(self) -> str:
+        return self.__russian_text
+
+    def get_english_text(self) -> str:
+        return self.__english_text
+
+    def set_word_type_text(self, text: str):
+        self.__word_type_text = text
+        self.__display = None
+
+    def set_russian_text(self, text: str):
+        self.__russian_text = text
+        self.__display = None
+
+    def set_english_text(self, text: str):
+        self.__english_text = text
+        self.__display = None
+
     def get_word_type(self) -> WordType:
-        return parse_short_word_type(self.box_type.get_text())
+        return parse_short_word_type(self.__word_type_text)
 
     def get_russian(self) -> AccentedText:
-        return AccentedText(self.box_russian.get_text())
+        return AccentedText(self.__russian_text)
     
     def get_english(self) -> AccentedText:
-        return AccentedText(self.box_english.get_text())
+        return AccentedText(self.__english_text)
+
+    def get_word(self) -> Word:
+        """Returns the word looked up for the card."""
+        return self.__get_display()["word"]
+
+    def get_card_attributes(self) -> set:
+        """Returns the attributes displayed for the card."""
+        return self.__get_display()["card_attributes"]
+
+    def get_colors(self) -> tuple:
+        """Returns the word type, russian and english box colors."""
+        return self.__get_display()["colors"]
+
+    def get_card_match(self) -> Card:
+        """Returns the existing card the entered text auto-completes to."""
+        return self.__get_display()["card_match"]
+
+    def is_fixed(self) -> bool:
+        return self.card.get_fixed_card_set() is not None
 
     def is_null_card(self) -> bool:
         return self.__is_new_card and self.is_empty()
@@ -220,14 +224,14 @@ class CardRow(widgets.Widget):
         return not self.__card_set.has_card(self.card)
 
     def is_incomplete(self) -> bool:
-        return (not self.box_type.get_text() or
-                not self.box_russian.get_text() or
-                not self.box_english.get_text())
+        return (not self.__word_type_text or
+                not self.__russian_text or
+                not self.__english_text)
 
     def is_empty(self) -> bool:
-        return (not self.box_type.get_text() and
-                not self.box_russian.get_text() and
-                not self.box_english.get_text())
+        return (not self.__word_type_text and
+                not self.__russian_text and
+                not self.__english_text)
 
     def is_modified(self):
         card_type = self.get_word_type()
@@ -261,35 +265,56 @@ class CardRow(widgets.Widget):
         """
         word_type = self.predict_word_type(self.get_russian())
         if word_type is not None:
-            self.box_type.set_text(
-                get_word_type_short_name(word_type))
+            self.set_word_type_text(get_word_type_short_name(word_type))
         return word_type
 
-    def __auto_complete(self):
-        if self.__card_match:
-            self.set_card(self.__card_match)
+    def download_word_info(self, callback=None):
+        """
+        Looks up or downloads the word type of the russian text. The
+        callback is called if the word type is changed.
+        """
+        if self.get_word():
+            return
+        russian = self.get_russian().text.lower()
+        if not russian:
+            return
+        word_type = self.get_word_type()
+        if word_type is None:
+            word_type = self.predict_word_type(russian)
+        if word_type is None:
+            return
 
-    def __on_russian_changed(self):
-        # Convert 'ээ' to an accent mark (for when typing in russian mode)
-        russian = self.get_russian()
-        if "ээ" in repr(russian).lower():
-            russian = re.sub("ээ", "'", repr(russian), flags=re.IGNORECASE)
-            self.box_russian.set_text(russian)
-        self.russian_modified.emit(self.get_russian())
-        self.__on_modified()
+        # Check if the word already exists
+        word = Config.app.word_database.get_word(
+            word_type=word_type, name=russian)
+        if word is not None:
+            self.set_word_type_text(
+                get_word_type_short_name(word.get_word_type()))
+            if callback:
+                callback()
+            return
 
-    def __on_english_changed(self):
-        self.english_modified.emit(self.get_english())
-        self.__on_modified()
+        # Else, download the word
+        def on_download(word):
+            if word:
+                Config.app.word_database.add_word(word, replace=True)
+                self.set_word_type_text(
+                    get_word_type_short_name(word.get_word_type()))
+                if callback:
+                    callback()
 
-    def __on_type_changed(self):
-        self.__on_modified()
+        Config.app.cooljugator_thread.download_word_info(
+            word_type=word_type, name=russian, callback=on_download)
 
-    def __on_modified(self):
-        """Called when anything is modified."""
+    def __get_display(self) -> dict:
+        if self.__display is None:
+            self.__display = self.__calc_display()
+        return self.__display
+
+    def __calc_display(self) -> dict:
+        """Calculates the display state from the entered text."""
         empty = self.is_empty()
         valid = self.is_valid()
-        modified = self.is_modified()
         word_type = self.get_word_type()
         russian = self.get_russian()
         english = self.get_english()
@@ -297,31 +322,26 @@ class CardRow(widgets.Widget):
         new_in_set = not self.__card_set.has_card(self.card)
 
         # Look up the word and get important card attributes
-        self.__word = None
+        word = None
         card_attributes = set()
         if word_type is not None and russian.text:
             word_name = get_card_word_name(russian)
-            self.__word = Config.app.word_database.get_word(
+            word = Config.app.word_database.get_word(
                 name=word_name.text, word_type=word_type)
-            self.box_russian.set_word(self.__word)
-            if isinstance(self.__word, Verb):
-                if self.__word.get_aspect() == Aspect.Imperfective:
+            if isinstance(word, Verb):
+                if word.get_aspect() == Aspect.Imperfective:
                     card_attributes.add(CardAttributes.Imperfective)
-                elif self.__word.get_aspect() == Aspect.Perfective:
+                elif word.get_aspect() == Aspect.Perfective:
                     card_attributes.add(CardAttributes.Perfective)
-            elif isinstance(self.__word, Noun):
-                if self.__word.get_gender() == Gender.Masculine:
+            elif isinstance(word, Noun):
+                if word.get_gender() == Gender.Masculine:
                     card_attributes.add(CardAttributes.Masculine)
-                elif self.__word.get_gender() == Gender.Femanine:
+                elif word.get_gender() == Gender.Femanine:
                     card_attributes.add(CardAttributes.Femanine)
-                elif self.__word.get_gender() == Gender.Neuter:
+                elif word.get_gender() == Gender.Neuter:
                     card_attributes.add(CardAttributes.Neuter)
-            attrs = ", ".join(x.value for x in list(sorted(card_attributes)))
-        else:
-            self.box_russian.set_word(None)
         if not new_in_database:
             card_attributes = self.card.get_attributes()
-        self.box_russian.set_attributes(card_attributes)
         
         # Check for duplicate key
         key = get_card_key(word_type, russian, english)
@@ -375,72 +395,147 @@ class CardRow(widgets.Widget):
             if existing_card and existing_card != self.card:
                 color_english = color_invalid
 
+        # Find an existing card to auto-complete to, by its russian key
+        card_match = None
+        if not repr(english) and russian.text:
+            word_types = [word_type] if word_type is not None else WordType
+            for match_word_type in word_types:
+                card_match = self.card_database.get_card_by_russian_key(
+                    get_card_russian_key(match_word_type, russian))
+                if card_match is not None:
+                    break
+
+        return {
+            "word": word,
+            "card_attributes": card_attributes,
+            "colors": (color_word_type, color_russian, color_english),
+            "card_match": card_match,
+        }
+
+
+class CardRow(widgets.Widget):
+    """
+    Widget displaying a CardRowState, which is re-bound to other rows as
+    the card list scrolls.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.modified = Event()
+        self.russian_modified = Event(AccentedText)
+        self.english_modified = Event(AccentedText)
+        self.__state = None
+        
+        # Create widgets
+        self.button_edit = widgets.Button("E")
+        self.button_delete = widgets.Button("X")
+        self.box_type = widgets.TextEdit("")
+        self.box_type.set_minimum_width(90)
+        self.box_russian = CardRussianTextEdit("")
+        self.box_english = widgets.TextEdit("")
+
+
+        self.box_type.set_autocomplete_source(WORD_TYPE_AUTOCOMPLETE_SOURCE)
+
+        # Create layout
+        layout = widgets.HBoxLayout()
+        layout.add(self.box_type, stretch=0)
+        layout.add(self.box_russian, stretch=1)
+        layout.add(self.box_english, stretch=1)
+        layout.add(self.button_edit, stretch=0)
+        layout.add(self.button_delete, stretch=0)
+        self.set_layout(layout)
+
+        # Connect signals
+        self.box_russian.text_edited.connect(self.__on_russian_changed)
+        self.box_english.text_edited.connect(self.__on_english_changed)
+        self.box_type.text_edited.connect(self.__on_type_changed)
+        self.box_russian.return_pressed.connect(self.__auto_complete)
+        self.box_russian.focus_lost.connect(self.download_word_info)
+
+    def get_state(self) -> CardRowState:
+        return self.__state
+
+    def set_state(self, state: CardRowState):
+        """Sets the row state to display and edit."""
+        self.__state = state
+        self.refresh()
+
+    def get_column(self, column: int):
+        if column == 0:
+            return self.box_type
+        if column == 1:
+            return self.box_russian
+        if column == 2:
+            return self.box_english
+        raise KeyError(column)
+
+    def refresh(self):
+        """Updates the widgets from the row state."""
+        state = self.__state
+        fixed = state.is_fixed()
+        self.box_type.set_text(state.get_word_type_text())
+        self.box_russian.set_text(state.get_russian_text())
+        self.box_english.set_text(state.get_english_text())
+        self.button_edit.set_enabled(not fixed)
+        self.button_delete.set_enabled(not fixed)
+        self.__refresh_display()
+
+    def download_word_info(self):
+        state = self.__state
+        if state is not None:
+            state.download_word_info(
+                callback=lambda: self.__on_state_changed(state))
+
+    def __refresh_display(self):
+        state = self.__state
+        color_word_type, color_russian, color_english = state.get_colors()
+        self.box_russian.set_word(state.get_word())
+        self.box_russian.set_attributes(state.get_card_attributes())
         self.box_type.set_background_color(color_word_type)
         self.box_russian.set_background_color(color_russian)
         self.box_english.set_background_color(color_english)
-        self.modified.emit()
-        self.__refresh_matches()
-        
-    def __refresh_matches(self):
-        word_type = self.get_word_type()
-        russian = self.get_russian()
-        english = self.get_english()
-
-        match = None
-        if not repr(english):
-            for index, card in enumerate(self.card_database.iter_cards()):
-                if self.matches(card, card_type=word_type, russian=russian):
-                    match = card
-                    break
-        
+        match = state.get_card_match()
         if match is not None:
             self.box_english.set_background_text(repr(match.get_english()))
         else:
             self.box_english.set_background_text(None)
-        self.__card_match = match
-
-    def matches(self, card, card_type, russian, english=None):
-        russian = russian.text.lower() if russian else None
-        english = english.text.lower() if english else None
-        if card_type is not None and card_type != card.get_word_type():
-            return False
-        if russian and russian != card.get_russian().text.lower():
-            return False
-        if english and english != card.get_english().text.lower():
-            return False
-        return card_type is not None or russian or english
 
-    def download_word_info(self):
-        if self.__word:
-            return
-        russian = self.get_russian().text.lower()
-        if not russian:
-            return
-        word_type = self.get_word_type()
-        if word_type is None:
-            word_type = self.predict_word_type(russian)
-        if word_type is None:
-            return
+    def __auto_complete(self):
+        match = self.__state.get_card_match()
+        if match:
+            self.__state.set_card(match)
+            self.refresh()
+            self.modified.emit()
+
+    def __on_state_changed(self, state: CardRowState):
+        if state is self.__state:
+            self.refresh()
+        self.modified.emit()
 
-        # Check if the word already exists
-        word = Config.app.word_database.get_word(
-            word_type=word_type, name=russian)
-        if word is not None:
-            text = get_word_type_short_name(word.get_word_type())
-            self.box_type.set_text(text)
-            self.__on_modified()
-            return
+    def __on_russian_changed(self):
+        # Convert 'ээ' to an accent mark (for when typing in russian mode)
+        russian = self.box_russian.get_text()
+        if "ээ" in russian.lower():
+            russian = re.sub("ээ", "'", russian, flags=re.IGNORECASE)
+            self.box_russian.set_text(russian)
+        self.__state.set_russian_text(russian)
+        self.russian_modified.emit(self.__state.get_russian())
+        self.__on_modified()
 
-        # Else, download the word
-        def callback(word):
-            if word:
-                Config.app.word_database.add_word(word, replace=True)
-                text = get_word_type_short_name(word.get_word_type())
-                self.box_type.set_text(text)
-                self.__on_modified()
+    def __on_english_changed(self):
+        self.__state.set_english_text(self.box_english.get_text())
+        self.english_modified.emit(self.__state.get_english())
+        self.__on_modified()
 
-        Config.app.cooljugator_thread.download_word_info(
-            word_type=word_type, name=russian, callback=callback)
+    def __on_type_changed(self):
+        self.__state.set_word_type_text(self.box_type.get_text())
+        self.__on_modified()
+
+    def __on_modified(self):
+        """Called when anything is modified."""
+        self.__refresh_display()
+        self.modified.emit()
 
 
 class CardSetEditWidget(widgets.Widget):
@@ -471,7 +566,9 @@ class CardSetEditWidget(widgets.Widget):
             visible_func=lambda card: card not in self.get_cards())
         
         self.table = widgets.Widget()
-        self.__layout_card_list = widgets.VBoxLayout()
+        self.__layout_card_list = widgets.VirtualListLayout(
+            create_row=self.__create_row_widget,
+            bind_row=lambda widget, index: widget.set_state(self.rows[index]))
         self.table.set_layout(self.__layout_card_list)
 
         # Create layouts
@@ -524,32 +621,23 @@ class CardSetEditWidget(widgets.Widget):
 
         return False
 
-    def add_empty_row(self) -> CardRow:
+    def add_empty_row(self) -> CardRowState:
         return self.add_card(Card(), fill_empty_row=False)
 
-    def add_card(self, card: Card, fill_empty_row=True, row=None) -> CardRow:
-        if row is not None:
-            # Use the specifid row
-            row.set_card(card)
-        elif fill_empty_row and self.rows and self.rows[-1].is_empty():
+    def add_card(self, card: Card, fill_empty_row=True, row=None) -> CardRowState:
+        if row is None and fill_empty_row and self.rows and self.rows[-1].is_empty():
             # Re-use the last empty row
             row = self.rows[-1]
+        if row is not None:
+            # Use the specifid row
             row.set_card(card)
+            self.__layout_card_list.refresh_row(self.rows.index(row))
         else:
             # Create a new row
-            row = CardRow(card=card, card_set=self.__card_set, card_database=self.__card_database)
-            row.box_type.return_pressed.connect(lambda: self.next_row(row, 0))
-            row.box_russian.return_pressed.connect(lambda: self.next_row(row, 1))
-            row.box_english.return_pressed.connect(lambda: self.next_row(row, 2))
-            row.button_delete.clicked.connect(lambda: self.remove_row(row))
-            row.button_edit.clicked.connect(lambda: self.__on_click_edit_card(card))
-            row.modified.connect(self.__on_modified)
-            row.english_modified.connect(lambda text: self.__card_search_widget.set_search_text(text))
-            row.russian_modified.connect(lambda text: self.__card_search_widget.set_search_text(text))
-            row.box_russian.add_key_shortcut("Ctrl+Space", lambda: self.__auto_complete(row, 1))
-            row.box_english.add_key_shortcut("Ctrl+Space", lambda: self.__auto_complete(row, 2))
+            row = CardRowState(card=card, card_set=self.__card_set,
+                               card_database=self.__card_database)
             self.rows.append(row)
-            self.__layout_card_list.add(row)
+            self.__layout_card_list.set_row_count(len(self.rows))
 
         self.__on_modified()
         return row
@@ -558,28 +646,30 @@ class CardSetEditWidget(widgets.Widget):
         index = [row.card for row in self.rows].index(card)
         self.remove_row(self.rows[index])
     
-    def remove_row(self, row: CardRow):
+    def remove_row(self, row: CardRowState):
         index = self.rows.index(row)
-        row = self.rows[index]
         del self.rows[index]
-        self.__layout_card_list.remove(row)
+        self.__layout_card_list.set_row_count(len(self.rows))
+        self.__layout_card_list.refresh_rows()
         if index == len(self.rows):
             self.add_empty_row()
         self.__on_modified()
 
-    def next_row(self, row: CardRow, column: int):
+    def next_row(self, row: CardRowState, column: int):
         index = self.rows.index(row)
         if index + 1 >= len(self.rows):
             self.add_empty_row()
-        next_row = self.rows[index + 1]
         if column == 0:
-            box = next_row.box_type
-            next_row.auto_set_word_type()
-        elif column == 1:
-            box = next_row.box_russian
-        elif column == 2:
-            box = next_row.box_english
-        box.focus()
+            self.rows[index + 1].auto_set_word_type()
+            self.__layout_card_list.refresh_row(index + 1)
+        self.focus_row(index + 1, column)
+
+    def focus_row(self, index: int, column: int, scroll=True):
+        """Focuses a column of a row, scrolling the row into view."""
+        widget = self.__layout_card_list.get_row_widget(index)
+        if scroll:
+            self.__layout_card_list.ensure_row_visible(index)
+        widget.get_column(column).focus()
 
     def apply(self):
         """Save the card set to file."""
@@ -627,12 +717,14 @@ class CardSetEditWidget(widgets.Widget):
                 self.__button_convert.set_text(
                     "Assimilate {} sets to YAML".format(len(card_sets_in_file)))
 
-        self.rows = []
-        self.__layout_card_list.clear()
-        for card in self.__card_set.get_cards():
-            self.add_card(card)
-        row = self.add_empty_row()
-        row.box_russian.focus()
+        # Row widgets are only created for the rows scrolled into view
+        self.rows = [CardRowState(card=card, card_set=self.__card_set,
+                                  card_database=self.__card_database)
+                     for card in self.__card_set.get_cards()]
+        self.__layout_card_list.set_row_count(len(self.rows))
+        self.__layout_card_list.refresh_rows()
+        self.add_empty_row()
+        self.focus_row(len(self.rows) - 1, 1, scroll=False)
 
     def __on_click_convert(self):
         self.__application.assimilate_card_set_to_yaml(self.__card_set)
@@ -653,10 +745,9 @@ class CardSetEditWidget(widgets.Widget):
         card = self.__card_search_widget.get_first_result()
         if card:
             self.__card_search_widget.remove_from_results(card)
-            row.set_card(card)
-            next_row = self.add_empty_row()
-            box = next_row.get_column(column)
-            box.focus()
+            self.add_card(card, row=row)
+            self.add_empty_row()
+            self.focus_row(len(self.rows) - 1, column)
         return card
 
     def __on_click_searched_card(self, card: Card):
@@ -665,8 +756,8 @@ class CardSetEditWidget(widgets.Widget):
         if self.rows and self.rows[-1].is_incomplete():
             row = self.rows[-1]
         self.add_card(card, row=row)
-        row = self.add_empty_row()
-        row.box_russian.focus()
+        self.add_empty_row()
+        self.focus_row(len(self.rows) - 1, 1)
         
     def __on_click_done(self):
         self.apply()
@@ -680,12 +771,34 @@ class CardSetEditWidget(widgets.Widget):
         """Called when a card in the set is updated."""
         if self.__has_card(card):
             row = self.__get_row_from_card(card)
-            row.set_card(card)
+            self.add_card(card, row=row)
         else:
             self.add_card(card, fill_empty_row=True)
             self.add_empty_row()
         self.__on_modified()
 
+    def __create_row_widget(self) -> CardRow:
+        """Creates a row widget, which is bound to rows by index."""
+        row = CardRow()
+        row.box_type.return_pressed.connect(
+            lambda: self.next_row(row.get_state(), 0))
+        row.box_russian.return_pressed.connect(
+            lambda: self.next_row(row.get_state(), 1))
+        row.box_english.return_pressed.connect(
+            lambda: self.next_row(row.get_state(), 2))
+        row.button_delete.clicked.connect(
+            lambda: self.remove_row(row.get_state()))
+        row.button_edit.clicked.connect(
+            lambda: self.__on_click_edit_card(row.get_state().card))
+        row.modified.connect(self.__on_modified)
+        row.english_modified.connect(lambda text: self.__card_search_widget.set_search_text(text))
+        row.russian_modified.connect(lambda text: self.__card_search_widget.set_search_text(text))
+        row.box_russian.add_key_shortcut(
+            "Ctrl+Space", lambda: self.__auto_complete(row.get_state(), 1))
+        row.box_english.add_key_shortcut(
+            "Ctrl+Space", lambda: self.__auto_complete(row.get_state(), 2))
+        return row
+
     def __on_modified(self):
         modified = self.is_modified()
         self.__button_save.set_enabled(modified)
@@ -6,8 +6,10 @@ from study_tool.russian.word import AccentedText
 
 class GenericTableRow:
 
-    def __init__(self, item):
+    def __init__(self, item, enabled=True, color=None):
         self.item = item
+        self.enabled = enabled
+        self.color = color
 
 
 class GenericTableColumn:
@@ -20,9 +22,14 @@ class GenericTableColumn:
     def set_stretch(self, stretch):
         self.__stretch = stretch
     
-    def create(self, item):
+    def create(self, row: GenericTableRow):
+        """Creates the widget for this column in a row."""
         return None
 
+    def bind(self, widget, item):
+        """Updates a widget created by this column to display an item."""
+        pass
+
 
 class GenericTableButtonColumn(GenericTableColumn):
     def __init__(self, text, callback):
@@ -30,10 +37,10 @@ class GenericTableButtonColumn(GenericTableColumn):
         self.__text = text
         self.__callback = callback
 
-    def create(self, item):
+    def create(self, row: GenericTableRow):
         text = AccentedText(self.__text).text
         button = widgets.Button(text)
-        button.clicked.connect(lambda: self.__callback(item))
+        button.clicked.connect(lambda: self.__callback(row.item))
         return button
         
 
@@ -42,23 +49,63 @@ class GenericTableTextColumn(GenericTableColumn):
         GenericTableColumn.__init__(self, stretch=1)
         self.__text_func = text_func
 
-    def create(self, item):
-        text = AccentedText(self.__text_func(item)).text
-        label = widgets.Label(text)
-        return label
+    def create(self, row: GenericTableRow):
+        return widgets.Label("")
+
+    def bind(self, widget, item):
+        widget.set_text(AccentedText(self.__text_func(item)).text)
+
+
+class GenericTableRowWidget(widgets.Widget):
+    """
+    Widget for one row of a virtual GenericTableWidget, which is re-bound
+    to other rows as the table scrolls.
+    """
+    def __init__(self, columns: list):
+        super().__init__()
+        self.item = None
+        self.__columns = columns
+        self.__widgets = []
+        layout = widgets.HBoxLayout()
+        for column in columns:
+            widget = column.create(self)
+            self.__widgets.append(widget)
+            layout.add(widget, stretch=column.get_stretch() or 0)
+        self.set_layout(layout)
+
+    def bind(self, row: GenericTableRow):
+        self.item = row.item
+        for column, widget in zip(self.__columns, self.__widgets):
+            column.bind(widget, row.item)
+            widget.set_enabled(row.enabled)
 
 
 class GenericTableWidget(widgets.Widget):
     """
     Generic table widget.
+
+    A virtual table only creates widgets for the rows scrolled into view of
+    its AbstractScrollArea, at the cost of columns being sized per row.
     """
-    def __init__(self):
+    def __init__(self, virtual=False):
         super().__init__()
         self.__row_list = []
         self.__item_to_row_dict = {}
         self.__columns = []
-        self.__grid_layout = widgets.GridLayout()
-        self.set_layout(self.__grid_layout)
+        self.__grid_layout = None
+        self.__virtual_layout = None
+        if virtual:
+            self.__virtual_layout = widgets.VirtualListLayout(
+                create_row=lambda: GenericTableRowWidget(self.__columns),
+                bind_row=lambda widget, index: widget.bind(
+                    self.__row_list[index]))
+            self.set_layout(self.__virtual_layout)
+        else:
+            self.__grid_layout = widgets.GridLayout()
+            self.set_layout(self.__grid_layout)
+
+    def is_virtual(self) -> bool:
+        return self.__virtual_layout is not None
 
     def contains(self, item) -> bool:
         return item in self.__item_to_row_dict
@@ -83,13 +130,17 @@ class GenericTableWidget(widgets.Widget):
         self.__columns.append(column)
         if stretch is not None:
             column.set_stretch(stretch)
-        self.__grid_layout.set_column_stretch(
-            index, column.get_stretch())
+        if self.__grid_layout:
+            self.__grid_layout.set_column_stretch(
+                index, column.get_stretch())
 
     def clear(self):
-        self.__grid_layout.clear()
+        if self.__grid_layout:
+            self.__grid_layout.clear()
         self.__row_list = []
         self.__item_to_row_dict = {}
+        if self.__virtual_layout:
+            self.__virtual_layout.set_row_count(0)
 
     def add(self, item, enabled=True, color=None) -> GenericTableRow:
         if item in self.__item_to_row_dict:
@@ -97,16 +148,18 @@ class GenericTableWidget(widgets.Widget):
         
         # Create the row
         row_index = len(self.__row_list)
-        row = GenericTableRow(item)
-        for col_index, column in enumerate(self.__columns):
-            widget = column.create(item)
-            widget.set_enabled(enabled)
-            self.__grid_layout.add(widget, row_index, col_index)
-            if color:
-                pass
+        row = GenericTableRow(item, enabled=enabled, color=color)
+        if self.__grid_layout:
+            for col_index, column in enumerate(self.__columns):
+                widget = column.create(row)
+                column.bind(widget, item)
+                widget.set_enabled(enabled)
+                self.__grid_layout.add(widget, row_index, col_index)
 
         self.__row_list.append(row)
         self.__item_to_row_dict[item] = row
+        if self.__virtual_layout:
+            self.__virtual_layout.set_row_count(len(self.__row_list))
         return row
 
     def remove(self, item):
@@ -114,6 +167,10 @@ class GenericTableWidget(widgets.Widget):
         row = self.__item_to_row_dict[item]
         row_index = self.__row_list.index(row)
         del self.__item_to_row_dict[item]
-        self.__row_list.remove(row)
-        self.__grid_layout.remove_row(row_index, shift_up=True)
+        del self.__row_list[row_index]
+        if self.__grid_layout:
+            self.__grid_layout.remove_row(row_index, shift_up=True)
+        else:
+            self.__virtual_layout.set_row_count(len(self.__row_list))
+            self.__virtual_layout.refresh_rows()
 
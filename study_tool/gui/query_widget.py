@@ -50,7 +50,7 @@ class QueryWidget(widgets.Widget):
         card_type_options += [x.name for x in WordType]
 
         # Create widgets
-        self.__table_cards = GenericTableWidget()
+        self.__table_cards = GenericTableWidget(virtual=True)
         self.__table_cards.add_text_column(lambda card: card.get_russian().text)
         self.__table_cards.add_text_column(lambda card: card.get_english().text)
         self.__box_count = widgets.TextEdit("60")
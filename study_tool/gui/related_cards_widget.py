@@ -149,17 +149,11 @@ class RelatedCardsWidget(widgets.Widget):
         result_count = 0
         
         if text.strip():
-            matching_cards = []
-            for index, card in enumerate(self.__card_database.iter_cards()):
-                match_score = self.__matches(card, text)
-                if (match_score is not None and
-                        card not in self.__table_related_cards.get_items() and
-                        card is not self.__card):
-                    matching_cards.append((card, match_score))
-
-            matching_cards.sort(key=lambda x: x[1], reverse=True)
-            result_count = len(matching_cards)
-            for index, (card, _) in enumerate(matching_cards[:20]):
+            related_cards = set(self.__table_related_cards.get_items())
+            matching_cards, result_count = self.__card_database.search_cards(
+                text, count=20, filter_func=lambda card: (
+                    card not in related_cards and card is not self.__card))
+            for index, card in enumerate(matching_cards):
                 enabled = not card.is_in_fixed_card_set()
                 color = None
                 if index == 0:
@@ -168,15 +162,3 @@ class RelatedCardsWidget(widgets.Widget):
                     card, enabled=enabled, color=color)
 
         self.__label_result_count.set_text("{} results".format(result_count))
-
-    def __matches(self, card: Card, text: str):
-        """Check if a card matches the given text."""
-        text = text.lower().replace("ё", "е")
-        russian = card.get_russian().text.lower().replace("ё", "е")
-        english = card.get_english().text.lower()
-        if text in russian:
-            return -(len(russian) - len(text))
-        if text in english:
-            return -(len(english) - len(text))
-        return None
-    
\ No newline at end of file
@@ -0,0 +1,73 @@
+import threading
+import time
+import traceback
+from study_tool.config import Config
+
+
+class LazyLoader:
+    """
+    Proxy for an object whose data is loaded on a background thread. The
+    load starts the first time any attribute of the object is accessed,
+    or earlier when prefetch() is called as a hint that the data will be
+    needed soon. Attribute access blocks until the load has finished, so
+    callers only wait if they need the data before it is ready.
+
+    The load function is called with the proxied object. An error while
+    loading is logged and leaves the object as the load function left it.
+    """
+
+    def __init__(self, target, load_function, name=None):
+        self.__target = target
+        self.__load_function = load_function
+        self.__name = name or type(target).__name__
+        self.__lock = threading.Lock()
+        self.__thread = None
+        self.__loaded = threading.Event()
+        self.__load_time = None
+
+    def get_target(self):
+        """Returns the proxied object without waiting for it to load."""
+        return self.__target
+
+    def is_loaded(self) -> bool:
+        return self.__loaded.is_set()
+
+    def get_load_time(self) -> float:
+        """Returns the seconds the load took, or None if not loaded."""
+        return self.__load_time
+
+    def prefetch(self):
+        """Starts loading in the background, if not already started."""
+        with self.__lock:
+            if self.__thread is None:
+                self.__thread = threading.Thread(
+                    target=self.__load, name="load " + self.__name,
+                    daemon=True)
+                self.__thread.start()
+
+    def wait(self):
+        """Starts loading if needed and blocks until loaded."""
+        if not self.__loaded.is_set():
+            self.prefetch()
+            if threading.current_thread() is not self.__thread:
+                self.__loaded.wait()
+        return self.__target
+
+    def __load(self):
+        start = time.perf_counter()
+        try:
+            self.__load_function(self.__target)
+        except Exception:
+            Config.logger.error("Error loading {} data".format(self.__name))
+            traceback.print_exc()
+        self.__load_time = time.perf_counter() - start
+        Config.logger.info("Loaded {} data in {:.2f}s".format(
+            self.__name, self.__load_time))
+        self.__loaded.set()
+
+    def __getattr__(self, name):
+        # Only called for attributes not defined by the proxy itself
+        return getattr(self.wait(), name)
+
+    def __repr__(self):
+        return "LazyLoader({!r})".format(self.__target)
@@ -0,0 +1,189 @@
+import hashlib
+import json
+import re
+from array import array
+from study_tool.russian.word import SPLIT_WORD_REGEX
+
+SENTENCE_REGEX = re.compile(r"\s*(.*?[\.\?\!]+)\s+")
+
+CORPUS_VERSION = 1
+
+# Names of the integer columns, in the order they are persisted
+_COLUMN_NAMES = (
+    "story_paragraph_start",    # story -> first paragraph
+    "paragraph_sentence_start", # paragraph -> first sentence
+    "sentence_paragraph",       # sentence -> paragraph
+    "sentence_start",           # sentence -> start offset in paragraph
+    "sentence_end",             # sentence -> end offset in paragraph
+    "sentence_token_start",     # sentence -> first token
+    "token_sentence",           # token -> sentence
+    "token_start",              # token -> start offset in paragraph
+    "token_end",                # token -> end offset in paragraph
+)
+
+
+def get_stories_signature(stories: list) -> str:
+    """
+    Returns a hash of the paragraph text of a list of stories, used to check
+    if a persisted corpus still matches them.
+    """
+    sha = hashlib.sha1()
+    for story in stories:
+        for chapter in story.chapters:
+            for paragraph in chapter.paragraphs:
+                sha.update(paragraph.text.encode("utf8"))
+                sha.update(b"\0")
+            sha.update(b"\1")
+        sha.update(b"\2")
+    return sha.hexdigest()
+
+
+class TokenizedCorpus:
+    """
+    Sentence and word token spans of a list of stories, computed once.
+
+    Spans are stored as character offsets into the paragraph text, in
+    compact array-backed columns. Iterating sentences or words only slices
+    the paragraph strings and requires no regex work.
+    """
+
+    def __init__(self):
+        self.__paragraphs = []
+        for name in _COLUMN_NAMES:
+            setattr(self, "_" + name, array("I"))
+        self._story_paragraph_start.append(0)
+        self._paragraph_sentence_start.append(0)
+        self._sentence_token_start.append(0)
+
+    def get_story_count(self) -> int:
+        return len(self._story_paragraph_start) - 1
+
+    def get_sentence_count(self) -> int:
+        return len(self._sentence_paragraph)
+
+    def get_token_count(self) -> int:
+        return len(self._token_sentence)
+
+    def get_sentence(self, sentence_index: int) -> str:
+        """Returns the text of a sentence."""
+        paragraph = self.__paragraphs[self._sentence_paragraph[sentence_index]]
+        return paragraph[self._sentence_start[sentence_index]:
+                         self._sentence_end[sentence_index]]
+
+    def get_sentence_tokens(self, sentence_index: int) -> range:
+        """Returns the range of token indices within a sentence."""
+        return range(self._sentence_token_start[sentence_index],
+                     self._sentence_token_start[sentence_index + 1])
+
+    def get_token_sentence(self, token_index: int) -> int:
+        """Returns the index of the sentence containing a token."""
+        return self._token_sentence[token_index]
+
+    def get_token_text(self, token_index: int) -> str:
+        """Returns the text of a word token."""
+        sentence_index = self._token_sentence[token_index]
+        paragraph = self.__paragraphs[self._sentence_paragraph[sentence_index]]
+        return paragraph[self._token_start[token_index]:
+                         self._token_end[token_index]]
+
+    def get_token(self, token_index: int) -> tuple:
+        """
+        Returns a tuple of (word, start) for a word token, where start is
+        the token's position within its sentence plus one, matching the
+        positions yielded by split_words().
+        """
+        sentence_index = self._token_sentence[token_index]
+        paragraph = self.__paragraphs[self._sentence_paragraph[sentence_index]]
+        start = self._token_start[token_index]
+        return (paragraph[start:self._token_end[token_index]],
+                start - self._sentence_start[sentence_index] + 1)
+
+    def iter_sentences(self, story_index=None):
+        """Iterates sentence texts, either of all stories or of one story."""
+        for sentence_index in self.__get_story_sentences(story_index):
+            yield self.get_sentence(sentence_index)
+
+    def iter_sentence_tokens(self, sentence_index: int):
+        """Iterates the (word, start) tuples of a sentence."""
+        for token_index in self.get_sentence_tokens(sentence_index):
+            yield self.get_token(token_index)
+
+    def iter_words(self, story_index=None):
+        """Iterates word texts, either of all stories or of one story."""
+        sentences = self.__get_story_sentences(story_index)
+        if not sentences:
+            return
+        for token_index in range(self._sentence_token_start[sentences.start],
+                                 self._sentence_token_start[sentences.stop]):
+            yield self.get_token_text(token_index)
+
+    def add_story(self, story):
+        """Splits a story into sentences and word tokens and appends them."""
+        for chapter in story.chapters:
+            for paragraph in chapter.paragraphs:
+                text = paragraph.text
+                self.__paragraphs.append(text)
+                paragraph_index = len(self.__paragraphs) - 1
+                for match in SENTENCE_REGEX.finditer(text + " "):
+                    sentence_start, sentence_end = match.span(1)
+                    sentence_index = len(self._sentence_paragraph)
+                    self._sentence_paragraph.append(paragraph_index)
+                    self._sentence_start.append(sentence_start)
+                    self._sentence_end.append(sentence_end)
+                    for word in SPLIT_WORD_REGEX.finditer(
+                            text, sentence_start, sentence_end):
+                        self._token_sentence.append(sentence_index)
+                        self._token_start.append(word.start())
+                        self._token_end.append(word.end())
+                    self._sentence_token_start.append(len(self._token_sentence))
+                self._paragraph_sentence_start.append(
+                    len(self._sentence_paragraph))
+        self._story_paragraph_start.append(len(self.__paragraphs))
+
+    def save(self, path: str, stories: list):
+        """
+        Saves the token spans to a file. The story text itself is not saved,
+        so the same stories must be passed to load().
+        """
+        header = {"version": CORPUS_VERSION,
+                  "signature": get_stories_signature(stories),
+                  "columns": [[name, len(getattr(self, "_" + name))]
+                              for name in _COLUMN_NAMES]}
+        with open(path, "wb") as f:
+            f.write(json.dumps(header).encode("utf8") + b"\n")
+            for name in _COLUMN_NAMES:
+                getattr(self, "_" + name).tofile(f)
+
+    @staticmethod
+    def load(path: str, stories: list):
+        """
+        Loads token spans from a file for the given stories. Returns None if
+        the file is from a different version or the story text has changed
+        since it was saved.
+        """
+        with open(path, "rb") as f:
+            header = json.loads(f.readline().decode("utf8"))
+            if (header.get("version") != CORPUS_VERSION or
+                    header.get("signature") != get_stories_signature(stories)):
+                return None
+            corpus = TokenizedCorpus()
+            for name, length in header["columns"]:
+                column = array("I")
+                column.fromfile(f, length)
+                setattr(corpus, "_" + name, column)
+        for story in stories:
+            for chapter in story.chapters:
+                for paragraph in chapter.paragraphs:
+                    corpus.__paragraphs.append(paragraph.text)
+        if len(corpus.__paragraphs) != len(corpus._paragraph_sentence_start) - 1:
+            return None
+        return corpus
+
+    def __get_story_sentences(self, story_index) -> range:
+        """Returns the range of sentence indices within a story."""
+        if story_index is None:
+            return range(self.get_sentence_count())
+        paragraph_start = self._story_paragraph_start[story_index]
+        paragraph_end = self._story_paragraph_start[story_index + 1]
+        return range(self._paragraph_sentence_start[paragraph_start],
+                     self._paragraph_sentence_start[paragraph_end])
@@ -30,6 +30,16 @@ class Story:
         self.title = AccentedText(title)
         self.url = ""
         self.chapters = []
+        self.__corpus = None
+        self.__corpus_index = None
+
+    def set_corpus(self, corpus, story_index: int):
+        """
+        Sets the tokenized corpus which contains this story's sentence and
+        word spans, used to iterate them without re-splitting the text.
+        """
+        self.__corpus = corpus
+        self.__corpus_index = story_index
 
     def serialize(self):
         return {"title": repr(self.title),
@@ -44,8 +54,12 @@ class Story:
             chapter = Chapter()
             chapter.deserialize(chapter_state)
             self.chapters.append(chapter)
+        self.set_corpus(None, None)
 
     def iter_sentences(self):
+        if self.__corpus is not None:
+            yield from self.__corpus.iter_sentences(self.__corpus_index)
+            return
         for chapter in self.chapters:
             for paragraph in chapter.paragraphs:
                 paragraph = paragraph.text
@@ -53,6 +67,9 @@ class Story:
                     yield sentence
 
     def iter_words(self):
+        if self.__corpus is not None:
+            yield from self.__corpus.iter_words(self.__corpus_index)
+            return
         for sentence in self.iter_sentences():
             for word, _ in split_words(sentence):
                 yield word
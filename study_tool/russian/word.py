@@ -1,4 +1,6 @@
+import functools
 import re
+import sys
 from enum import IntEnum
 from study_tool.russian.types import *
 
@@ -22,30 +24,47 @@ RUSSIAN_LETTERS_STRING = "абвгдеёжзийклмнопрстуфхцчшщ
 
 SPLIT_WORD_REGEX = re.compile("[{}]+".format(RUSSIAN_LETTERS_STRING))
 RUSSIAN_LETTERS_REGEX = re.compile("[{}]".format(RUSSIAN_LETTERS_STRING))
+ACCENT_CHARS_REGEX = re.compile("[{}]".format(re.escape(ACCENT_CHARS)))
+ACCENT_CHARS_TRANSLATION = str.maketrans("", "", ACCENT_CHARS)
+NORMALIZED_TEXT_CACHE_SIZE = 65536
+
+
+@functools.lru_cache(maxsize=NORMALIZED_TEXT_CACHE_SIZE)
+def normalize_accented_text(raw: str) -> tuple:
+    """
+    Returns a tuple of (text, accents, lowercase text, ё-folded lowercase
+    text) for a string with accent marks, where accents are the indices of
+    the accented characters in the text. Results are memoized and the
+    lowercase forms are interned, so repeated calls return the same string
+    objects.
+    """
+    if ACCENT_CHARS_REGEX.search(raw) is None:
+        text = raw
+        accents = ()
+    else:
+        text = raw.translate(ACCENT_CHARS_TRANSLATION)
+        accents = []
+        for count, match in enumerate(ACCENT_CHARS_REGEX.finditer(raw)):
+            length = match.start() - count
+            if length > 0:
+                accents.append(length - 1)
+        accents = tuple(accents)
+    lowercase = sys.intern(text.lower())
+    return (text, accents, lowercase, sys.intern(lowercase.replace("ё", "е")))
 
 
 class AccentedText:
+    __slots__ = ("text", "accents")
+
     def __init__(self, text="", accents=None):
         if isinstance(text, AccentedText):
             self.text = text.text
-            self.accents = tuple(text.accents)
+            self.accents = text.accents
+        elif accents is None:
+            self.text, self.accents = normalize_accented_text(text)[:2]
         else:
-            text = text
-            length = 0
-            if accents is None:
-                self.accents = ()
-                self.text = ""
-                for index, c in enumerate(text):
-                    x = ord(c)
-                    if c in ACCENT_CHARS:
-                        if length > 0:
-                            self.accents += (length - 1,)
-                    else:
-                        self.text += c
-                        length += 1
-            else:
-                self.text = text
-                self.accents = tuple(accents)
+            self.text = text
+            self.accents = tuple(accents)
 
     @property
     def raw(self):
@@ -87,10 +106,49 @@ class AccentedText:
         return result
 
     def __eq__(self, other):
-        return self.text == AccentedText(other).text
+        return self.text == get_unaccented_text(other)
 
     def __ne__(self, other):
-        return self.text != AccentedText(other).text
+        return self.text != get_unaccented_text(other)
+
+
+def get_normalized_forms(text) -> tuple:
+    """
+    Returns the normalized forms of a string or accented text, as
+    returned by normalize_accented_text().
+    """
+    if not isinstance(text, AccentedText):
+        return normalize_accented_text(text)
+    normalized = normalize_accented_text(text.text)
+    if len(normalized[0]) != len(text.text):
+        # The text was given explicit accents and has accent characters
+        lowercase = text.text.lower()
+        return (text.text, text.accents, lowercase,
+                lowercase.replace("ё", "е"))
+    return normalized
+
+
+def get_unaccented_text(text) -> str:
+    """Returns the text of a string or accented text without accent marks."""
+    if isinstance(text, AccentedText):
+        return text.text
+    return normalize_accented_text(text)[0]
+
+
+def get_lowercase_text(text) -> str:
+    """
+    Returns the lowercase text of a string or accented text without accent
+    marks, as used in card keys.
+    """
+    return get_normalized_forms(text)[2]
+
+
+def get_folded_text(text) -> str:
+    """
+    Returns the lowercase text of a string or accented text without accent
+    marks and with ё replaced by е, as used in word keys.
+    """
+    return get_normalized_forms(text)[3]
 
 
 def has_russian_letters(text: AccentedText) -> bool:
@@ -108,10 +166,7 @@ def split_words(text: str):
 
 
 def get_word_text(word):
-    word = word.lower()
-    for c in ACCENT_CHARS:
-        word = word.replace(c, "")
-    return word
+    return get_lowercase_text(word)
 
 
 def get_stress_index(word):
@@ -220,10 +275,11 @@ class WordPatternToken:
         self.__regex = None
         self.__pattern = None
         self.__word_name = None
-        if word:
-            self.__word_name = word.lower()
         self.__word = None
         self.__forms = []
+        if word:
+            self.set_regex(word)
+            self.__word_name = word.lower()
 
     def match(self, word: str):
         word = word.lower().replace("ё", "е")
@@ -231,6 +287,18 @@ class WordPatternToken:
             return word in self.__forms
         return self.__regex.match(word)
 
+    def get_forms(self) -> list:
+        """
+        Returns the list of lowercase, ё-folded word forms matched by this
+        token, or None if it matches a regex pattern that is not a literal
+        word.
+        """
+        if self.__word:
+            return self.__forms
+        if SPLIT_WORD_REGEX.fullmatch(self.__pattern):
+            return [self.__pattern.lower().replace("ё", "е")]
+        return None
+
     def set_word(self, word: Word):
         self.__word = word
         self.__word_name = self.__word.get_name().text
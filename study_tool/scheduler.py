@@ -10,6 +10,7 @@ from cmg.application import *
 from study_tool.card import *
 from study_tool.card_set import *
 from study_tool.config import Config
+from study_tool.study_database import ReviewDueIndex
 
 
 def choose(cards):
@@ -50,30 +51,224 @@ def choose_weighted_by_age(values, rep):
                                key=lambda x: max(1, (rep - x.rep) * (rep - x.rep)))
 
 
+class SchedulingMode(IntEnum):
+    """
+    Ways of choosing which cards to show.
+    """
+    Session = 0  # Repeat cards within the session based on proficiency
+    Review = 1  # Show cards due for spaced repetition review, then new cards
+
+
 class SchedulerParams:
-    def __init__(self, max_repetitions=0):
+    def __init__(self, max_repetitions=0, mode=SchedulingMode.Session):
         """
         :param max_repetitions: Max number of times a card can be shown, 0 for infinite.
+        :param mode: The SchedulingMode to choose cards with.
         """
         self.max_repetitions = max_repetitions
+        self.mode = mode
+
+
+class RandomAccessSet:
+    """
+    Set of items supporting constant-time add, remove and random choice.
+    """
+
+    def __init__(self, items=()):
+        self.__items = []
+        self.__indices = {}
+        for item in items:
+            self.add(item)
+
+    def __len__(self):
+        return len(self.__items)
+
+    def __iter__(self):
+        return iter(self.__items)
+
+    def __contains__(self, item):
+        return item in self.__indices
+
+    def add(self, item):
+        if item not in self.__indices:
+            self.__indices[item] = len(self.__items)
+            self.__items.append(item)
+
+    def remove(self, item):
+        index = self.__indices.pop(item)
+        last = self.__items.pop()
+        if last is not item:
+            self.__items[index] = last
+            self.__indices[last] = index
+
+    def choose(self):
+        return choose(self.__items)
+
+
+class RepetitionTree:
+    """
+    Fenwick tree of cards keyed on the rep at which they were last shown.
+
+    Each node stores the count, sum of reps and sum of squared reps of the
+    cards below it. For a given current rep, a card's age weight
+    (rep - card.rep)^2 expands to a combination of those three sums, so the
+    total weight of all cards shown at or before some rep, and a weighted
+    random choice among them, can be computed in O(log n).
+    """
+
+    def __init__(self, size=64):
+        self.__size = size
+        self.__counts = [0] * (size + 1)
+        self.__rep_sums = [0] * (size + 1)
+        self.__rep_square_sums = [0] * (size + 1)
+        self.__rep_cards = {}
+
+    def add(self, card):
+        """Adds a card, keyed on its rep."""
+        while card.rep >= self.__size:
+            self.__grow()
+        self.__rep_cards.setdefault(card.rep, []).append(card)
+        self.__update(card.rep, 1)
+
+    def remove(self, card):
+        """Removes a card, which must still have the rep it was added with."""
+        cards = self.__rep_cards[card.rep]
+        cards.remove(card)
+        if not cards:
+            del self.__rep_cards[card.rep]
+        self.__update(card.rep, -1)
+
+    def count(self, max_rep: int) -> int:
+        """Returns the number of cards shown at or before a rep."""
+        return self.__prefix_sums(max_rep)[0]
+
+    def get_total_weight(self, rep: int, max_rep: int) -> int:
+        """
+        Returns the total age weight, max(1, (rep - card.rep)^2), of the
+        cards shown at or before max_rep.
+        """
+        count, rep_sum, rep_square_sum = self.__prefix_sums(min(max_rep, rep - 1))
+        total = (rep * rep * count) - (2 * rep * rep_sum) + rep_square_sum
+        if max_rep >= rep:
+            total += len(self.__rep_cards.get(rep, ()))
+        return total
+
+    def choose_weighted(self, rep: int, max_rep: int):
+        """
+        Chooses a random card shown at or before max_rep, weighted by age
+        just like choose_weighted_by_age().
+        """
+        total = self.get_total_weight(rep, max_rep)
+        if total <= 0:
+            return None
+        return self.find_weighted(rep, max_rep, random.randint(0, total - 1))
+
+    def find_weighted(self, rep: int, max_rep: int, target: int):
+        """
+        Returns the card at a position in [0, total weight) of the cards
+        shown at or before max_rep, ordered by rep.
+        """
+        total = self.get_total_weight(rep, rep - 1)
+        if target >= total:
+            # Cards shown at the current rep have a minimum weight of one
+            cards = self.__rep_cards[rep]
+            return cards[target - total]
+
+        # Descend the tree to find the first rep whose cumulative weight
+        # exceeds the target
+        position = 0
+        count, rep_sum, rep_square_sum = 0, 0, 0
+        step = 1 << (self.__size.bit_length() - 1)
+        while step > 0:
+            next_position = position + step
+            if next_position <= self.__size:
+                next_count = count + self.__counts[next_position]
+                next_rep_sum = rep_sum + self.__rep_sums[next_position]
+                next_rep_square_sum = (rep_square_sum +
+                                       self.__rep_square_sums[next_position])
+                weight = ((rep * rep * next_count) - (2 * rep * next_rep_sum) +
+                          next_rep_square_sum)
+                if weight <= target:
+                    position = next_position
+                    count = next_count
+                    rep_sum = next_rep_sum
+                    rep_square_sum = next_rep_square_sum
+            step >>= 1
+
+        # All cards shown at the found rep have the same weight
+        card_rep = position
+        weight = (rep - card_rep) * (rep - card_rep)
+        total_before = (rep * rep * count) - (2 * rep * rep_sum) + rep_square_sum
+        return self.__rep_cards[card_rep][(target - total_before) // weight]
+
+    def __prefix_sums(self, max_rep: int) -> tuple:
+        count, rep_sum, rep_square_sum = 0, 0, 0
+        index = min(max_rep + 1, self.__size)
+        while index > 0:
+            count += self.__counts[index]
+            rep_sum += self.__rep_sums[index]
+            rep_square_sum += self.__rep_square_sums[index]
+            index -= index & -index
+        return (count, rep_sum, rep_square_sum)
+
+    def __update(self, rep: int, sign: int):
+        index = rep + 1
+        while index <= self.__size:
+            self.__counts[index] += sign
+            self.__rep_sums[index] += sign * rep
+            self.__rep_square_sums[index] += sign * rep * rep
+            index += index & -index
+
+    def __grow(self):
+        cards = [card for cards in self.__rep_cards.values() for card in cards]
+        self.__init__(size=self.__size * 2)
+        for card in cards:
+            self.add(card)
 
 
 class ProficiencySet:
     def __init__(self, level, cards=()):
-        self.cards = set(cards)
+        self.cards = RandomAccessSet()
         self.rep = None
         self.level = level
+        self.__unshown_cards = RandomAccessSet()
+        self.__shown_cards = RepetitionTree()
+        for card in cards:
+            self.add(card)
 
     def remove(self, card):
         assert card in self.cards
         self.cards.remove(card)
+        if card.rep is None:
+            self.__unshown_cards.remove(card)
+        else:
+            self.__shown_cards.remove(card)
 
     def add(self, card):
+        if card in self.cards:
+            return
         self.cards.add(card)
+        if card.rep is None:
+            self.__unshown_cards.add(card)
+        else:
+            self.__shown_cards.add(card)
 
-    def available_cards(self, rep, age):
-        return [c for c in self.cards
-                if c.rep is None or rep - c.rep >= age]
+    def has_available_cards(self, rep, age) -> bool:
+        """
+        Returns True if any card is unshown or was last shown at least age
+        repetitions ago.
+        """
+        return (len(self.__unshown_cards) > 0 or
+                self.__shown_cards.count(rep - age) > 0)
+
+    def choose_available_card(self, rep, age):
+        """
+        Chooses one of the available cards in O(log n). Unshown cards are
+        chosen first, otherwise shown cards are weighted by their age.
+        """
+        if len(self.__unshown_cards) > 0:
+            return self.__unshown_cards.choose()
+        return self.__shown_cards.choose_weighted(rep, rep - age)
 
 
 class CardSchedulingInfo:
@@ -118,6 +313,13 @@ class Scheduler:
         for card in self.__cards:
             self.__sets[card.study_data.get_proficiency_level()].add(card)
 
+        # Index the due times of only this scheduler's cards for review
+        self.__review_due_index = None
+        if self.__params.mode == SchedulingMode.Review:
+            self.__review_due_index = ReviewDueIndex()
+            self.__review_due_index.rebuild(
+                (info.card, info.study_data) for info in self.__cards)
+
         self.__rep = 0
 
     def reset(self):
@@ -126,6 +328,9 @@ class Scheduler:
             self.__sets[level] = ProficiencySet(level=level, cards=[])
         for card in self.__cards:
             self.__sets[card.study_data.get_proficiency_level()].add(card)
+        if self.__review_due_index is not None:
+            self.__review_due_index.rebuild(
+                (info.card, info.study_data) for info in self.__cards)
         self.__rep = 0
 
     def mark(self, card: Card, knew_it: bool):
@@ -133,18 +338,25 @@ class Scheduler:
         info = self.__card_info_dict[card]
         self.__sets[info.study_data.get_proficiency_level()].remove(info)
         self.__study_database.mark_card(card, knew_it)
-        self.__sets[info.study_data.get_proficiency_level()].add(info)
         info.rep = self.__rep
         info.shown_count += 1
+        self.__sets[info.study_data.get_proficiency_level()].add(info)
 
         # Check if we have shown this card too many times
         if (self.__params.max_repetitions > 0 and
                 info.shown_count >= self.__params.max_repetitions):
             self.__sets[info.study_data.get_proficiency_level()].remove(info)
+            if self.__review_due_index is not None:
+                self.__review_due_index.remove_card(card)
+        elif self.__review_due_index is not None:
+            self.__review_due_index.update_card(card, info.study_data)
 
     def next(self) -> Card:
         """Get the next scheduled card."""
-        info = self.__get_next_card()
+        if self.__params.mode == SchedulingMode.Review:
+            info = self.__get_next_review_card()
+        else:
+            info = self.__get_next_card()
         self.__rep += 1
         return info.card if info else None
 
@@ -159,20 +371,16 @@ class Scheduler:
                 return card
 
         for min_interval in range(self.min_repeat_interval, -1, -1):
-            available_sets = {}
-            for proficiency_set in self.__sets.values():
-                if proficiency_set.level != 0:
-                    cards = proficiency_set.available_cards(
-                        self.__rep, min_interval)
-                    if len(cards) > 0:
-                        available_sets[proficiency_set] = cards
+            available_sets = [
+                proficiency_set for proficiency_set in self.__sets.values()
+                if proficiency_set.level != 0 and
+                proficiency_set.has_available_cards(self.__rep, min_interval)]
 
             if len(available_sets) > 0:
                 next_set = choose_weighted_by_age(
-                    list(available_sets.keys()), rep=self.__rep)
-                card = choose_weighted_by_age(
-                    available_sets[next_set], rep=self.__rep)
-                return card
+                    available_sets, rep=self.__rep)
+                return next_set.choose_available_card(
+                    self.__rep, min_interval)
 
             card = self.__get_new_card()
             if card is not None:
@@ -180,8 +388,18 @@ class Scheduler:
 
         return None
 
+    def __get_next_review_card(self) -> CardSchedulingInfo:
+        """
+        Get the most overdue CardSchedulingInfo, or a new one if no cards are
+        due for review.
+        """
+        cards = self.__review_due_index.get_due_cards(time.time(), count=1)
+        if cards:
+            return self.__card_info_dict[cards[0]]
+        return self.__get_new_card()
+
     def __get_new_card(self) -> CardSchedulingInfo:
         """Returns the next scheduled 'new' CardSchedulingInfo."""
         if not self.__sets[0].cards:
             return None
-        return choose(self.__sets[0].cards)
+        return self.__sets[0].cards.choose()
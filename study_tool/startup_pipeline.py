@@ -0,0 +1,109 @@
+import time
+
+
+class StartupStage:
+    """A named step of the startup pipeline and its timings."""
+
+    def __init__(self, name: str, function, depends_on=()):
+        self.name = name
+        self.function = function
+        self.depends_on = tuple(depends_on)
+        self.start_time = None
+        self.end_time = None
+
+    def get_duration(self) -> float:
+        """Returns the seconds the stage took to run."""
+        if self.start_time is None or self.end_time is None:
+            return 0.0
+        return self.end_time - self.start_time
+
+    def run(self):
+        self.start_time = time.perf_counter()
+        try:
+            self.function()
+        finally:
+            self.end_time = time.perf_counter()
+
+
+class StartupPipeline:
+    """
+    Runs startup stages one after another on the calling thread and times
+    them. Stages run in the order they were added, except that a stage
+    always runs after the stages it depends on. If a stage raises an
+    exception, no further stages are run and the exception is raised from
+    run().
+    """
+
+    def __init__(self):
+        self.__stages = {}
+        self.__start_time = None
+        self.__end_time = None
+
+    def add_stage(self, name: str, function, depends_on=()) -> StartupStage:
+        assert name not in self.__stages
+        stage = StartupStage(name, function, depends_on=depends_on)
+        self.__stages[name] = stage
+        return stage
+
+    def get_stage(self, name: str) -> StartupStage:
+        return self.__stages[name]
+
+    def get_stages(self) -> list:
+        return list(self.__stages.values())
+
+    def get_duration(self) -> float:
+        """Returns the seconds from the start to the end of run()."""
+        if self.__start_time is None or self.__end_time is None:
+            return 0.0
+        return self.__end_time - self.__start_time
+
+    def run(self):
+        """Runs all stages, returning once they have all finished."""
+        order = self.__get_stage_order()
+        self.__start_time = time.perf_counter()
+        try:
+            for stage in order:
+                stage.run()
+        finally:
+            self.__end_time = time.perf_counter()
+
+    def get_report(self) -> str:
+        """Returns a table of the stage timings, in the order they started."""
+        stages = sorted((stage for stage in self.__stages.values()
+                         if stage.start_time is not None),
+                        key=lambda stage: stage.start_time)
+        lines = ["Startup took {:.2f}s:".format(self.get_duration())]
+        for stage in stages:
+            lines.append("  {:<24} {:>7.2f}s  (started at {:.2f}s)".format(
+                stage.name, stage.get_duration(),
+                stage.start_time - self.__start_time))
+        return "\n".join(lines)
+
+    def __get_stage_order(self) -> list:
+        """
+        Returns the stages in the order to run them. Raises an exception for
+        unknown or circular dependencies.
+        """
+        order = []
+        visited = set()
+        visiting = set()
+
+        def visit(name, path):
+            if name not in self.__stages:
+                raise KeyError("Unknown startup stage {!r} required by {!r}"
+                               .format(name, path[-1]))
+            if name in visited:
+                return
+            if name in visiting:
+                raise Exception("Circular startup stage dependency: " +
+                                " -> ".join(path + [name]))
+            visiting.add(name)
+            for dependency in self.__stages[name].depends_on:
+                visit(dependency, path + [name])
+            visiting.remove(name)
+            visited.add(name)
+            order.append(self.__stages[name])
+
+        for name in self.__stages:
+            visit(name, [])
+        return order
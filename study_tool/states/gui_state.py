@@ -170,11 +170,11 @@ class GUIState(State):
         if self.__widget:
             margin = 2
             screen_width, screen_height = self.app.screen.get_size()
-            self.__widget.rect.top = self.margin_top + margin
-            self.__widget.rect.left = margin
-            self.__widget.rect.width = screen_width - (margin * 2)
-            self.__widget.rect.height = (screen_height - self.margin_top -
-                                         self.margin_bottom - (margin * 2))
+            self.__widget.set_rect(pygame.Rect(
+                margin, self.margin_top + margin,
+                screen_width - (margin * 2),
+                screen_height - self.margin_top -
+                self.margin_bottom - (margin * 2)))
             self.__widget.main_update()
             if not self.__widget.is_visible():
                 self.app.pop_state()
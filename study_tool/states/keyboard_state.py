@@ -62,6 +62,10 @@ class KeyboardState(State):
         # else:
         #  self.text += c
 
+    def is_active(self) -> bool:
+        # The dwell timer clicks keys while the cursor is still
+        return True
+
     def update(self, dt):
         move = (self.app.inputs[0].get_amount(),
                 self.app.inputs[2].get_amount())
@@ -21,6 +21,7 @@ from study_tool.states.state import *
 from study_tool.states.study_state import StudyParams
 from study_tool.states.sub_menu_state import SubMenuState
 from study_tool.scheduler import SchedulerParams
+from study_tool.scheduler import SchedulingMode
 from study_tool.entities.study_proficiency_bar import StudyProficiencyBar
 from study_tool.gui.query_widget import QueryWidget
 from study_tool.gui.create_card_set_widget import CreateCardSetWidget
@@ -189,6 +190,9 @@ class MenuState(State):
         self.app.push_state(ReadTextState())
 
     def __open_set(self, card_set):
+        # Start loading the data needed to study while the user picks a mode
+        self.app.example_database.prefetch()
+        self.app.wiktionary.prefetch()
         sub_menu = SubMenuState(card_set.name)
         options = []
         sub_menu.add_option(
@@ -219,6 +223,12 @@ class MenuState(State):
                 card_query=CardQuery(max_proficiency=0),
                 study_params=StudyParams(random_side=True),
                 scheduler_params=SchedulerParams(max_repetitions=1)))
+        sub_menu.add_option(
+            "Review Due Cards",
+            lambda: self.app.push_study_state(
+                card_set=card_set,
+                study_params=StudyParams(random_side=True),
+                scheduler_params=SchedulerParams(mode=SchedulingMode.Review)))
         sub_menu.add_option(
             "Quiz Problem Cards",
             lambda: self.app.push_study_state(
@@ -287,8 +297,13 @@ class MenuState(State):
 
     def __on_card_added_or_removed_to_set(self, card: Card, card_set: CardSet):
         """Called when a card is added to a card set."""
+        groups = [card_set]
+        package = card_set.get_package()
+        while package is not None:
+            groups.append(package)
+            package = package.get_parent()
         for bar in self.__bars:
-            if bar.study_set == card_set:
+            if bar.study_set in groups:
                 with self.__lock_dirty:
                     self.__dirty_metrics_set.add(bar)
 
@@ -71,6 +71,13 @@ class State:
     def process_input(self):
         pass
 
+    def is_active(self) -> bool:
+        """
+        Returns True if the state needs to be updated and drawn every frame,
+        even when there is no input.
+        """
+        return any(button.is_down for button in self.buttons)
+
     def update(self, dt: float):
         """Called when the state is updated."""
         self.entity_manager.update(dt)
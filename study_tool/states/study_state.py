@@ -222,10 +222,7 @@ class StudyState(State):
             pos=cmg.Vec2(screen_center_x, self.margin_top + 32 + 16))
         
         # Card Set list
-        card_sets = []
-        for card_set in Config.app.card_database.iter_card_sets():
-            if card_set.has_card(self.card):
-                card_sets.append(card_set)
+        card_sets = Config.app.card_database.get_card_sets_for_card(self.card)
         x = screen_width - 16 - 400
         y = screen_height - self.margin_bottom - 16 - self.__line_spacing
         self.__table_card_sets = ConjugationTable(
@@ -442,9 +439,10 @@ class StudyState(State):
 
         self.next_card()
 
-        # Save study data in the background
+        # Save study data in the background. The marking itself is already
+        # journaled, so this only writes if the journal needs compacting.
         import threading
-        thread = threading.Thread(target=self.app.save_study_data)
+        thread = threading.Thread(target=self.app.study_database.save_all_changes)
         thread.start()
 
     def __get_random_russian_form(self, card: Card, word: Word):
@@ -653,10 +651,7 @@ class StudyState(State):
                 x += box.get_width() + attr_spacing
                 
         # Card Set list
-        card_sets = []
-        for card_set in Config.app.card_database.iter_card_sets():
-            if card_set.has_card(self.card):
-                card_sets.append(card_set)
+        card_sets = Config.app.card_database.get_card_sets_for_card(self.card)
         self.__table_card_sets.set_row_count(1 + len(card_sets))
         for index, card_set in enumerate(card_sets):
             self.__table_card_sets.set_text(index + 1, 0, card_set.get_name())
@@ -790,13 +785,13 @@ class StudyState(State):
 
         # Draw recent history (left)
         max_history_display_count = 10
-        history_display_count = min(max_history_display_count,
-                                    len(self.__study_data.get_history_list()))
+        history = self.__study_data.get_history_list()
+        history_display_count = min(max_history_display_count, len(history))
         history_box_size = 20
         padding = (self.proficiency_margin_height - history_box_size) // 2
         spacing = 3
         for index in range(0, history_display_count):
-            marked = not self.__study_data.get_history_list()[index]
+            marked = not history[index]
             t = index / (max_history_display_count * 1.2)
             c = cmg.mathlib.lerp(marked_overlay_color, bar_color, t)
             x = padding + ((history_display_count - index - 1) *
@@ -1,3 +1,5 @@
+import bisect
+import itertools
 import os
 import threading
 import time
@@ -8,11 +10,18 @@ from cmg.event import Event
 from cmg.utilities import ReadWriteLock
 from study_tool.card import Card
 from study_tool.card_attributes import CardAttributes
+from study_tool.card_set import CardSet
+from study_tool.card_set import CardSetPackage
 from study_tool.config import Config
 from study_tool.russian.types import WordType
 from study_tool.russian.types import parse_word_type
 
 
+def get_study_journal_path(study_data_path: str) -> str:
+    """Returns the path of the journal file that accompanies a study data file."""
+    return study_data_path + ".journal"
+
+
 def calc_history_score(history):
     """
     Calculate the history score given a list of pass/fail booleans.
@@ -97,11 +106,30 @@ class StudyMetrics:
                 
 
 class CardStudyData:
+    """
+    Study progress for a single card. There is one of these for every card,
+    so it uses slots, and the card's history of True or False markings is
+    packed into the bits of an int, with the most recent marking in the
+    lowest bit.
+    """
+
+    __slots__ = ("proficiency_level", "last_encounter_time",
+                 "__history_bits", "__history_length")
 
     def __init__(self):
         self.proficiency_level = 0  # 0 = new/unseen
-        self.history = []  # History of True or False markings
         self.last_encounter_time = None
+        self.__history_bits = 0
+        self.__history_length = 0
+
+    @property
+    def history(self) -> list:
+        """The list of True or False markings, most recent first."""
+        return self.get_history_list()
+
+    @history.setter
+    def history(self, history: list):
+        self.set_history(history)
 
     def is_encountered(self) -> bool:
         return self.last_encounter_time is not None
@@ -119,17 +147,68 @@ class CardStudyData:
 
     def get_history_list(self) -> list:
         """Get the card's history list."""
-        return self.history
+        bits = self.__history_bits
+        return [bool(bits >> index & 1)
+                for index in range(self.__history_length)]
+
+    def get_history_length(self) -> int:
+        return self.__history_length
+
+    def set_history(self, history: list):
+        """Sets the card's history list, most recent marking first."""
+        bits = 0
+        for index, known in enumerate(history):
+            if known:
+                bits |= 1 << index
+        self.__history_bits = bits
+        self.__history_length = len(history)
+
+    def add_history(self, known: bool, max_size: int):
+        """
+        Adds a marking to the front of the card's history, dropping the
+        oldest markings beyond the max size.
+        """
+        self.__history_length = min(self.__history_length + 1, max_size)
+        self.__history_bits = (((self.__history_bits << 1) | bool(known)) &
+                               ((1 << self.__history_length) - 1))
 
     def get_history_score(self) -> float:
         """Get the card's current history score."""
-        return calc_history_score(self.history)
+        return calc_history_score(self.get_history_list())
 
     def get_next_history_score(self, knew_it: bool) -> float:
         """Get the card's next history score, given whether it was known or not."""
-        history = [knew_it] + self.history
+        history = [knew_it] + self.get_history_list()
         return calc_history_score(history[:Config.max_card_history_size])
     
+    def get_review_interval(self) -> float:
+        """
+        Get the time in seconds after the card's last encounter until it is
+        due for review. Like SM-2, the interval grows by an ease factor for
+        each consecutive time the card was known, where more proficient
+        cards have a higher ease.
+        """
+        # Count the trailing one bits
+        bits = self.__history_bits
+        streak = (bits ^ (bits + 1)).bit_length() - 1
+        if streak == 0:
+            return Config.review_relearn_interval
+        initial_intervals = Config.review_initial_intervals
+        if streak <= len(initial_intervals):
+            return initial_intervals[streak - 1]
+        ease = Config.review_min_ease + self.get_proficiency_score() * (
+            Config.review_max_ease - Config.review_min_ease)
+        return initial_intervals[-1] * (ease ** (streak - len(initial_intervals)))
+
+    def get_due_time(self) -> float:
+        """
+        Get the timestamp at which the card is due for review, or None if
+        it has never been encountered.
+        """
+        if self.last_encounter_time is None:
+            return None
+        return self.last_encounter_time + self.get_review_interval()
+
     def elapsed_time_string(self) -> str:
         """
         Get the string representing the time since the last encouder.
@@ -152,7 +231,8 @@ class CardStudyData:
 
     def serialize(self):
         """Serialize the study data."""
-        history_str = "".join("T" if h else "F" for h in self.history)
+        history_str = "".join("T" if h else "F"
+                              for h in self.get_history_list())
         return [self.proficiency_level, self.last_encounter_time, history_str]
 
     def deserialize(self, state):
@@ -160,7 +240,176 @@ class CardStudyData:
         self.proficiency_level = state[0]
         self.last_encounter_time = state[1]
         history_str = state[2]
-        self.history = [c == "T" for c in history_str]
+        self.set_history([c == "T" for c in history_str])
+
+
+class ReviewDueIndex:
+    """
+    Index of encountered cards sorted by the time they are due for review.
+
+    Entries are kept in a sorted list which is searched with bisect, so the
+    cards due before some time are found without checking every card.
+    """
+
+    def __init__(self):
+        self.__entries = []
+        self.__entry_cards = {}
+        self.__card_entries = {}
+        self.__serials = itertools.count()
+
+    def __len__(self):
+        return len(self.__entries)
+
+    def get_due_time(self, card: Card) -> float:
+        """Returns the due time of a card, or None if it is not indexed."""
+        entry = self.__card_entries.get(card, None)
+        return entry[0] if entry is not None else None
+
+    def rebuild(self, study_data_items):
+        """Rebuilds the index from (card, study data) pairs."""
+        self.__init__()
+        for card, study_data in study_data_items:
+            due_time = study_data.get_due_time()
+            if due_time is not None:
+                entry = (due_time, next(self.__serials))
+                self.__entries.append(entry)
+                self.__entry_cards[entry] = card
+                self.__card_entries[card] = entry
+        self.__entries.sort()
+
+    def update_card(self, card: Card, study_data: CardStudyData):
+        """Re-indexes a card after its study data changed."""
+        self.remove_card(card)
+        due_time = study_data.get_due_time()
+        if due_time is not None:
+            entry = (due_time, next(self.__serials))
+            bisect.insort(self.__entries, entry)
+            self.__entry_cards[entry] = card
+            self.__card_entries[card] = entry
+
+    def remove_card(self, card: Card):
+        """Removes a card from the index."""
+        entry = self.__card_entries.pop(card, None)
+        if entry is not None:
+            del self.__entries[bisect.bisect_left(self.__entries, entry)]
+            del self.__entry_cards[entry]
+
+    def get_due_count(self, time: float) -> int:
+        """Returns the number of cards due at or before a time."""
+        return bisect.bisect_right(self.__entries, (time, float("inf")))
+
+    def get_due_cards(self, time: float, count=None) -> list:
+        """
+        Returns the cards due at or before a time, most overdue first.
+
+        :param count: Maximum number of cards to return, or None for all.
+        """
+        end = self.get_due_count(time)
+        if count is not None:
+            end = min(end, count)
+        return [self.__entry_cards[entry] for entry in self.__entries[:end]]
+
+
+class GroupMetricsIndex:
+    """
+    Incrementally maintained study metrics of card sets and packages.
+
+    The metrics of a group are computed the first time they are requested,
+    then kept up to date as cards are marked or added to and removed from
+    card sets. Each update only touches the card sets containing the card
+    and their ancestor packages.
+    """
+
+    def __init__(self, study_database, card_database):
+        self.__study_database = study_database
+        self.__card_database = card_database
+        self.__lock = threading.RLock()
+        self.__group_metrics = {}
+        self.__group_cards = {}
+        self.__card_scores = {}
+
+    def clear(self):
+        """Discards all computed metrics."""
+        with self.__lock:
+            self.__group_metrics = {}
+            self.__group_cards = {}
+            self.__card_scores = {}
+
+    def get_metrics(self, group) -> CardGroupMetrics:
+        """Returns the live metrics of a card set or package."""
+        with self.__lock:
+            metrics = self.__group_metrics.get(group, None)
+            if metrics is None:
+                metrics = CardGroupMetrics()
+                cards = set(group.get_cards())
+                for card in cards:
+                    self.__add_card_score(metrics, card, 1)
+                self.__group_metrics[group] = metrics
+                self.__group_cards[group] = cards
+            return metrics
+
+    def on_card_study_data_changed(self, card: Card, study_data):
+        """Moves a card between histogram bins after it is marked."""
+        with self.__lock:
+            old_score = self.__card_scores.pop(card, None)
+            if old_score is None:
+                return
+            new_score = self.__get_card_score(card)
+            for group in self.__get_containing_groups(card):
+                if card in self.__group_cards.get(group, ()):
+                    metrics = self.__group_metrics[group]
+                    metrics.proficiency_counts[old_score[0]] -= 1
+                    metrics.proficiency_counts[new_score[0]] += 1
+                    metrics.history_score += new_score[1] - old_score[1]
+
+    def on_card_set_changed(self, card: Card, card_set: CardSet):
+        """
+        Updates a card set and its packages after a card is added to or
+        removed from it.
+        """
+        with self.__lock:
+            containing_groups = self.__get_containing_groups(card)
+            group = card_set
+            while group is not None:
+                cards = self.__group_cards.get(group, None)
+                if cards is not None:
+                    is_in_group = group in containing_groups
+                    if is_in_group and card not in cards:
+                        cards.add(card)
+                        self.__add_card_score(self.__group_metrics[group], card, 1)
+                    elif not is_in_group and card in cards:
+                        cards.remove(card)
+                        self.__add_card_score(self.__group_metrics[group], card, -1)
+                group = group.get_package() if group is card_set else group.get_parent()
+
+    def __get_containing_groups(self, card: Card) -> set:
+        """Returns the set of card sets and packages which contain a card."""
+        groups = set()
+        for card_set in self.__card_database.get_card_sets_for_card(card):
+            groups.add(card_set)
+            package = card_set.get_package()
+            while package is not None and package not in groups:
+                groups.add(package)
+                package = package.get_parent()
+        return groups
+
+    def __get_card_score(self, card: Card) -> tuple:
+        """
+        Returns the (proficiency level, history score) which a card is
+        currently counted with in the metrics.
+        """
+        score = self.__card_scores.get(card, None)
+        if score is None:
+            study_data = self.__study_database.get_card_study_data(card)
+            score = (study_data.get_proficiency_level(),
+                     study_data.get_history_score())
+            self.__card_scores[card] = score
+        return score
+
+    def __add_card_score(self, metrics: CardGroupMetrics, card: Card, sign: int):
+        level, history_score = self.__get_card_score(card)
+        metrics.proficiency_counts[level] += sign
+        metrics.history_score += sign * history_score
 
 
 class StudyDatabase:
@@ -184,11 +433,30 @@ class StudyDatabase:
         self.__lock_dirty = threading.RLock()
         self.__dirty = False
 
+        # Journal of card markings made since the last save
+        self.__journal_file = None
+        self.__journal_record_count = 0
+        self.__journal_size = 0  # Bytes up to the end of the last record
+        self.__journal_has_bad_records = False
+
+        # Metrics of card sets and packages
+        self.__group_metrics_index = GroupMetricsIndex(self, card_database)
+
+        # Review due times, built when first queried
+        self.__review_due_index = None
+
         # Events
         self.card_study_data_changed = Event(Card, CardStudyData)
 
         # Connect
         self.__card_database.card_key_changed.connect(self.__on_card_key_changed)
+        self.__card_database.card_deleted.connect(self.__on_card_deleted)
+        self.__card_database.card_added_to_set.connect(
+            self.__group_metrics_index.on_card_set_changed)
+        self.__card_database.card_removed_from_set.connect(
+            self.__group_metrics_index.on_card_set_changed)
+        self.card_study_data_changed.connect(
+            self.__group_metrics_index.on_card_study_data_changed)
 
     def is_saving(self) -> bool:
         """Returns True if currently saving the database."""
@@ -219,37 +487,70 @@ class StudyDatabase:
                 metrics.all_metrics.history_score += history_score
         return metrics
 
-    def get_group_study_metrics(self, study_set):
+    def get_group_study_metrics(self, study_set) -> CardGroupMetrics:
+        """
+        Get study metrics for a group of cards. Metrics of card sets and
+        packages are maintained incrementally, so this is a lookup.
+        """
         metrics = CardGroupMetrics()
+        if isinstance(study_set, (CardSet, CardSetPackage)):
+            metrics.copy(self.__group_metrics_index.get_metrics(study_set))
+            return metrics
         for card in study_set.cards:
             study_data = self.get_card_study_data(card)
             metrics.history_score += study_data.get_history_score()
             metrics.proficiency_counts[study_data.get_proficiency_level()] += 1
         return metrics
 
+    def get_card_due_time(self, card: Card) -> float:
+        """
+        Get the timestamp at which a card is due for review, or None if it
+        has never been encountered.
+        """
+        with self.__lock.acquire_read():
+            return self.__get_review_due_index().get_due_time(card)
+
+    def get_due_card_count(self, now=None) -> int:
+        """Get the number of cards due for review."""
+        if now is None:
+            now = time.time()
+        with self.__lock.acquire_read():
+            return self.__get_review_due_index().get_due_count(now)
+
+    def get_due_cards(self, now=None, count=None) -> list:
+        """
+        Get the cards which are due for review, most overdue first.
+
+        :param now: The time to check against, defaulting to the current time.
+        :param count: Maximum number of cards to return, or None for all.
+        """
+        if now is None:
+            now = time.time()
+        with self.__lock.acquire_read():
+            return self.__get_review_due_index().get_due_cards(
+                now, count=count)
+
     def mark_card(self, card: Card, knew_it: bool):
         """
         Mark a card as "knew it" or "didn't know it". This will adjust its
         proficiencly level accordingly.
+
+        The marking is appended to the journal file, so the full study data
+        only needs to be re-saved once enough markings have accumulated.
         """
         with self.__lock.acquire_write():
             study_data = self.get_card_study_data(card)
-            study_data.last_encounter_time = time.time()
-            study_data.history.insert(0, knew_it)
-            if len(study_data.history) > Config.max_card_history_size:
-                study_data.history = study_data.history[:Config.max_card_history_size]
-        
-            # Update proficiencly level
-            if study_data.proficiency_level == 0:
-                study_data.proficiency_level = 3 if knew_it else 1
-            elif knew_it:
-                study_data.proficiency_level = min(
-                    study_data.proficiency_level + 1, Config.proficiency_levels)
-            else:
-                study_data.proficiency_level = max(
-                    1, study_data.proficiency_level - 1)
+            timestamp = time.time()
+            self.__apply_mark(study_data, knew_it=knew_it, timestamp=timestamp)
+            if self.__review_due_index is not None:
+                self.__review_due_index.update_card(card, study_data)
+            if self.__journal_file is not None:
+                self.__append_journal_record(card, knew_it=knew_it,
+                                             timestamp=timestamp)
             with self.__lock_dirty:
-                self.__dirty = True
+                if (self.__journal_file is None or self.__journal_record_count >=
+                        Config.study_journal_max_records):
+                    self.__dirty = True
 
         self.card_study_data_changed.emit(card, study_data)
 
@@ -267,12 +568,39 @@ class StudyDatabase:
         with self.__lock.acquire_write():
             self.__metrics_history = {}
             self.__study_data_dict = {}
+            self.__review_due_index = None
+        self.__group_metrics_index.clear()
 
     def save_all_changes(self):
-        """Saves all modified data to file."""
+        """
+        Saves all modified data to file. Card markings which are already
+        stored in the journal are only compacted into the study data file
+        once the journal grows past Config.study_journal_max_records.
+        """
+        # Save without holding the dirty lock, which mark_card() takes while
+        # holding the database lock that save() needs
         with self.__lock_dirty:
-            if self.__dirty:
+            dirty = self.__dirty
+            self.__dirty = False
+        if dirty:
+            try:
                 self.save()
+            except Exception:
+                with self.__lock_dirty:
+                    self.__dirty = True
+                raise
+
+    def compact(self):
+        """
+        Saves the study data file if there are any unsaved changes or
+        journaled card markings, leaving the journal empty. Call this at
+        shutdown.
+        """
+        with self.__lock_dirty:
+            modified = (self.__dirty or self.__journal_record_count > 0 or
+                        self.__journal_has_bad_records)
+        if modified:
+            self.save()
     
     def save(self, path=None):
         """Save the study data to file."""
@@ -322,6 +650,9 @@ class StudyDatabase:
                 if os.path.isfile(path):
                     os.remove(path)
                 os.rename(temp_path, path)
+
+                # The journaled markings are now part of the saved data
+                self.__open_journal(path, truncate=True)
                 with self.__lock_dirty:
                     self.__dirty = False
             self.__is_saving = False
@@ -335,9 +666,132 @@ class StudyDatabase:
                 state = yaml.load(f, Loader=yaml.CLoader)
                 Config.logger.info("Deserializing study data from: " + path)
                 self.__deserialize(state, card_database)
+            self.__replay_journal(path)
+            self.__open_journal(path, truncate=False)
+            self.__review_due_index = None
             with self.__lock_dirty:
                 self.__dirty = False
+        self.__group_metrics_index.clear()
                 
+    def __get_review_due_index(self) -> ReviewDueIndex:
+        """
+        Returns the review due index, building it from the study data if
+        needed. Must be called while holding the lock.
+        """
+        index = self.__review_due_index
+        if index is None:
+            index = ReviewDueIndex()
+            index.rebuild(self.__study_data_dict.items())
+            self.__review_due_index = index
+        return index
+
+    def __apply_mark(self, study_data: CardStudyData, knew_it: bool,
+                     timestamp: float):
+        """Applies a single card marking to its study data."""
+        study_data.last_encounter_time = timestamp
+        study_data.add_history(knew_it, Config.max_card_history_size)
+    
+        # Update proficiencly level
+        if study_data.proficiency_level == 0:
+            study_data.proficiency_level = 3 if knew_it else 1
+        elif knew_it:
+            study_data.proficiency_level = min(
+                study_data.proficiency_level + 1, Config.proficiency_levels)
+        else:
+            study_data.proficiency_level = max(
+                1, study_data.proficiency_level - 1)
+
+    def __open_journal(self, path: str, truncate: bool):
+        """
+        Opens the journal file which accompanies the study data file,
+        optionally clearing its contents. Otherwise, a partially written
+        final line found by __replay_journal() is removed, so new records
+        are not appended onto it.
+        """
+        if self.__journal_file is not None:
+            self.__journal_file.close()
+        journal_path = get_study_journal_path(path)
+        if (not truncate and os.path.isfile(journal_path) and
+                os.path.getsize(journal_path) > self.__journal_size):
+            os.truncate(journal_path, self.__journal_size)
+        self.__journal_file = open(journal_path, "w" if truncate else "a",
+                                   encoding="utf8")
+        if not truncate and self.__journal_file.tell() > 0:
+            # End a final record whose newline was not written
+            with open(journal_path, "rb") as f:
+                f.seek(-1, os.SEEK_END)
+                if f.read(1) != b"\n":
+                    self.__journal_file.write("\n")
+        if truncate:
+            self.__journal_record_count = 0
+            self.__journal_size = 0
+            self.__journal_has_bad_records = False
+            self.__journal_file.flush()
+            os.fsync(self.__journal_file.fileno())
+
+    def __append_journal_record(self, card: Card, knew_it: bool,
+                                timestamp: float):
+        """Appends a card marking to the journal and flushes it to disk."""
+        key = card.get_key()
+        record = [key[0].name.lower(), key[1], key[2], timestamp,
+                  1 if knew_it else 0]
+        self.__journal_file.write(json.dumps(record, ensure_ascii=False) + "\n")
+        self.__journal_file.flush()
+        os.fsync(self.__journal_file.fileno())
+        self.__journal_record_count += 1
+
+    def __replay_journal(self, path: str):
+        """
+        Applies card markings from the journal file that were made after the
+        study data file was last saved. If saving was interrupted after the
+        study data file was written but before the journal was cleared, the
+        journal holds markings already in the study data. A marking is only
+        applied if it is newer than the card's last encounter, so they are
+        not applied twice.
+        """
+        journal_path = get_study_journal_path(path)
+        self.__journal_record_count = 0
+        self.__journal_size = 0
+        self.__journal_has_bad_records = False
+        if not os.path.isfile(journal_path):
+            return
+        with open(journal_path, "rb") as f:
+            data = f.read()
+        for line in data.splitlines(keepends=True):
+            try:
+                record = json.loads(line.decode("utf8"))
+            except ValueError:
+                # A partially written final record from an interrupted
+                # write can be safely ignored. It is removed when the
+                # journal is opened, and other bad records when the study
+                # data is compacted.
+                Config.logger.warning("Study journal: Ignoring bad record: " + repr(line))
+                if line.endswith(b"\n"):
+                    self.__journal_size += len(line)
+                    self.__journal_has_bad_records = True
+                continue
+            self.__journal_size += len(line)
+            self.__journal_record_count += 1
+            word_type = parse_word_type(record[0])
+            key = (word_type, record[1], record[2])
+            card = self.__card_database.get_card_by_key(*key)
+            if card is None:
+                Config.logger.error("Study journal: Error finding card with key: " + str(key))
+                continue
+            study_data = self.__study_data_dict.get(card, None)
+            if study_data is None:
+                study_data = CardStudyData()
+                self.__study_data_dict[card] = study_data
+                card.set_study_data(study_data)
+            elif (study_data.last_encounter_time is not None and
+                    record[3] <= study_data.last_encounter_time):
+                continue
+            self.__apply_mark(study_data, knew_it=bool(record[4]),
+                              timestamp=record[3])
+        if self.__journal_record_count > 0:
+            Config.logger.info("Replayed {} card markings from study journal: {}"
+                               .format(self.__journal_record_count, journal_path))
+
     def __update_current_metrics(self):
         current_metrics = self.get_study_metrics()
         self.__metrics_history[current_metrics.get_date_string()] = current_metrics
@@ -347,6 +801,16 @@ class StudyDatabase:
         with self.__lock_dirty:
             self.__dirty = True
 
+    def __on_card_deleted(self, card: Card):
+        """Called after a card is deleted, to forget its study data."""
+        with self.__lock.acquire_write():
+            if self.__study_data_dict.pop(card, None) is None:
+                return
+            if self.__review_due_index is not None:
+                self.__review_due_index.remove_card(card)
+        with self.__lock_dirty:
+            self.__dirty = True
+
     def __serialize(self) -> dict:
         """Serialize the study data into a dictionary."""
         self.__update_current_metrics()
@@ -19,6 +19,7 @@ from study_tool.card_set import *
 from study_tool.card_set import StudySet
 from study_tool.config import Config
 from study_tool.example_database import ExampleDatabase
+from study_tool.lazy_loader import LazyLoader
 from study_tool.gui.card_edit_widget import CardEditWidget
 from study_tool.gui.card_set_edit_widget import CardSetEditWidget
 from study_tool.gui.related_cards_widget import RelatedCardsWidget
@@ -32,6 +33,7 @@ from study_tool.query import CardQuery
 from study_tool.russian import conjugation
 from study_tool.russian.word import WordSourceEnum
 from study_tool.scheduler import SchedulerParams
+from study_tool.startup_pipeline import StartupPipeline
 from study_tool.states.menu_state import MenuState
 from study_tool.states.study_state import StudyState
 from study_tool.states.card_list_state import CardListState
@@ -64,6 +66,7 @@ class StudyCardsApp(Application):
 
         self.clock = pygame.time.Clock()
         self.graphics = cmg.Graphics(self.screen)
+        self.render_on_change = Config.render_on_change
         self.joystick_ready = False
         self.inputs = [
             Input(index=2, name="Middle", min=1, max=-1, dead_zone=DEAD_ZONE),
@@ -74,33 +77,48 @@ class StudyCardsApp(Application):
         self.root_path = "data"
         self.cards_path = os.path.join(self.root_path, "cards")
         self.card_data_file_name = "card_data.yaml"
+        self.card_set_cache_file_name = "card_sets.cache.json"
         self.save_file_name = "study_data.yaml"
         self.word_data_file_name = "word_data.json"
         self.custom_word_data_file_name = "custom_words.yaml"
         self.example_data_file_name = "examples.json"
+        self.example_corpus_file_name = "examples.corpus"
 
         # Create databases
         self.word_database = WordDatabase()
         self.card_database = CardDatabase(word_database=self.word_database)
-        self.example_database = ExampleDatabase(word_database=self.word_database)
+        self.example_database = LazyLoader(
+            ExampleDatabase(word_database=self.word_database),
+            self.load_example_database)
         self.study_database = StudyDatabase(card_database=self.card_database)
         self.cooljugator_thread = CooljugatorThread(self.word_database.get_cooljugator())
-        self.wiktionary = Wiktionary()
-
-        # Load data
-        self.load_word_database()
-        self.load_card_data()
-        self.card_database.load_card_sets(self.cards_path)
-        self.load_example_database()
-        self.load_study_data()
-        self.save_word_database()
-        self.save_study_data()
+        self.wiktionary = LazyLoader(Wiktionary(), self.load_wiktionary)
+
+        # Load data, then save anything that changed while loading, timing
+        # each stage. Example and Wiktionary data are loaded lazily when
+        # first needed.
+        startup = StartupPipeline()
+        startup.add_stage("word_data", self.load_word_database)
+        startup.add_stage("card_data", self.load_card_data,
+                          depends_on=["word_data"])
+        startup.add_stage("card_sets", self.load_card_sets,
+                          depends_on=["card_data"])
+        # Study data refers to the legacy text cards created by card sets
+        startup.add_stage("study_data", self.load_study_data,
+                          depends_on=["card_sets"])
+        startup.add_stage("save_word_data", self.__save_word_database_if_modified,
+                          depends_on=["card_sets"])
+        startup.add_stage("save_study_data", self.study_database.compact,
+                          depends_on=["study_data"])
+        startup.add_stage("save_card_data", self.__save_card_data_if_modified,
+                          depends_on=["card_sets"])
+        startup.run()
 
         # Save all card sets as JSON
         # for card_set in self.card_database.iter_card_sets():
         #     self.card_database.save_card_set_as_json(card_set)
-        self.save_card_data()
 
+        Config.logger.info(startup.get_report())
         Config.logger.info("Initialization complete!")
 
         self.states = []
@@ -149,6 +167,7 @@ class StudyCardsApp(Application):
 
     def on_quit(self):
         self.cooljugator_thread.stop()
+        self.study_database.compact()
 
     def on_window_resized(self, size: cmg.Vec2):
         self.graphics = cmg.Graphics(self.screen)
@@ -281,6 +300,8 @@ class StudyCardsApp(Application):
             card_set = self.query_cards(card_query, card_set=card_set)
         if not study_params:
             study_params = StudyParams()
+        self.example_database.prefetch()
+        self.wiktionary.prefetch()
         self.push_state(StudyState(card_set,
                                    study_params=study_params,
                                    scheduler_params=scheduler_params))
@@ -320,6 +341,10 @@ class StudyCardsApp(Application):
         path = os.path.join(self.root_path, self.card_data_file_name)
         self.card_database.load_card_data(path)
 
+    def load_card_sets(self):
+        cache_path = os.path.join(self.root_path, self.card_set_cache_file_name)
+        self.card_database.load_card_sets(self.cards_path, cache_path=cache_path)
+
     def save_study_data(self):
         return self.study_database.save()
 
@@ -342,18 +367,41 @@ class StudyCardsApp(Application):
             Config.logger.info("Loading custom word data from: " + path)
             self.word_database.load(path, source_type=WordSourceEnum.Custom)
         Config.logger.info("Loading {} words".format(len(self.word_database.words)))
-        self.wiktionary.load("data/wiktionary.yaml")
+
+    def load_wiktionary(self, wiktionary: Wiktionary):
+        wiktionary.load("data/wiktionary.yaml")
 
     def save_example_database(self):
         path = os.path.join(self.root_path, self.example_data_file_name)
         Config.logger.debug("Saving example data to: " + path)
         self.example_database.save(path)
 
-    def load_example_database(self):
+    def load_example_database(self, example_database: ExampleDatabase):
         for story_filename in os.listdir(self.root_path + "/examples/stories"):
-            Config.logger.info("Loading example story " + story_filename)
             story_path = self.root_path + "/examples/stories/" + story_filename
-            self.example_database.load_story_text_file(story_path)
+            if not os.path.isfile(story_path):
+                continue
+            Config.logger.info("Loading example story " + story_filename)
+            example_database.load_story_text_file(story_path)
+        path = os.path.join(self.root_path, self.example_corpus_file_name)
+        example_database.build_index(cache_path=path)
+
+    def is_active(self) -> bool:
+        """
+        Returns True while a pedal is held, the state is animating, or a
+        background task is showing its status, so that frames keep being
+        drawn.
+        """
+        if Application.is_active(self):
+            return True
+        if any(input.get_amount() > 0 for input in self.inputs):
+            return True
+        if self.state.is_active():
+            return True
+        return (self.study_database.is_saving() or
+                self.card_database.is_saving() or
+                self.word_database.is_saving() or
+                self.cooljugator_thread.get_status() is not None)
 
     def update(self, dt):
         # Check if the joystick is ready. Seems to happen
@@ -374,11 +422,12 @@ class StudyCardsApp(Application):
                     is_pressed=input.amount > PRESS_THRESHOLD and input.prev_amount <= PRESS_THRESHOLD)
 
         # Update the current state
-        self.state.process_input()
-        self.state.update(dt)
+        state = self.state
+        with self.profiler.phase(type(state).__name__ + ".update"):
+            state.process_input()
+            state.update(dt)
 
     def draw(self):
-        self.graphics.recache()
         self.graphics.clear(cmg.Theme.color_background)
         screen_width, screen_height = self.screen.get_size()
 
@@ -389,7 +438,8 @@ class StudyCardsApp(Application):
                 break
         for state in reversed(states_to_draw):
             # TODO: fade background
-            state.draw(self.graphics)
+            with self.profiler.phase(type(state).__name__ + ".draw"):
+                state.draw(self.graphics)
         
         # Draw save status
         kwargs = dict( 
@@ -437,6 +487,14 @@ class StudyCardsApp(Application):
             align=cmg.Align.BottomRight,
             color=cmg.Theme.color_text_box_background_text)
 
+    def __save_word_database_if_modified(self):
+        if self.word_database.is_modified():
+            self.save_word_database()
+
+    def __save_card_data_if_modified(self):
+        if self.card_database.is_card_data_modified():
+            self.save_card_data()
+
     def __on_key_pressed(self, key, mod, text):
         self.state.on_key_pressed(key, mod, text)
 
@@ -0,0 +1,56 @@
+"""
+Benchmarks constructing accented text and building card and word keys
+from the Russian and English texts in the card data file.
+
+Usage: python -m study_tool.tests.benchmark_accented_text
+"""
+import json
+import time
+from study_tool.card import get_card_key
+from study_tool.russian.types import WordType
+from study_tool.russian.word import AccentedText
+from study_tool.word_database import WordDatabase
+
+CARD_DATA_PATH = "data/card_data.json"
+ITERATIONS = 20
+
+
+def construct_texts(texts: list):
+    for text in texts:
+        AccentedText(text)
+
+
+def build_card_keys(pairs: list):
+    for russian, english in pairs:
+        get_card_key(WordType.Noun, russian, english)
+
+
+def look_up_words(word_database: WordDatabase, texts: list):
+    for text in texts:
+        word_database.get_word(name=text, word_type=WordType.Noun)
+
+
+def benchmark(function, *args) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        function(*args)
+    return (time.perf_counter() - start) / ITERATIONS
+
+
+def main():
+    with open(CARD_DATA_PATH, "r", encoding="utf8") as f:
+        card_states = json.load(f)["cards"]
+    russian = [state["ru"] for state in card_states]
+    pairs = [(state["ru"], state["en"]) for state in card_states]
+    word_database = WordDatabase()
+    print("{:<24}{:>10}{:>12}".format("Operation", "Count", "Time (ms)"))
+    for name, function, args in [
+            ("Construct AccentedText", construct_texts, (russian,)),
+            ("Build card keys", build_card_keys, (pairs,)),
+            ("Look up words", look_up_words, (word_database, russian))]:
+        print("{:<24}{:>10}{:>12.2f}".format(
+            name, len(args[-1]), benchmark(function, *args) * 1000))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Measures the memory used by cards and their study data, for the card
+data in the data directory and for a synthetic deck of 100,000 cards.
+Each card is given study data with a full history of markings.
+
+Usage: python -m study_tool.tests.benchmark_card_memory
+"""
+import gc
+import json
+import random
+import tracemalloc
+from study_tool.card import Card
+from study_tool.config import Config
+from study_tool.study_database import CardStudyData
+
+CARD_DATA_PATH = "data/card_data.json"
+SYNTHETIC_CARD_COUNT = 100000
+
+
+def create_synthetic_card_states(count: int) -> list:
+    random_state = random.Random(0)
+    letters = "абвгдежзийклмнопрстуфхцчшщыэюя"
+    word_types = ["noun", "verb", "adjective", "adverb", "phrase"]
+    states = []
+    for index in range(count):
+        russian = "".join(random_state.choice(letters)
+                          for _ in range(random_state.randint(4, 12)))
+        accent = random_state.randint(1, len(russian))
+        states.append({"type": word_types[index % len(word_types)],
+                       "ru": russian[:accent] + "'" + russian[accent:],
+                       "en": "word {}".format(index)})
+    return states
+
+
+def create_cards(card_states: list) -> list:
+    random_state = random.Random(0)
+    cards = []
+    for card_state in card_states:
+        card = Card()
+        try:
+            card.deserialize_card_data(card_state)
+        except (KeyError, ValueError):
+            continue  # Skip cards with unknown word types or attributes
+        card.generate_word_name()
+        study_data = CardStudyData()
+        history = "".join(random_state.choice("TTTF") for _ in
+                          range(Config.max_card_history_size))
+        study_data.deserialize([random_state.randint(1, 5), 0.0, history])
+        card.set_study_data(study_data)
+        cards.append(card)
+    return cards
+
+
+def measure(card_states: list) -> tuple:
+    """Returns the bytes used by the cards created from some states."""
+    gc.collect()
+    tracemalloc.start()
+    start, _ = tracemalloc.get_traced_memory()
+    cards = create_cards(card_states)
+    gc.collect()
+    end, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return len(cards), end - start
+
+
+def main():
+    with open(CARD_DATA_PATH, "r", encoding="utf8") as f:
+        data_card_states = json.load(f)["cards"]
+    print("{:<24}{:>10}{:>14}{:>14}".format(
+        "Deck", "Cards", "Total (MiB)", "Bytes/card"))
+    for name, card_states in [
+            ("data/card_data.json", data_card_states),
+            ("Synthetic", create_synthetic_card_states(SYNTHETIC_CARD_COUNT))]:
+        count, size = measure(card_states)
+        print("{:<24}{:>10}{:>14.1f}{:>14.0f}".format(
+            name, count, size / (1024 * 1024), size / count))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Benchmarks loading a synthetic directory of card set files, comparing
+the serial YAML loader against the parallel CardSetLoader, cold and with
+a warm parse cache.
+
+Usage: python -m study_tool.tests.benchmark_card_set_loading
+"""
+import json
+import os
+import tempfile
+import time
+import yaml
+from study_tool.card_set_loader import CardSetFileCache
+from study_tool.card_set_loader import CardSetLoader
+
+PACKAGE_COUNT = 20
+CARD_SET_COUNT = 400
+CARDS_PER_SET = 60
+
+
+def create_card_sets(path: str):
+    for index in range(CARD_SET_COUNT):
+        directory = os.path.join(path, "package_{}".format(index % PACKAGE_COUNT))
+        os.makedirs(directory, exist_ok=True)
+        cards = [["noun", "слово {} {}".format(index, i), "word {} {}".format(index, i)]
+                 for i in range(CARDS_PER_SET)]
+        state = {"card_set": {"version": 1, "name": "Set {}".format(index),
+                              "type": "Categorical", "cards": cards}}
+        with open(os.path.join(directory, "set_{}.yaml".format(index)),
+                  "w", encoding="utf8") as f:
+            json.dump(state, f, indent="\t", ensure_ascii=False)
+
+
+def load_serial(path: str) -> dict:
+    states = {}
+    for directory, _, filenames in os.walk(path):
+        for filename in filenames:
+            file_path = os.path.join(directory, filename)
+            with open(file_path, "r", encoding="utf8") as f:
+                states[file_path] = yaml.load(f, Loader=yaml.CLoader)
+    return states
+
+
+def load_parallel(path: str, cache: CardSetFileCache) -> dict:
+    loader = CardSetLoader(cache=cache)
+    return loader.load_files(loader.find_files(path))
+
+
+def benchmark(function, *args) -> tuple:
+    start = time.perf_counter()
+    result = function(*args)
+    return time.perf_counter() - start, result
+
+
+def main():
+    with tempfile.TemporaryDirectory() as path:
+        create_card_sets(path)
+        cache_path = os.path.join(path, "card_sets.cache.json")
+        serial_time, serial_states = benchmark(load_serial, path)
+        cold_time, cold_states = benchmark(
+            load_parallel, path, CardSetFileCache())
+        assert cold_states == serial_states
+
+        cache = CardSetFileCache()
+        load_parallel(path, cache)
+        cache.save(cache_path)
+
+        def load_warm():
+            cache = CardSetFileCache()
+            cache.load(cache_path)
+            return load_parallel(path, cache)
+
+        warm_time, warm_states = benchmark(load_warm)
+        assert warm_states == serial_states
+
+    print("{} card sets of {} cards".format(CARD_SET_COUNT, CARDS_PER_SET))
+    print("{:<28}{:>10}{:>10}".format("Loader", "Time (s)", "Speedup"))
+    for name, duration in [("Serial YAML", serial_time),
+                           ("Parallel, cold cache", cold_time),
+                           ("Parallel, warm cache", warm_time)]:
+        print("{:<28}{:>10.3f}{:>9.1f}x".format(
+            name, duration, serial_time / duration))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Benchmarks extracting conjugation forms from the saved Cooljugator
+fixture pages, comparing the single-pass HtmlIndex against searching a
+BeautifulSoup tree for each form.
+
+Usage: python -m study_tool.tests.benchmark_cooljugator_parsing
+"""
+import os
+import time
+from bs4 import BeautifulSoup
+from study_tool.external.html_index import HtmlIndex
+
+FIXTURES_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "cooljugator")
+ITERATIONS = 50
+
+
+def get_features() -> str:
+    try:
+        import lxml
+        return "lxml"
+    except ImportError:
+        return "html.parser"
+
+
+def extract_with_soup(html: str, ids: list, features: str) -> list:
+    root = BeautifulSoup(html, features=features).body
+    return [root.find("div", attrs={"id": element_id})["data-stressed"]
+            for element_id in ids]
+
+
+def extract_with_index(html: str, ids: list) -> list:
+    root = HtmlIndex(html)
+    return [root.get_element_by_id(element_id)["data-stressed"]
+            for element_id in ids]
+
+
+def benchmark(function, *args) -> float:
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        function(*args)
+    return (time.perf_counter() - start) / ITERATIONS
+
+
+def main():
+    features = get_features()
+    print("{:<16}{:>6}{:>14}{:>14}{:>10}".format(
+        "Page", "Forms", "Soup (ms)", "Index (ms)", "Speedup"))
+    for filename in ["verb.html", "noun.html", "adjective.html"]:
+        with open(os.path.join(FIXTURES_PATH, filename), encoding="utf8") as file:
+            html = file.read()
+        ids = [element["id"] for element in
+               HtmlIndex(html).get_elements_by_class("conjugation-cell")
+               if "id" in element]
+        assert extract_with_soup(html, ids, features) == extract_with_index(html, ids)
+        soup_time = benchmark(extract_with_soup, html, ids, features)
+        index_time = benchmark(extract_with_index, html, ids)
+        print("{:<16}{:>6}{:>14.2f}{:>14.2f}{:>9.1f}x".format(
+            filename, len(ids), soup_time * 1000, index_time * 1000,
+            soup_time / index_time))
+    print("BeautifulSoup parser: " + features)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+from study_tool.card import get_card_key
+from study_tool.russian.types import WordType
+from study_tool.russian.word import AccentedText
+from study_tool.russian.word import get_folded_text
+from study_tool.russian.word import get_lowercase_text
+from study_tool.russian.word import get_unaccented_text
+from study_tool.russian.word import normalize_accented_text
+
+
+def test_accented_text():
+    text = AccentedText("прийти'")
+    assert text.text == "прийти"
+    assert text.accents == (5,)
+    assert repr(text) == "прийти'"
+
+    text = AccentedText("Ёлка´ и́ пое'зд")
+    assert text.text == "Ёлка и поезд"
+    assert text.accents == (3, 5, 9)
+    assert repr(text) == "Ёлка' и' пое'зд"
+
+    # Leading and repeated accent marks
+    assert AccentedText("'да").accents == ()
+    assert AccentedText("да''").accents == (1, 1)
+    assert AccentedText("").text == ""
+    assert AccentedText(AccentedText("до'м")).accents == (1,)
+    assert AccentedText("дом", accents=[0]).accents == (0,)
+
+
+def test_normalized_text_forms():
+    assert normalize_accented_text("Ёлка'") == ("Ёлка", (3,), "ёлка", "елка")
+    assert get_unaccented_text("Ёлка'") == "Ёлка"
+    assert get_lowercase_text(AccentedText("Ёлка'")) == "ёлка"
+    assert get_folded_text("Ёлка'") == "елка"
+
+    # Text with explicit accents keeps its accent characters
+    text = AccentedText("don't", accents=())
+    assert get_unaccented_text(text) == "don't"
+    assert get_lowercase_text(text) == "don't"
+
+    # Repeated lookups return the same string objects
+    a = get_card_key(WordType.Noun, AccentedText("Ёлка'"), "Tree")
+    b = get_card_key(WordType.Noun, "Ёлка", AccentedText("tree"))
+    assert a == b == (WordType.Noun, "ёлка", "tree")
+    assert a[1] is get_lowercase_text("Ёлка'")
+    assert get_folded_text("ёлка") is get_folded_text("ёлка")
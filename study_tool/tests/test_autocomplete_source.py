@@ -0,0 +1,50 @@
+import pytest
+from cmg.utilities import AutocompleteSource
+from study_tool.card import Card
+from study_tool.card_database import CardDatabase
+from study_tool.russian.types import WordType
+from study_tool.russian.word import AccentedText
+from study_tool.word_database import WordDatabase
+
+
+def test_autocomplete_source():
+    source = AutocompleteSource([x.name for x in WordType])
+    assert source.complete("") is None
+    assert source.complete("ad") in ("Adjective", "Adverb")
+    assert source.complete("VERB") == "Verb"
+    assert source.complete("xyz") is None
+
+    source = AutocompleteSource(["делать", "дело", "Дел", "дом"])
+    assert list(source.iter_matches("ДЕЛ")) == ["Дел", "делать", "дело"]
+    assert source.complete("дел") == "Дел"
+    source.add_item("до")
+    assert list(source.iter_matches("до")) == ["до", "дом"]
+    assert len(source) == 5
+    source.remove_item("дел")
+    source.remove_item("xyz")
+    assert list(source.iter_matches("дел")) == ["Дел", "делать", "дело"]
+    source.remove_item("Дел")
+    assert list(source.iter_matches("дел")) == ["делать", "дело"]
+    assert len(source) == 4
+
+
+def test_card_russian_autocomplete_source():
+    # The widgets use the Windows clipboard
+    pytest.importorskip("win32clipboard")
+    from study_tool.gui.card_edit_widget import CardRussianAutocompleteSource
+    card_database = CardDatabase(word_database=WordDatabase())
+    dog = Card(russian="собака", english="dog", word_type=WordType.Noun)
+    card_database.add_card(dog, verbose=False)
+    source = CardRussianAutocompleteSource(card_database)
+    assert list(source) == ["собака"]
+
+    # The source follows cards being created, changed and deleted
+    cat = Card(russian="кот", english="cat", word_type=WordType.Noun)
+    card_database.add_card(cat, verbose=False)
+    assert list(source) == ["кот", "собака"]
+    modified = Card(copy=cat)
+    modified.set_russian(AccentedText("кошка"))
+    card_database.update_card(cat, modified)
+    assert list(source) == ["кошка", "собака"]
+    card_database.delete_card(dog)
+    assert list(source) == ["кошка"]
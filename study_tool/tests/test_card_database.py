@@ -0,0 +1,66 @@
+from study_tool.card import Card
+from study_tool.card_database import CardDatabase
+from study_tool.card_set import CardSet
+from study_tool.card_set import CardSetPackage
+from study_tool.russian.types import WordType
+from study_tool.word_database import WordDatabase
+
+
+def create_card_database() -> CardDatabase:
+    card_database = CardDatabase(word_database=WordDatabase())
+    for russian, english in [("до того как", "before"),
+                             ("до сих пор", "until now"),
+                             ("как дела", "how are you")]:
+        card_database.add_card(Card(russian=russian, english=english,
+                                    word_type=WordType.Phrase), verbose=False)
+    return card_database
+
+
+def test_card_slots():
+    assert not hasattr(Card(), "__dict__")
+
+
+def test_card_set_membership():
+    card_database = create_card_database()
+    a, b, c = card_database.iter_cards()
+    package = CardSetPackage(name="words", path="cards")
+    set_1 = card_database.create_card_set("One", "one", package)
+    set_2 = card_database.create_card_set("Two", "two", package)
+    card_database.add_card_to_set(a, set_1)
+    card_database.add_card_to_set(a, set_2)
+    card_database.add_card_to_set(b, set_2)
+    assert card_database.get_card_sets_for_card(a) == [set_1, set_2]
+    assert card_database.is_card_in_set(b, set_2)
+    assert not card_database.is_card_in_set(b, set_1)
+    assert card_database.get_orphan_cards() == [c]
+
+    card_database.update_card_set(set_2, cards=[c])
+    assert card_database.get_card_sets_for_card(a) == [set_1]
+    assert card_database.get_orphan_cards() == [b]
+
+    # Deleting a card removes it from its keys and card sets
+    card_database.delete_card(a)
+    assert not card_database.has_card(a)
+    assert set_1.get_cards() == []
+    assert card_database.get_card_sets_for_card(a) == []
+    assert card_database.get_card(WordType.Phrase, russian="до того как") is None
+    assert list(card_database.iter_cards()) == [b, c]
+
+
+def test_card_set_order_and_membership():
+    cards = [Card(russian=str(i), english=str(i), word_type=WordType.Phrase)
+             for i in range(5)]
+    card_set = CardSet(cards=cards + [cards[0]])
+    assert card_set.get_cards() == cards
+    assert card_set.has_card(cards[3])
+    card_set.remove_card(cards[3])
+    card_set.add_card(cards[3])
+    card_set.add_card(cards[1])
+    assert card_set.get_cards() == [cards[0], cards[1], cards[2], cards[4], cards[3]]
+    assert card_set.get_card_count() == 5
+
+    package = CardSetPackage(name="words", path="cards")
+    package.add_card_set(card_set)
+    package.add_card_set(CardSet(cards=[cards[2]]))
+    assert package.cards == card_set.get_cards()
+    assert package.has_card(cards[4])
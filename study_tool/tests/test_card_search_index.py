@@ -0,0 +1,57 @@
+import json
+import os
+from study_tool.card import Card
+from study_tool.card_search_index import CardSearchIndex
+from study_tool.russian.types import parse_word_type
+
+
+def load_cards() -> list:
+    with open(os.path.join("data", "card_data.json"), "r", encoding="utf8") as f:
+        states = json.load(f)["cards"]
+    return [Card(russian=state["ru"], english=state["en"],
+                 word_type=parse_word_type(state["type"]))
+            for state in states]
+
+
+def search_by_scanning(cards: list, text: str) -> list:
+    text = text.lower().replace("ё", "е")
+    matches = []
+    for card in cards:
+        russian = card.get_russian().text.lower().replace("ё", "е")
+        english = card.get_english().text.lower()
+        if text in russian:
+            matches.append((card, -(len(russian) - len(text))))
+        elif text in english:
+            matches.append((card, -(len(english) - len(text))))
+    matches.sort(key=lambda x: x[1], reverse=True)
+    return [card for card, _ in matches]
+
+
+def test_search_matches_scan():
+    cards = load_cards()
+    index = CardSearchIndex()
+    for card in cards:
+        index.add_card(card)
+    for text in ["к", "ст", "ть", "Ёж", "собака", "the", "to go", "вать ", "xyz"]:
+        expected = search_by_scanning(cards, text)
+        results, count = index.search(text)
+        assert count == len(expected)
+        assert results == expected
+        results, count = index.search(text, count=20)
+        assert count == len(expected)
+        assert results == expected[:20]
+
+
+def test_search_index_updates():
+    index = CardSearchIndex()
+    card = Card(russian="соба'ка", english="dog", word_type=parse_word_type("noun"))
+    index.add_card(card)
+    assert index.search("бак") == ([card], 1)
+    card.set_russian("ко'шка")
+    card.set_english("cat")
+    index.update_card(card)
+    assert index.search("бак") == ([], 0)
+    assert index.search("CAT") == ([card], 1)
+    index.remove_card(card)
+    assert index.search("cat") == ([], 0)
+    assert len(index) == 0
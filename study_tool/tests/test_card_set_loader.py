@@ -0,0 +1,140 @@
+import datetime
+import json
+import os
+from study_tool import card_set_loader
+from study_tool.card import Card
+from study_tool.card_database import CardDatabase
+from study_tool.russian.types import WordType
+from study_tool.word_database import WordDatabase
+
+
+def create_card_database() -> CardDatabase:
+    card_database = CardDatabase(word_database=WordDatabase())
+    for russian, english in [("до того как", "before"),
+                             ("до сих пор", "until now"),
+                             ("как дела", "how are you")]:
+        card_database.add_card(Card(russian=russian, english=english,
+                                    word_type=WordType.Phrase), verbose=False)
+    return card_database
+
+
+def write_card_set(path, name, cards):
+    state = {"card_set": {"version": 1, "name": name,
+                          "type": "Categorical", "cards": cards}}
+    with open(path, "w", encoding="utf8") as f:
+        json.dump(state, f, indent="\t", ensure_ascii=False)
+
+
+def create_card_set_directory(path):
+    os.makedirs(os.path.join(path, "phrases", "more"))
+    write_card_set(os.path.join(path, "phrases", "b.yaml"), "B",
+                   [["phrase", "до сих пор", "until now"]])
+    write_card_set(os.path.join(path, "phrases", "a.yaml"), "A",
+                   [["phrase", "до того как", "before"],
+                    ["phrase", "как дела"]])
+    write_card_set(os.path.join(path, "phrases", "more", "c.yaml"), "C",
+                   [["phrase", "как дела", "how are you"]])
+    with open(os.path.join(path, "phrases", "d.yaml"), "w", encoding="utf8") as f:
+        f.write("card_set:\n  name: D\n  cards:\n  - [phrase, до сих пор]\n")
+    with open(os.path.join(path, "legacy.txt"), "w", encoding="utf8") as f:
+        f.write("@name Legacy\n@type phrase\nвот так -- like this\nну и что -- so what\n")
+    with open(os.path.join(path, "notes.md"), "w", encoding="utf8") as f:
+        f.write("not a card set")
+
+
+def get_package_tree(package) -> list:
+    return ([(str(card_set.name),
+              [card.get_english().text for card in card_set.get_cards()])
+             for card_set in package.card_sets] +
+            [(str(sub_package.name), get_package_tree(sub_package))
+             for sub_package in package.packages])
+
+
+def test_load_card_sets(tmp_path):
+    path = str(tmp_path / "cards")
+    cache_path = str(tmp_path / "card_sets.cache.json")
+    create_card_set_directory(path)
+
+    card_database = create_card_database()
+    root = card_database.load_card_sets(path, cache_path=cache_path)
+    assert get_package_tree(root) == [
+        ("Legacy", ["like this", "so what"]),
+        ("phrases", [("A", ["before", "how are you"]),
+                     ("B", ["until now"]),
+                     ("D", ["until now"]),
+                     ("more", [("C", ["how are you"])])])]
+    assert card_database.get_card(WordType.Phrase, russian="вот так") is not None
+    before = card_database.get_card(WordType.Phrase, russian="до того как",
+                                    english="before")
+    assert [str(x.name) for x in card_database.get_card_sets_for_card(before)] == ["A"]
+    assert os.path.isfile(cache_path)
+
+    # Unchanged files are loaded from the cache without being parsed again
+    def parse_card_set_text(text):
+        raise AssertionError("parsed an unchanged card set file")
+
+    original_parse = card_set_loader.parse_card_set_text
+    card_set_loader.parse_card_set_text = parse_card_set_text
+    try:
+        card_database = create_card_database()
+        root = card_database.load_card_sets(path, cache_path=cache_path)
+    finally:
+        card_set_loader.parse_card_set_text = original_parse
+    assert [str(x.name) for x in root.packages[0].card_sets] == ["A", "B", "D"]
+
+    # A modified file is parsed again
+    b_path = os.path.join(path, "phrases", "b.yaml")
+    write_card_set(b_path, "B", [["phrase", "до сих пор", "until now"],
+                                 ["phrase", "до того как", "before"]])
+    stat = os.stat(b_path)
+    os.utime(b_path, (stat.st_atime, stat.st_mtime + 10))
+    card_database = create_card_database()
+    root = card_database.load_card_sets(path, cache_path=cache_path)
+    assert get_package_tree(root.packages[0])[1] == ("B", ["until now", "before"])
+
+
+def test_card_set_file_cache(tmp_path):
+    cache = card_set_loader.CardSetFileCache()
+    cache.put("a.yaml", 1.0, 10, {"card_set": {"name": "A"}})
+    cache.put("b.yaml", 2.0, 20, {"card_set": {"name": "B"}})
+    assert cache.get("a.yaml", 1.0, 10) == {"card_set": {"name": "A"}}
+    assert cache.get("a.yaml", 1.5, 10) is None
+    assert cache.get("a.yaml", 1.0, 11) is None
+    cache.remove_missing(["a.yaml"])
+    assert cache.get("b.yaml", 2.0, 20) is None
+
+    cache.save(str(tmp_path / "cache.json"))
+    assert not cache.is_modified()
+    loaded = card_set_loader.CardSetFileCache()
+    loaded.load(str(tmp_path / "cache.json"))
+    assert loaded.get_entry_count() == 1
+    assert loaded.get("a.yaml", 1.0, 10) == {"card_set": {"name": "A"}}
+    loaded.load(str(tmp_path / "missing.json"))
+    assert loaded.get_entry_count() == 1
+
+
+def test_card_set_file_cache_yaml_values(tmp_path):
+    path = str(tmp_path / "cards")
+    cache_path = str(tmp_path / "card_sets.cache.json")
+    os.makedirs(path)
+    dated_path = os.path.join(path, "dated.yaml")
+    with open(dated_path, "w", encoding="utf8") as f:
+        f.write("card_set:\n  name: Dated\n  created: 2020-01-02\n"
+                "  cards:\n  - [phrase, до сих пор, until now]\n")
+    write_card_set(os.path.join(path, "plain.yaml"), "Plain",
+                   [["phrase", "как дела", "how are you"]])
+
+    # The file with a date is loaded, but only the other file is cached
+    card_database = create_card_database()
+    root = card_database.load_card_sets(path, cache_path=cache_path)
+    assert get_package_tree(root) == [("Dated", ["until now"]),
+                                      ("Plain", ["how are you"])]
+    cache = card_set_loader.CardSetFileCache()
+    cache.load(cache_path)
+    assert cache.get_entry_count() == 1
+    stat = os.stat(dated_path)
+    assert cache.get(dated_path, stat.st_mtime, stat.st_size) is None
+
+    assert not card_set_loader.is_json_state({"date": datetime.date.today()})
+    assert not card_set_loader.is_json_state({1: "one"})
+    assert card_set_loader.is_json_state({"a": [1, 2.5, None, True, "b"]})
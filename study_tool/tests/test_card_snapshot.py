@@ -0,0 +1,152 @@
+import json
+import os
+import tempfile
+import pytest
+from study_tool.card import Card
+from study_tool.card_attributes import CardAttributes
+from study_tool.card_database import CardDatabase
+from study_tool.card_database import CardDataConflictError
+from study_tool.card_snapshot import CardSnapshotReader
+from study_tool.card_snapshot import CardSnapshotWriter
+from study_tool.card_snapshot import get_card_data_source
+from study_tool.card_snapshot import get_card_snapshot_path
+from study_tool.card_snapshot import get_card_snapshot_recovery_path
+from study_tool.card_snapshot import is_card_snapshot_current
+from study_tool.card_snapshot import read_card_snapshot_info
+from study_tool.russian.types import WordType
+from study_tool.word_database import WordDatabase
+
+
+def write_and_read(card_states: list) -> list:
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "cards.snapshot")
+        writer = CardSnapshotWriter()
+        for state in card_states:
+            writer.add_card(state)
+        writer.write(path)
+        return CardSnapshotReader().read(path)["cards"]
+
+
+def test_snapshot_round_trip():
+    card = Card(russian="соба'ка", english="dog", word_type=WordType.Noun,
+                attributes=[CardAttributes.Femanine],
+                creation_timestamp=1571599089.406055)
+    card.add_example("У меня' есть соба'ка.")
+    related = Card(russian="щено'к", english="puppy", word_type=WordType.Noun)
+    card.add_related_card(related)
+    bare = Card(russian="да", english="yes", word_type=WordType.Particle)
+
+    states = [card.serialize_card_data(), bare.serialize_card_data()]
+    assert write_and_read(states) == states
+
+    loaded = Card()
+    loaded.deserialize_card_data(write_and_read(states)[0])
+    assert repr(loaded) == repr(card)
+    assert repr(loaded.get_examples()[0]) == "У меня' есть соба'ка."
+
+
+def test_snapshot_card_data_file():
+    with open(os.path.join("data", "card_data.json"), "r", encoding="utf8") as f:
+        states = json.load(f)["cards"]
+    assert write_and_read(states) == states
+
+
+def test_snapshot_path():
+    assert get_card_snapshot_path(os.path.join("data", "card_data.json")) == \
+        os.path.join("data", "card_data.snapshot")
+
+
+def create_card_data_file(path: str):
+    card = Card(russian="соба'ка", english="dog", word_type=WordType.Phrase)
+    with open(path, "w", encoding="utf8") as f:
+        json.dump({"cards": [card.serialize_card_data()]}, f)
+
+
+def get_english_texts(card_database) -> list:
+    return sorted(card.get_english().text
+                  for card in card_database.iter_cards())
+
+
+def add_cat_card(card_database):
+    card_database.add_card(Card(russian="кот", english="cat",
+                                word_type=WordType.Phrase), verbose=False)
+
+
+def write_unexported_snapshot(path: str):
+    """Writes a snapshot like older versions saved, with an extra card."""
+    card_database = CardDatabase(word_database=WordDatabase())
+    card_database.load_card_data(path)
+    add_cat_card(card_database)
+    writer = CardSnapshotWriter()
+    for card in card_database.iter_cards():
+        writer.add_card(card.serialize_card_data())
+    writer.write(get_card_snapshot_path(path),
+                 source=get_card_data_source(path),
+                 has_unexported_changes=True)
+
+
+def test_card_data_save(tmp_path):
+    path = str(tmp_path / "card_data.json")
+    create_card_data_file(path)
+    card_database = CardDatabase(word_database=WordDatabase())
+    card_database.load_card_data(path)
+    assert os.path.isfile(get_card_snapshot_path(path))
+    assert is_card_snapshot_current(path)
+
+    # Saving writes the card data file along with its snapshot
+    add_cat_card(card_database)
+    card_database.save_card_data()
+    with open(path, "r", encoding="utf8") as f:
+        assert len(json.load(f)["cards"]) == 2
+    assert is_card_snapshot_current(path)
+    card_database = CardDatabase(word_database=WordDatabase())
+    card_database.load_card_data(path)
+    assert get_english_texts(card_database) == ["cat", "dog"]
+
+    # A changed card data file is imported again
+    create_card_data_file(path)
+    assert not is_card_snapshot_current(path)
+    card_database = CardDatabase(word_database=WordDatabase())
+    card_database.load_card_data(path)
+    assert get_english_texts(card_database) == ["dog"]
+    assert is_card_snapshot_current(path)
+
+
+def test_card_data_unexported_snapshot(tmp_path):
+    path = str(tmp_path / "card_data.json")
+    create_card_data_file(path)
+    write_unexported_snapshot(path)
+
+    # The changes of an older snapshot are exported when loading it
+    card_database = CardDatabase(word_database=WordDatabase())
+    card_database.load_card_data(path)
+    assert get_english_texts(card_database) == ["cat", "dog"]
+    with open(path, "r", encoding="utf8") as f:
+        assert len(json.load(f)["cards"]) == 2
+    info = read_card_snapshot_info(get_card_snapshot_path(path))
+    assert not info.has_unexported_changes
+    assert is_card_snapshot_current(path)
+
+
+def test_card_data_conflict(tmp_path):
+    path = str(tmp_path / "card_data.json")
+    create_card_data_file(path)
+    write_unexported_snapshot(path)
+    snapshot_path = get_card_snapshot_path(path)
+    with open(snapshot_path, "rb") as f:
+        snapshot = f.read()
+
+    # The card data file changes while the snapshot has unexported changes
+    with open(path, "a", encoding="utf8") as f:
+        f.write("\n")
+    card_database = CardDatabase(word_database=WordDatabase())
+    with pytest.raises(CardDataConflictError):
+        card_database.load_card_data(path)
+    with open(snapshot_path, "rb") as f:
+        assert f.read() == snapshot
+
+    # The snapshot's cards are written to a file to recover them from
+    with open(get_card_snapshot_recovery_path(path), "r",
+              encoding="utf8") as f:
+        cards = json.load(f)["cards"]
+    assert sorted(card["en"] for card in cards) == ["cat", "dog"]
@@ -0,0 +1,214 @@
+import http.server
+import os
+import socket
+import threading
+import time
+import pytest
+import requests
+from cmg.event import Event
+from study_tool.external.cooljugator import Cooljugator
+from study_tool.external.cooljugator import CooljugatorOfflineError
+from study_tool.external.cooljugator import CooljugatorThread
+from study_tool.external.http_cache import HttpCache
+from study_tool.external.http_cache import HttpCacheEntry
+from study_tool.russian.types import *
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    failures = {}
+    requests = []
+    ports = set()
+    lock = threading.Lock()
+
+    def do_GET(self):
+        with self.lock:
+            self.requests.append(self.path)
+            self.ports.add(self.client_address[1])
+            failures = self.failures.get(self.path, 0)
+            self.failures[self.path] = failures - 1
+        if failures > 0:
+            status, body = 503, b"unavailable"
+        else:
+            time.sleep(0.2)
+            status, body = 200, self.path.encode()
+        self.send_response(status)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubCooljugator(Cooljugator):
+    """Fetches the page for a word without parsing it."""
+
+    def __init__(self, url, http_cache):
+        super().__init__(http_cache=http_cache)
+        self.url = url
+
+    def download_word_info(self, word_type, name):
+        return self.fetch_html(self.url + name)
+
+
+def run_stub_server():
+    StubHandler.failures = {}
+    StubHandler.requests = []
+    StubHandler.ports = set()
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, "http://127.0.0.1:{}/".format(server.server_address[1])
+
+
+def process_queued_events():
+    while not Event.event_queue.empty():
+        event, args, handlers = Event.event_queue.get_nowait()
+        for handler in handlers:
+            handler(*args)
+
+
+def test_cooljugator_fetch_retries_with_session(tmp_path):
+    server, url = run_stub_server()
+    try:
+        cooljugator = Cooljugator(http_cache=HttpCache(tmp_path))
+        cooljugator.retry_delay = 0.01
+        StubHandler.failures["/a"] = 2
+        assert cooljugator.fetch_html(url + "a") == "/a"
+        assert cooljugator.fetch_html(url + "b") == "/b"
+        assert StubHandler.requests == ["/a", "/a", "/a", "/b"]
+        assert len(StubHandler.ports) == 1  # connection is kept alive
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+def test_cooljugator_offline(tmp_path):
+    # Find a port with nothing listening on it
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        url = "http://127.0.0.1:{}/".format(sock.getsockname()[1])
+    cache = HttpCache(tmp_path)
+    cache.put(HttpCacheEntry(url=url + "cached", text="cached page"))
+    cooljugator = Cooljugator(http_cache=cache)
+    cooljugator.retry_delay = 0.01
+    with pytest.raises(requests.ConnectionError):
+        cooljugator.fetch_html(url + "a")
+
+    # Further downloads fail immediately, but cached pages still load
+    start = time.perf_counter()
+    with pytest.raises(requests.ConnectionError):
+        cooljugator.fetch_html(url + "b")
+    assert time.perf_counter() - start < 0.01
+    assert cooljugator.fetch_html(url + "cached") == "cached page"
+
+
+def test_cooljugator_offline_words_not_recorded(tmp_path):
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        url = "http://127.0.0.1:{}/".format(sock.getsockname()[1])
+    cache = HttpCache(tmp_path)
+    cooljugator = Cooljugator(http_cache=cache)
+    cooljugator.URL_BASE_VERB = url
+    cooljugator.retry_delay = 0.01
+    with pytest.raises(CooljugatorOfflineError):
+        cooljugator.fetch_html(url + "a")
+
+    # Words which could not be downloaded while offline are not errors
+    assert cooljugator.download_word_info(WordType.Verb, "делать") is None
+    assert cooljugator.serialize()["error_words"] == {}
+    assert not cooljugator.is_modified()
+
+    # So they are downloaded once their page can be loaded
+    with open(os.path.join(FIXTURES_PATH, "verb.html"), encoding="utf8") as file:
+        cache.put(HttpCacheEntry(url=url + "делать", text=file.read()))
+    verb = cooljugator.download_word_info(WordType.Verb, "делать")
+    assert verb.non_past[(Plurality.Singular, Person.First)].text == "делаю"
+
+
+def test_cooljugator_thread_pool(tmp_path):
+    server, url = run_stub_server()
+    pool = CooljugatorThread(StubCooljugator(url, HttpCache(tmp_path)),
+                             workers=4)
+    try:
+        results = []
+        pool.start()
+        start = time.perf_counter()
+        for name in ["a", "b", "c", "d", "a", "A"]:
+            pool.download_word_info(WordType.Verb, name, results.append)
+        while pool.get_pending_count() > 0:
+            time.sleep(0.01)
+        elapsed = time.perf_counter() - start
+    finally:
+        pool.stop()
+        server.shutdown()
+        server.server_close()
+    process_queued_events()
+
+    # Words already queued are only downloaded once
+    assert sorted(StubHandler.requests) == ["/a", "/b", "/c", "/d"]
+    assert sorted(results) == ["/a", "/a", "/a", "/b", "/c", "/d"]
+    assert elapsed < 0.6  # four 0.2s downloads ran in parallel
+
+
+def test_cooljugator_thread_stop_flushes_callbacks(tmp_path):
+    pool = CooljugatorThread(StubCooljugator("http://127.0.0.1:1/",
+                                             HttpCache(tmp_path)))
+    results = []
+    for name in ["a", "b", "a"]:
+        pool.download_word_info(WordType.Verb, name, results.append)
+    pool.stop()
+    assert results == [None, None, None]
+    assert pool.get_pending_count() == 0
+
+
+FIXTURES_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "cooljugator")
+
+
+def load_fixture_cache(path) -> HttpCache:
+    """Returns an HTTP cache holding the saved Cooljugator fixture pages."""
+    cache = HttpCache(path)
+    for url, filename in [(Cooljugator.URL_BASE_VERB + "делать", "verb.html"),
+                          (Cooljugator.URL_BASE_NOUN + "стол", "noun.html"),
+                          (Cooljugator.URL_BASE_NOUN + "кот", "noun_animate.html"),
+                          (Cooljugator.URL_BASE_ADJECTIVE + "новый", "adjective.html"),
+                          (Cooljugator.URL_BASE_VERB + "делатъ", "404.html")]:
+        with open(os.path.join(FIXTURES_PATH, filename), encoding="utf8") as file:
+            cache.put(HttpCacheEntry(url=url, text=file.read()))
+    return cache
+
+
+def test_cooljugator_parse_fixture_pages(tmp_path):
+    cooljugator = Cooljugator(http_cache=load_fixture_cache(tmp_path))
+
+    verb = cooljugator.download_word_info(WordType.Verb, "делать")
+    assert verb.aspect == Aspect.Imperfective
+    assert verb.translation.text == "to do, make"
+    assert [c.text for c in verb.counterparts] == ["сделать"]
+    assert verb.non_past[(Plurality.Singular, Person.First)].text == "делаю"
+    assert verb.non_past[(Plurality.Singular, Person.First)].accents == (1,)
+    assert verb.non_past[(Plurality.Plural, Person.Third)].text == "делают"
+    assert verb.past[(Plurality.Singular, Gender.Femanine)].text == "делала"
+    assert verb.past[(Plurality.Plural, None)].text == "делали"
+    assert verb.imperative[Plurality.Plural].text == "делайте"
+
+    noun = cooljugator.download_word_info(WordType.Noun, "стол")
+    assert noun.gender == Gender.Masculine
+    assert noun.declension[(Plurality.Singular, Case.Genetive)].text == "стола"
+    assert noun.declension[(Plurality.Plural, Case.Instrumental)].text == "столами"
+
+    adjective = cooljugator.download_word_info(WordType.Adjective, "новый")
+    assert adjective.declension[(Gender.Femanine, Case.Accusative)].text == "новую"
+    assert adjective.declension[(None, Case.Instrumental)].text == "новыми"
+    assert adjective.short_form[Gender.Neuter].text == "ново"
+
+    # Ids of conjugation cells can also be used by other elements before them
+    noun = cooljugator.download_word_info(WordType.Noun, "кот")
+    assert noun.gender == Gender.Masculine
+    assert noun.declension[(Plurality.Singular, Case.Nominative)].text == "кот"
+    assert noun.declension[(Plurality.Singular, Case.Genetive)].accents == (3,)
+    assert noun.declension[(Plurality.Singular, Case.Accusative)].text == "кота"
+    assert noun.declension[(Plurality.Plural, Case.Accusative)].text == "котов"
+
+    assert cooljugator.download_word_info(WordType.Verb, "делатъ") is None
+    assert cooljugator.serialize()["404_words"] == {"Verb": ["делатъ"]}
@@ -0,0 +1,73 @@
+import os
+import tempfile
+from study_tool.example_database import ExampleDatabase
+from study_tool.russian.corpus import TokenizedCorpus
+from study_tool.russian.story import split_sentences
+from study_tool.russian.word import WordPattern
+from study_tool.russian.word import split_words
+from study_tool.word_database import WordDatabase
+
+STORY_PATH = os.path.join("data", "examples", "stories",
+                          "Маленький секрет.story")
+
+
+def iter_sentences_by_splitting(stories: list):
+    for story in stories:
+        for chapter in story.chapters:
+            for paragraph in chapter.paragraphs:
+                yield from split_sentences(paragraph.text)
+
+
+def find_by_scanning(example_database, patterns: list) -> list:
+    results = []
+    for sentence in iter_sentences_by_splitting(example_database.stories):
+        for pattern in patterns:
+            instances = list(pattern.finditer(sentence))
+            if instances:
+                results.append((sentence, instances))
+    return results
+
+
+def test_example_index_matches_scan():
+    example_database = ExampleDatabase(word_database=WordDatabase())
+    example_database.load_story_text_file(STORY_PATH)
+    for text in ["я", "что", "не знаю", "всё", "так как; и", "до (сих|тех) пор",
+                 "(мо|тво)й", "ааааа"]:
+        if "(" in text:
+            patterns = [WordPattern(text)]
+        else:
+            patterns = example_database.get_word_patterns(text)
+        expected = find_by_scanning(example_database, patterns)
+        actual = list(example_database.iter_example_sentences_2(patterns))
+        assert actual == expected
+
+
+def test_tokenized_corpus():
+    example_database = ExampleDatabase(word_database=WordDatabase())
+    story = example_database.load_story_text_file(STORY_PATH)
+    expected_sentences = list(iter_sentences_by_splitting([story]))
+    expected_words = [word for sentence in expected_sentences
+                      for word, _ in split_words(sentence)]
+
+    corpus = TokenizedCorpus()
+    corpus.add_story(story)
+    assert list(corpus.iter_sentences()) == expected_sentences
+    assert list(corpus.iter_words(0)) == expected_words
+    for index, sentence in enumerate(expected_sentences):
+        assert list(corpus.iter_sentence_tokens(index)) == list(split_words(sentence))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "examples.corpus")
+        corpus.save(path, [story])
+        loaded = TokenizedCorpus.load(path, [story])
+        assert list(loaded.iter_sentences()) == expected_sentences
+        assert list(loaded.iter_words()) == expected_words
+
+        # Changed story text invalidates the saved corpus
+        story.chapters[0].paragraphs.pop()
+        assert TokenizedCorpus.load(path, [story]) is None
+
+    # Stories iterate the spans of the database's corpus once it is built
+    example_database.build_index()
+    assert (list(story.iter_sentences()) ==
+            list(iter_sentences_by_splitting([story])))
@@ -0,0 +1,49 @@
+import json
+import os
+import tempfile
+from cmg.profiler import FrameProfiler
+
+
+class Box:
+    pass
+
+
+def test_frame_profiler():
+    profiler = FrameProfiler(history=3, histogram_bucket_ms=1000,
+                             histogram_buckets=2)
+
+    # Nothing is recorded while disabled
+    profiler.begin_frame()
+    with profiler.phase("update"):
+        profiler.count_draw(Box())
+    profiler.end_frame()
+    assert profiler.get_frames() == []
+
+    profiler.set_enabled(True)
+    for _ in range(4):
+        profiler.begin_frame()
+        with profiler.phase("update"):
+            with profiler.phase("layout"):
+                pass
+        with profiler.phase("draw"):
+            profiler.count_draw(Box())
+            profiler.count_draw(Box())
+        profiler.end_frame()
+
+    frames = profiler.get_frames()
+    assert [frame.index for frame in frames] == [1, 2, 3]
+    assert [(name, depth) for name, depth, _, _ in frames[0].phases] == [
+        ("layout", 1), ("update", 0), ("draw", 0)]
+    assert set(profiler.get_phase_averages()) == {"update", "layout", "draw"}
+    assert profiler.get_draw_count_averages() == {"Box": 2}
+    assert profiler.get_histogram() == [3, 0]
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "trace.json")
+        profiler.save_trace(path)
+        with open(path, encoding="utf8") as file:
+            trace = json.load(file)
+    names = [event["name"] for event in trace["traceEvents"]]
+    assert names.count("frame") == 3
+    assert names.count("layout") == 3
+    assert names.count("draws") == 3
@@ -0,0 +1,64 @@
+import http.server
+import threading
+import pytest
+import requests
+from study_tool.external.http_cache import HttpCache
+
+
+class StubHandler(http.server.BaseHTTPRequestHandler):
+    etag = '"v1"'
+    body = "страница v1"
+    requests = []
+
+    def do_GET(self):
+        self.requests.append(self.headers.get("If-None-Match", None))
+        if self.headers.get("If-None-Match", None) == self.etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        body = self.body.encode("utf8")
+        self.send_response(200)
+        self.send_header("ETag", self.etag)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_http_cache(tmp_path):
+    StubHandler.etag = '"v1"'
+    StubHandler.body = "страница v1"
+    StubHandler.requests = []
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = "http://127.0.0.1:{}/page".format(server.server_address[1])
+    cache = HttpCache(tmp_path)
+    try:
+        entry = cache.fetch(url)
+        assert entry.text == "страница v1"
+        assert not entry.from_cache
+        assert cache.get_entry_path(url).is_file()
+
+        # Cached pages are not downloaded again
+        entry = cache.fetch(url)
+        assert entry.from_cache and entry.text == "страница v1"
+        assert StubHandler.requests == [None]
+
+        # Refreshing revalidates the page with its ETag
+        entry = cache.fetch(url, refresh=True)
+        assert entry.text == "страница v1"
+        assert StubHandler.requests == [None, '"v1"']
+        StubHandler.etag = '"v2"'
+        StubHandler.body = "страница v2"
+        assert cache.fetch(url, refresh=True).text == "страница v2"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    # Cached pages are used when offline
+    assert HttpCache(tmp_path).fetch(url, refresh=True).text == "страница v2"
+    with pytest.raises(requests.ConnectionError):
+        cache.fetch(url + "/missing")
@@ -0,0 +1,68 @@
+import threading
+import time
+from study_tool.lazy_loader import LazyLoader
+
+
+class Target:
+    def __init__(self):
+        self.items = []
+
+    def get_items(self):
+        return list(self.items)
+
+
+def test_lazy_loader_loads_on_first_access():
+    calls = []
+
+    def load(target):
+        calls.append(threading.current_thread().name)
+        target.items.append("a")
+
+    loader = LazyLoader(Target(), load, name="target")
+    assert not loader.is_loaded()
+    assert calls == []
+
+    assert loader.get_items() == ["a"]
+    assert loader.is_loaded()
+    assert loader.get_load_time() is not None
+    assert calls == ["load target"]
+
+    # The data is only loaded once
+    assert loader.items == ["a"]
+    assert len(calls) == 1
+
+
+def test_lazy_loader_prefetch():
+    started = threading.Event()
+    release = threading.Event()
+
+    def load(target):
+        started.set()
+        release.wait()
+        # The loader thread can use the proxy without waiting on itself
+        loader.items.append("a")
+
+    loader = LazyLoader(Target(), load)
+    loader.prefetch()
+    assert started.wait(5)
+    loader.prefetch()
+    assert not loader.is_loaded()
+    assert loader.get_target().items == []
+
+    def release_later():
+        time.sleep(0.1)
+        release.set()
+
+    threading.Thread(target=release_later).start()
+    assert loader.wait().items == ["a"]
+    assert loader.is_loaded()
+
+
+def test_lazy_loader_error():
+    def load(target):
+        target.items.append("a")
+        raise Exception("bad data")
+
+    loader = LazyLoader(Target(), load)
+    assert loader.get_items() == ["a"]
+    assert loader.is_loaded()
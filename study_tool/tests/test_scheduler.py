@@ -0,0 +1,97 @@
+import random
+from study_tool.card import Card
+from study_tool.card_database import CardDatabase
+from study_tool.russian.types import WordType
+from study_tool.scheduler import RepetitionTree
+from study_tool.scheduler import Scheduler
+from study_tool.scheduler import SchedulerParams
+from study_tool.scheduler import SchedulingMode
+from study_tool.study_database import StudyDatabase
+from study_tool.word_database import WordDatabase
+
+
+class Info:
+    def __init__(self, rep):
+        self.rep = rep
+
+
+def test_repetition_tree_weights():
+    random.seed(0)
+    tree = RepetitionTree(size=4)
+    infos = [Info(random.randint(0, 20)) for _ in range(60)]
+    for info in infos:
+        tree.add(info)
+    for info in infos[::3]:
+        tree.remove(info)
+    infos = [info for index, info in enumerate(infos) if index % 3 != 0]
+
+    for rep, max_rep in [(20, 20), (20, 16), (30, 26), (21, 10), (20, -1)]:
+        # Every position in the total weight maps to a card, in proportion
+        # to max(1, age^2) like choose_weighted_by_age()
+        expected = {}
+        for info in infos:
+            if info.rep <= max_rep:
+                expected[info] = max(1, (rep - info.rep) ** 2)
+        total = tree.get_total_weight(rep, max_rep)
+        assert total == sum(expected.values())
+        assert tree.count(max_rep) == len(expected)
+        actual = {}
+        for target in range(total):
+            info = tree.find_weighted(rep, max_rep, target)
+            actual[info] = actual.get(info, 0) + 1
+        assert actual == expected
+
+
+def test_scheduler_max_repetitions():
+    card_database = CardDatabase(word_database=WordDatabase())
+    cards = []
+    for index in range(50):
+        card = Card(russian="слово {}".format(index),
+                    english="word {}".format(index),
+                    word_type=WordType.Phrase)
+        card_database.add_card(card, verbose=False)
+        cards.append(card)
+    study_database = StudyDatabase(card_database)
+    for card in cards[:20]:
+        study_database.mark_card(card, True)
+    scheduler = Scheduler(cards=cards, study_database=study_database,
+                          params=SchedulerParams(max_repetitions=2))
+
+    shown = {}
+    while True:
+        card = scheduler.next()
+        if card is None:
+            break
+        shown[card] = shown.get(card, 0) + 1
+        scheduler.mark(card, knew_it=len(shown) % 3 != 0)
+    assert shown == {card: 2 for card in cards}
+
+
+def test_scheduler_review_mode():
+    card_database = CardDatabase(word_database=WordDatabase())
+    cards = []
+    for index in range(6):
+        card = Card(russian="слово {}".format(index),
+                    english="word {}".format(index),
+                    word_type=WordType.Phrase)
+        card_database.add_card(card, verbose=False)
+        cards.append(card)
+    study_database = StudyDatabase(card_database)
+    for card in cards[:4]:
+        study_database.mark_card(card, True)
+    for card in cards[:2]:
+        study_database.get_card_study_data(card).last_encounter_time -= 2 * 24 * 60 * 60
+    scheduler = Scheduler(cards=cards[1:], study_database=study_database,
+                          params=SchedulerParams(max_repetitions=1,
+                                                 mode=SchedulingMode.Review))
+
+    # Due cards are shown first, then new cards
+    shown = []
+    while True:
+        card = scheduler.next()
+        if card is None:
+            break
+        shown.append(card)
+        scheduler.mark(card, knew_it=True)
+    assert shown[0] == cards[1]
+    assert set(shown[1:]) == set(cards[4:])
@@ -0,0 +1,61 @@
+import threading
+import time
+import pytest
+from study_tool.startup_pipeline import StartupPipeline
+
+
+def test_startup_pipeline_order():
+    order = []
+    threads = set()
+
+    def stage(name, duration=0.0):
+        def run():
+            time.sleep(duration)
+            order.append(name)
+            threads.add(threading.current_thread())
+        return run
+
+    pipeline = StartupPipeline()
+    pipeline.add_stage("c", stage("c"), depends_on=["a", "b"])
+    pipeline.add_stage("a", stage("a", 0.1))
+    pipeline.add_stage("b", stage("b", 0.1))
+    pipeline.add_stage("d", stage("d"), depends_on=["c"])
+    pipeline.add_stage("e", stage("e"))
+    pipeline.run()
+
+    # Stages run in the order they were added, after their dependencies
+    assert order == ["a", "b", "c", "d", "e"]
+    assert threads == {threading.current_thread()}
+    a = pipeline.get_stage("a")
+    b = pipeline.get_stage("b")
+    c = pipeline.get_stage("c")
+    assert a.get_duration() >= 0.1
+    assert b.start_time >= a.end_time
+    assert c.start_time >= b.end_time
+    assert pipeline.get_duration() >= 0.2
+    assert "Startup took" in pipeline.get_report()
+
+
+def test_startup_pipeline_errors():
+    ran = []
+
+    def fail():
+        raise ValueError("load failed")
+
+    pipeline = StartupPipeline()
+    pipeline.add_stage("load", fail)
+    pipeline.add_stage("save", lambda: ran.append("save"), depends_on=["load"])
+    with pytest.raises(ValueError):
+        pipeline.run()
+    assert ran == []
+
+    pipeline = StartupPipeline()
+    pipeline.add_stage("a", lambda: None, depends_on=["b"])
+    pipeline.add_stage("b", lambda: None, depends_on=["a"])
+    with pytest.raises(Exception, match="Circular"):
+        pipeline.run()
+
+    pipeline = StartupPipeline()
+    pipeline.add_stage("a", lambda: None, depends_on=["missing"])
+    with pytest.raises(KeyError):
+        pipeline.run()
@@ -0,0 +1,271 @@
+import os
+import tempfile
+import time
+from study_tool.card import Card
+from study_tool.card_database import CardDatabase
+from study_tool.card_set import CardSetPackage
+from study_tool.config import Config
+from study_tool.russian.types import WordType
+from study_tool.study_database import CardStudyData
+from study_tool.study_database import StudyDatabase
+from study_tool.study_database import get_study_journal_path
+from study_tool.word_database import WordDatabase
+
+
+def create_card_database() -> CardDatabase:
+    card_database = CardDatabase(word_database=WordDatabase())
+    for russian, english in [("до того как", "before"),
+                             ("до сих пор", "until now"),
+                             ("как дела", "how are you")]:
+        card_database.add_card(Card(russian=russian, english=english,
+                                    word_type=WordType.Phrase), verbose=False)
+    return card_database
+
+
+def read_journal(path: str) -> list:
+    with open(get_study_journal_path(path), "r", encoding="utf8") as f:
+        return f.readlines()
+
+
+def test_study_journal():
+    card_database = create_card_database()
+    cards = list(card_database.iter_cards())
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "study_data.json")
+        study_database = StudyDatabase(card_database)
+        study_database.save(path)
+        study_database.load(path, card_database)
+
+        # Markings are journaled instead of re-saving the study data
+        study_database.mark_card(cards[0], True)
+        study_database.mark_card(cards[1], False)
+        study_database.mark_card(cards[0], True)
+        assert not study_database.is_data_modified()
+        assert len(read_journal(path)) == 3
+
+        # Loading replays the journal on top of the saved study data
+        loaded_database = StudyDatabase(card_database)
+        loaded_database.load(path, card_database)
+        for card in cards:
+            expected = study_database.get_card_study_data(card).serialize()
+            actual = loaded_database.get_card_study_data(card).serialize()
+            assert actual == expected
+        assert loaded_database.get_card_study_data(cards[0]).history == [True, True]
+
+        # Compacting saves the study data and clears the journal
+        loaded_database.compact()
+        assert read_journal(path) == []
+        study_database = StudyDatabase(card_database)
+        study_database.load(path, card_database)
+        assert study_database.get_card_study_data(cards[1]).history == [False]
+
+
+
+def test_study_journal_torn_record():
+    card_database = create_card_database()
+    cards = list(card_database.iter_cards())
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "study_data.json")
+        study_database = StudyDatabase(card_database)
+        study_database.save(path)
+        study_database.load(path, card_database)
+        study_database.mark_card(cards[0], True)
+
+        # Simulate a write that was interrupted partway through a record
+        with open(get_study_journal_path(path), "a", encoding="utf8") as f:
+            f.write('["phrase", "до сих')
+
+        # Reopening removes the partial record, so a new marking is kept
+        study_database = StudyDatabase(card_database)
+        study_database.load(path, card_database)
+        study_database.mark_card(cards[1], False)
+        assert len(read_journal(path)) == 2
+        loaded_database = StudyDatabase(card_database)
+        loaded_database.load(path, card_database)
+        assert loaded_database.get_card_study_data(cards[0]).history == [True]
+        assert loaded_database.get_card_study_data(cards[1]).history == [False]
+
+        # A record missing only its newline is kept
+        with open(get_study_journal_path(path), "rb+") as f:
+            f.truncate(os.path.getsize(get_study_journal_path(path)) - 1)
+        study_database = StudyDatabase(card_database)
+        study_database.load(path, card_database)
+        study_database.mark_card(cards[2], True)
+        assert len(read_journal(path)) == 3
+
+        # A bad record in the middle of the journal forces compaction
+        with open(get_study_journal_path(path), "a", encoding="utf8") as f:
+            f.write("not a record\n")
+        study_database = StudyDatabase(card_database)
+        study_database.load(path, card_database)
+        study_database.compact()
+        assert read_journal(path) == []
+        loaded_database = StudyDatabase(card_database)
+        loaded_database.load(path, card_database)
+        assert loaded_database.get_card_study_data(cards[1]).history == [False]
+        assert loaded_database.get_card_study_data(cards[2]).history == [True]
+
+
+def test_study_journal_replayed_after_save():
+    card_database = create_card_database()
+    cards = list(card_database.iter_cards())
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "study_data.json")
+        study_database = StudyDatabase(card_database)
+        study_database.save(path)
+        study_database.load(path, card_database)
+        study_database.mark_card(cards[0], True)
+        study_database.mark_card(cards[1], False)
+        with open(get_study_journal_path(path), "rb") as f:
+            journal = f.read()
+
+        # Simulate saving being interrupted before the journal was cleared
+        study_database.save()
+        assert read_journal(path) == []
+        with open(get_study_journal_path(path), "wb") as f:
+            f.write(journal)
+
+        # Markings already in the saved study data are not applied again,
+        # but newer ones are
+        study_database = StudyDatabase(card_database)
+        study_database.load(path, card_database)
+        assert study_database.get_card_study_data(cards[0]).history == [True]
+        assert study_database.get_card_study_data(cards[1]).history == [False]
+        study_database.mark_card(cards[0], False)
+        loaded_database = StudyDatabase(card_database)
+        loaded_database.load(path, card_database)
+        for card in cards:
+            expected = study_database.get_card_study_data(card).serialize()
+            actual = loaded_database.get_card_study_data(card).serialize()
+            assert actual == expected
+        assert loaded_database.get_card_study_data(cards[0]).history == [False, True]
+
+
+def test_study_journal_compaction_threshold():
+    card_database = create_card_database()
+    card = list(card_database.iter_cards())[0]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "study_data.json")
+        study_database = StudyDatabase(card_database)
+        study_database.save(path)
+        study_database.load(path, card_database)
+        for _ in range(Config.study_journal_max_records):
+            study_database.mark_card(card, True)
+        assert study_database.is_data_modified()
+        study_database.save_all_changes()
+        assert read_journal(path) == []
+        assert not study_database.is_data_modified()
+
+
+def count_group_metrics(study_database, group) -> list:
+    counts = [0] * (Config.proficiency_levels + 1)
+    for card in set(group.get_cards()):
+        counts[study_database.get_card_study_data(card).get_proficiency_level()] += 1
+    return counts
+
+
+def test_group_study_metrics():
+    card_database = create_card_database()
+    a, b, c = card_database.iter_cards()
+    root = CardSetPackage(name="words", path="words")
+    package = CardSetPackage(name="sub", path="words/sub", parent=root)
+    root.packages.append(package)
+    set_1 = card_database.create_card_set("One", "one", root)
+    set_2 = card_database.create_card_set("Two", "two", package)
+    card_database.add_card_to_set(a, set_1)
+    card_database.add_card_to_set(a, set_2)
+    study_database = StudyDatabase(card_database)
+    groups = [root, package, set_1, set_2]
+    for group in groups:
+        study_database.get_group_study_metrics(group)
+
+    study_database.mark_card(a, True)
+    card_database.add_card_to_set(b, set_2)
+    study_database.mark_card(b, False)
+    study_database.mark_card(c, True)
+    card_database.add_card_to_set(c, set_1)
+    card_database.remove_card_from_set(a, set_2)
+    card_database.update_card_set(set_1, cards=[c, b])
+    study_database.mark_card(a, False)
+    for group in groups:
+        metrics = study_database.get_group_study_metrics(group)
+        assert metrics.proficiency_counts == count_group_metrics(study_database, group)
+    assert study_database.get_group_study_metrics(root).get_total_count() == 2
+
+
+def test_review_due_index():
+    card_database = create_card_database()
+    cards = list(card_database.iter_cards())
+    study_database = StudyDatabase(card_database)
+    study_database.mark_card(cards[0], True)
+    study_database.mark_card(cards[1], False)
+    assert study_database.get_due_card_count() == 0
+    assert study_database.get_card_due_time(cards[2]) is None
+
+    # Not knowing a card makes it due soonest
+    day = 24 * 60 * 60
+    assert study_database.get_due_cards(now=time.time() + day) == [cards[1], cards[0]]
+    assert study_database.get_due_cards(now=time.time() + 60 * 60) == [cards[1]]
+    assert study_database.get_due_cards(now=time.time() + day, count=1) == [cards[1]]
+
+    # Each consecutive known marking lengthens the interval
+    intervals = []
+    for _ in range(5):
+        study_database.mark_card(cards[1], True)
+        study_data = study_database.get_card_study_data(cards[1])
+        intervals.append(study_database.get_card_due_time(cards[1]) -
+                         study_data.get_last_encounter_time())
+    assert intervals == sorted(intervals)
+    assert intervals[:2] == Config.review_initial_intervals
+    assert study_database.get_due_cards(now=time.time() + 2 * day) == [cards[0]]
+
+
+def test_review_due_index_card_deleted():
+    card_database = create_card_database()
+    cards = list(card_database.iter_cards())
+    study_database = StudyDatabase(card_database)
+    for card in cards:
+        study_database.mark_card(card, False)
+    day = 24 * 60 * 60
+    assert study_database.get_due_cards(now=time.time() + day) == cards
+
+    # Deleted cards are no longer due and their study data is dropped
+    card_database.delete_card(cards[1])
+    assert study_database.get_due_cards(now=time.time() + day) == [cards[0], cards[2]]
+    assert study_database.get_card_due_time(cards[1]) is None
+    assert study_database.is_data_modified()
+
+def test_card_study_data_history():
+    study_data = CardStudyData()
+    assert study_data.history == []
+    for known in [False, True, True, False, True, True, True]:
+        study_data.add_history(known, max_size=5)
+    assert study_data.history == [True, True, True, False, True]
+    assert study_data.get_history_length() == 5
+    assert study_data.get_history_list() == [True, True, True, False, True]
+
+
+def test_card_study_data_serialize_history():
+    study_data = CardStudyData()
+    study_data.history = [True, True, True, False, True]
+    state = study_data.serialize()
+    assert state[2] == "TTTFT"
+    loaded = CardStudyData()
+    loaded.deserialize(state)
+    assert loaded.history == study_data.history
+
+
+def test_card_study_data_review_interval():
+    study_data = CardStudyData()
+
+    # A streak of two known markings
+    study_data.history = [True, True, False]
+    assert study_data.get_review_interval() == Config.review_initial_intervals[1]
+
+    # Not knowing the card starts relearning it
+    study_data.history = [False, True]
+    assert study_data.get_review_interval() == Config.review_relearn_interval
+
+
+def test_card_study_data_slots():
+    assert not hasattr(CardStudyData(), "__dict__")
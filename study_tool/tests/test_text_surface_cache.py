@@ -0,0 +1,54 @@
+import pygame
+import cmg
+from cmg.graphics.text_cache import TextSurfaceCache
+from study_tool.russian.word import AccentedText
+
+
+def test_text_surface_cache_eviction():
+    surface_size = TextSurfaceCache.get_surface_size(pygame.Surface((10, 10)))
+    cache = TextSurfaceCache(max_bytes=surface_size * 3)
+    for key in "abc":
+        cache.put(key, pygame.Surface((10, 10)))
+    assert cache.get("a") is not None
+    cache.put("d", pygame.Surface((10, 10)))
+
+    # "b" was the least recently used surface
+    assert cache.get("b") is None
+    assert cache.get("c") is not None
+    assert len(cache) == 3
+    assert cache.get_memory_usage() == surface_size * 3
+    assert cache.get_hit_count() == 2
+    assert cache.get_miss_count() == 1
+    assert cache.get_eviction_count() == 1
+
+    cache.set_max_memory(surface_size)
+    assert len(cache) == 1
+    assert cache.get_memory_usage() == surface_size
+
+
+def test_text_surface_cache_accent_offsets():
+    pygame.font.init()
+    font = pygame.font.Font(None, 30)
+    text = AccentedText("сло'во моло'ко")
+    cache = TextSurfaceCache()
+    offsets = cache.get_accent_offsets(text, font=font, font_key=30)
+    assert len(offsets) == 2
+    for offset, accent_index in zip(offsets, text.accents):
+        assert (font.size(text.text[:accent_index])[0] < offset <
+                font.size(text.text[:accent_index + 1])[0])
+    assert cache.get_accent_offsets(text, font=font, font_key=30) is offsets
+
+
+def test_font_size_to_fit():
+    pygame.font.init()
+    text = "достопримечательность"
+    for width in [0, 50, 120, 200, 400, 10000]:
+        expected = 10
+        for font_size in range(60, 10, -1):
+            if pygame.font.Font(None, font_size).size(text)[0] <= width:
+                expected = font_size
+                break
+        assert cmg.get_font_size_to_fit(
+            text, min_font_size=10, max_font_size=60, width=width) == expected
+    font = cmg.Font(32)
+    assert font.measure(text).totuple() == pygame.font.Font(None, 32).size(text)
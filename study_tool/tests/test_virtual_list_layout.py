@@ -0,0 +1,120 @@
+import pytest
+from pygame.rect import Rect
+
+# The widgets use the Windows clipboard
+pytest.importorskip("win32clipboard")
+from cmg import widgets
+
+
+class Row(widgets.Widget):
+    def __init__(self):
+        super().__init__()
+        self.value = None
+        self.set_minimum_size((50, 20))
+
+
+class RowList:
+    """Scroll area showing a virtual list of values."""
+
+    def __init__(self, values):
+        self.values = list(values)
+        self.created_count = 0
+        self.layout = widgets.VirtualListLayout(
+            create_row=self.create_row, bind_row=self.bind_row)
+        self.layout.set_row_count(len(self.values))
+        content = widgets.Widget()
+        content.set_layout(self.layout)
+        self.root = widgets.Widget()
+        self.root.set_layout(widgets.VBoxLayout())
+        self.root.get_layout().add(widgets.AbstractScrollArea(content))
+        self.root.set_rect(Rect(0, 0, 300, 200))
+        self.update()
+
+    def create_row(self) -> Row:
+        self.created_count += 1
+        return Row()
+
+    def bind_row(self, row: Row, index: int):
+        row.value = self.values[index]
+
+    def update(self, frames=3):
+        for _ in range(frames):
+            self.root.main_update()
+
+    def get_bound_rows(self) -> dict:
+        return {row.value: row for row in self.layout.get_children()}
+
+
+def test_virtual_list_scrolling_rebinds_rows():
+    rows = RowList(range(1000))
+    assert sorted(rows.get_bound_rows()) == list(range(10))
+    created_count = rows.created_count
+
+    # Rows scrolled out of view give their widgets to the rows scrolled in
+    rows.layout.ensure_row_visible(500)
+    rows.update()
+    bound_rows = rows.get_bound_rows()
+    assert 500 in bound_rows
+    assert 0 not in bound_rows
+    assert len(bound_rows) <= 11
+    assert rows.created_count <= created_count + 1
+    for value, row in bound_rows.items():
+        assert row.get_rect() == rows.layout.get_row_rect(value)
+    assert rows.layout.calc_minimum_size().y == 1000 * 20
+
+
+def test_virtual_list_focused_row_is_kept():
+    rows = RowList(range(1000))
+    focused_row = rows.get_bound_rows()[2]
+    focused_row.focus()
+    rows.layout.ensure_row_visible(500)
+    rows.update()
+    assert rows.get_bound_rows()[2] is focused_row
+    assert rows.layout.get_row_widget(2) is focused_row
+
+    # Once it loses focus, its widget is released
+    rows.root.change_focus(None)
+    rows.update()
+    assert 2 not in rows.get_bound_rows()
+
+
+def test_virtual_list_set_row_count():
+    rows = RowList(range(1000))
+    rows.values = rows.values[:5]
+    rows.layout.set_row_count(5)
+    rows.update()
+    assert sorted(rows.get_bound_rows()) == list(range(5))
+    assert rows.layout.calc_minimum_size().y == 5 * 20
+
+    rows.values = []
+    rows.layout.set_row_count(0)
+    rows.update()
+    assert rows.get_bound_rows() == {}
+    assert rows.layout.get_row_height() == 0
+
+
+def test_virtual_list_refresh_row():
+    rows = RowList(range(1000))
+    row = rows.get_bound_rows()[3]
+    rows.values[3] = "three"
+    rows.layout.refresh_row(3)
+    assert row.value == "three"
+
+    # Rows out of view are bound with their new value when they scroll in
+    rows.values[700] = "seven hundred"
+    rows.layout.refresh_row(700)
+    rows.layout.ensure_row_visible(700)
+    rows.update()
+    assert "seven hundred" in rows.get_bound_rows()
+
+
+def test_virtual_list_row_height_changes():
+    rows = RowList(range(1000))
+    assert rows.layout.get_row_height() == 20
+
+    # The row height is measured again when the first row's size changes
+    rows.get_bound_rows()[0].set_minimum_height(30)
+    rows.update()
+    assert rows.layout.get_row_height() == 30
+    assert rows.layout.calc_minimum_size().y == 1000 * 30
+    assert rows.get_bound_rows()[1].get_rect().top == 30
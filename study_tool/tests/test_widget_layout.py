@@ -0,0 +1,104 @@
+import pytest
+from pygame.rect import Rect
+
+# The widgets use the Windows clipboard
+pytest.importorskip("win32clipboard")
+from cmg import widgets
+
+
+class Item(widgets.Widget):
+    """Widget with a fixed height, like a label."""
+
+    def __init__(self, height=20):
+        super().__init__()
+        self.set_minimum_size((50, height))
+        self.set_maximum_height(height)
+
+
+class AddItemsOnUpdate(widgets.Widget):
+    """Adds items to another widget from inside its first update."""
+
+    def __init__(self, target: widgets.Widget, count: int):
+        super().__init__()
+        self.target = target
+        self.count = count
+        self.items = []
+
+    def on_update(self):
+        while len(self.items) < self.count:
+            item = Item()
+            self.target.get_layout().add(item)
+            self.items.append(item)
+
+
+def create_root(*children) -> widgets.Widget:
+    root = widgets.Widget()
+    layout = widgets.VBoxLayout()
+    for child in children:
+        layout.add(child)
+    root.set_layout(layout)
+    root.set_rect(Rect(0, 0, 400, 400))
+    return root
+
+
+def run_frames(root: widgets.Widget, count=5):
+    for _ in range(count):
+        root.main_update()
+
+
+def test_invalidate_layout_during_update():
+    nested = widgets.Widget()
+    nested.set_layout(widgets.VBoxLayout())
+    trigger = AddItemsOnUpdate(nested, count=5)
+    root = create_root(trigger, nested)
+    run_frames(root)
+
+    # Items added while the tree was updating are laid out afterwards
+    assert nested.calc_minimum_size().y == 100
+    assert root.calc_minimum_size().y >= 100
+    for item in trigger.items:
+        assert item.get_height() == 20
+        assert nested.get_rect().contains(item.get_rect())
+    assert not root.is_layout_dirty()
+    assert not nested.is_layout_dirty()
+
+
+def test_invalidate_nested_layout():
+    inner = widgets.Widget()
+    inner.set_layout(widgets.VBoxLayout())
+    middle = widgets.Widget()
+    middle.set_layout(widgets.VBoxLayout())
+    middle.get_layout().add(inner)
+    root = create_root(middle)
+    run_frames(root)
+    assert root.calc_minimum_size().y == 0
+
+    # Adding to the innermost widget updates the size hints of all of its
+    # ancestors, which no longer recalculate once the layout is settled
+    items = [Item() for _ in range(3)]
+    for item in items:
+        inner.get_layout().add(item)
+    run_frames(root)
+    assert inner.calc_minimum_size().y == 60
+    assert middle.calc_minimum_size().y == 60
+    assert root.calc_minimum_size().y == 60
+    assert [item.get_rect().top for item in items] == [0, 20, 40]
+    assert not root.is_layout_dirty()
+    assert not inner.is_layout_dirty()
+
+
+def test_hide_and_show_widget():
+    items = [Item() for _ in range(3)]
+    root = create_root(*items)
+    run_frames(root)
+    assert root.calc_minimum_size().y == 60
+
+    items[1].set_visible(False)
+    run_frames(root)
+    assert root.calc_minimum_size().y == 40
+    assert items[2].get_rect().top == items[0].get_rect().bottom
+
+    items[1].set_visible(True)
+    run_frames(root)
+    assert root.calc_minimum_size().y == 60
+    assert [item.get_rect().top for item in items] == [0, 20, 40]
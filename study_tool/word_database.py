@@ -42,6 +42,7 @@ class WordDatabase:
         self.__lock_save = threading.Lock()
         self.__word_data_path = None
         self.__is_saving = False
+        self.__modified = False
 
         # Events
         self.word_created = Event(Word)
@@ -53,6 +54,10 @@ class WordDatabase:
         """Returns True if currently saving the database."""
         return self.__is_saving
 
+    def is_modified(self) -> bool:
+        """Returns True if the data changed since it was loaded or saved."""
+        return self.__modified or self.__cooljugator.is_modified()
+
     def get_word(self, name: str, word_type: WordType) -> Word:
         """
         Looks up a Word object by its word type and dictionary form.
@@ -164,6 +169,7 @@ class WordDatabase:
             for form in word.get_all_forms():
                 self.__add_to_dictionary(form=form, word=word)
             self.words[key] = word
+            self.__modified = True
         self.word_created.emit(word)
         return word
 
@@ -175,6 +181,8 @@ class WordDatabase:
         with self.__lock_save:
             self.__is_saving = True
             self.__word_data_path = path
+            self.__modified = False
+            self.__cooljugator.set_modified(False)
             word_data = self.serialize()
             temp_path = path + ".temp"
             with open(temp_path, "w", encoding="utf8") as f:
@@ -194,7 +202,9 @@ class WordDatabase:
                     word_data = json.load(f)
                 else:
                     raise Exception(path)
+            modified = self.__modified
             self.deserialize(word_data, source_type=source_type)
+            self.__modified = modified
 
     def serialize(self) -> dict:
         """Serialize word data."""
@@ -262,4 +272,4 @@ class WordDatabase:
         return word
 
     def __get_word_key(self, word_type, name):
-        return (word_type, AccentedText(name).text.lower().replace("ё", "е"))
+        return (word_type, get_folded_text(name))